@@ -0,0 +1,66 @@
+"""
+ANN index benchmark: recall@k and latency vs. nprobe, against exact search
+
+Usage: python benchmarks/bench_ann_index.py [vectors] [dim]
+
+Uses faiss when installed, the NumPy IVF otherwise (pass --numpy to force it).
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm.ann_index import ANNIndex
+
+NLIST = 256
+NPROBES = (1, 2, 4, 8, 16, 32, 64)
+QUERIES = 200
+TOP_K = 10
+
+
+def synthetic_embeddings(count: int, centers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Clustered unit vectors, roughly like resume embeddings by job family"""
+    dim = centers.shape[1]
+    vectors = centers[rng.integers(0, len(centers), count)] + 1.5 * rng.normal(size=(count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    count = int(args[0]) if args else 100_000
+    dim = int(args[1]) if len(args) > 1 else 384
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(500, dim)).astype(np.float32)
+    vectors = synthetic_embeddings(count, centers, rng)
+    queries = synthetic_embeddings(QUERIES, centers, rng)
+    ids = [f"candidate_{i}" for i in range(count)]
+    
+    index = ANNIndex(dim, nlist=NLIST, use_faiss="--numpy" not in sys.argv)
+    started = time.perf_counter()
+    for start in range(0, count, 10_000):
+        index.add(ids[start:start + 10_000], vectors[start:start + 10_000])
+    print(f"{count:,} x {dim} vectors, {NLIST} lists, backend {index.backend}: "
+          f"built in {time.perf_counter() - started:.1f} s")
+    
+    # Exact top-k over the same float16 vectors the index stores
+    stored = vectors.astype(np.float16).astype(np.float32)
+    started = time.perf_counter()
+    truth = [set(np.argpartition(-(stored @ q), TOP_K)[:TOP_K]) for q in queries]
+    exact_ms = (time.perf_counter() - started) * 1000 / QUERIES
+    truth = [{ids[i] for i in rows} for rows in truth]
+    
+    print(f"{'nprobe':>6} {'recall@' + str(TOP_K):>10} {'ms/query':>9} {'speed-up':>9}")
+    for nprobe in NPROBES:
+        started = time.perf_counter()
+        results = [index.search(q, TOP_K, nprobe=nprobe) for q in queries]
+        ms = (time.perf_counter() - started) * 1000 / QUERIES
+        recall = np.mean([len(expected & {doc_id for doc_id, _ in hits}) / TOP_K for expected, hits in zip(truth, results)])
+        print(f"{nprobe:>6} {recall:>10.3f} {ms:>9.2f} {exact_ms / ms:>8.1f}x")
+    print(f"{'exact':>6} {1.0:>10.3f} {exact_ms:>9.2f} {1.0:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Resume dedup benchmark: LSH lookup vs. comparing against every stored signature
+
+Usage: python benchmarks/bench_resume_dedup.py [resumes]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.orchestrator.resume_dedup import ResumeDeduplicator
+
+QUERIES = 500
+VOCABULARY = [f"term{i}" for i in range(5000)]
+
+
+def synthetic_resume(rng: random.Random, words: int = 300) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def lightly_edited(text: str, rng: random.Random, edits: int = 3) -> str:
+    """An agency copy: a few words swapped out"""
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(42)
+    resumes = [synthetic_resume(rng) for _ in range(count)]
+    
+    dedup = ResumeDeduplicator()
+    started = time.perf_counter()
+    for i, text in enumerate(resumes):
+        dedup.add(f"r{i}", text)
+    print(f"{count:,} resumes indexed in {time.perf_counter() - started:.1f} s "
+          f"({dedup.bands} bands x {dedup.rows} rows, threshold {dedup.threshold})")
+    
+    targets = [rng.randrange(count) for _ in range(QUERIES // 2)]
+    queries = [(lightly_edited(resumes[i], rng), f"r{i}") for i in targets]
+    queries += [(synthetic_resume(rng), None) for _ in range(QUERIES - len(queries))]
+    
+    compared_before = dedup.get_stats()["candidates_compared"]
+    started = time.perf_counter()
+    found = [dedup.find(text) for text, _ in queries]
+    lsh_ms = (time.perf_counter() - started) * 1000 / QUERIES
+    recall = np.mean([m is not None and m.resume_id == expected for (_, expected), m in zip(queries, found) if expected])
+    false_hits = sum(m is not None for (_, expected), m in zip(queries, found) if expected is None)
+    compared = (dedup.get_stats()["candidates_compared"] - compared_before) / QUERIES
+    
+    # Brute force: the same signatures, compared with every stored one
+    stored = np.stack(list(dedup._signatures.values()))
+    started = time.perf_counter()
+    for text, _ in queries:
+        signature = dedup._signature(dedup._tokens(text))
+        (stored == signature).mean(axis=1).argmax()
+    brute_ms = (time.perf_counter() - started) * 1000 / QUERIES
+    
+    print(f"LSH:   {lsh_ms:.2f} ms/query, {compared:.1f} signatures compared, "
+          f"recall {recall:.3f}, {false_hits} false duplicates")
+    print(f"Brute: {brute_ms:.2f} ms/query, {count:,} signatures compared ({brute_ms / lsh_ms:.1f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
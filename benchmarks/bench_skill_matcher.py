@@ -0,0 +1,85 @@
+"""
+Skill matcher benchmark: single-pass taxonomy matcher vs. the old per-skill regex loop
+
+Usage: python benchmarks/bench_skill_matcher.py
+
+The taxonomy matcher should scale with document length only; the regex
+loop also scales with the number of skills.
+"""
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.skill_taxonomy import SkillTaxonomy
+
+TAXONOMY_SIZES = (100, 1_000, 10_000)
+DOCUMENT_SIZES = (1_000, 10_000, 100_000)
+# The regex loop is skipped where it would take minutes
+REGEX_BUDGET = 10_000 * 10_000
+
+
+def synthetic_skills(count: int, rng: random.Random) -> list:
+    skills = []
+    for i in range(count):
+        word = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+        skills.append({"id": f"{word}{i}", "aliases": [f"{word} {i}", f"{word}-{i}"]})
+    return skills
+
+
+def synthetic_document(chars: int, skills: list, rng: random.Random) -> str:
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(skills)["id"] if rng.random() < 0.05 else "".join(
+            rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))
+        )
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+def regex_loop(text: str, skill_ids: list) -> set:
+    """What ResumeScorer.extract_skills used to do"""
+    text_lower = text.lower()
+    return {skill for skill in skill_ids if re.search(r'\b' + re.escape(skill) + r'\b', text_lower)}
+
+
+def best_of(fn, repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'skills':>7} {'doc chars':>10} {'build ms':>9} {'matcher ms':>11} {'us/kchar':>9} {'regex ms':>10}")
+    for taxonomy_size in TAXONOMY_SIZES:
+        skills = synthetic_skills(taxonomy_size, rng)
+        skill_ids = [skill["id"] for skill in skills]
+        started = time.perf_counter()
+        taxonomy = SkillTaxonomy(skills)
+        build_ms = (time.perf_counter() - started) * 1000
+        
+        for doc_size in DOCUMENT_SIZES:
+            document = synthetic_document(doc_size, skills, rng)
+            matcher = best_of(lambda: taxonomy.extract(document))
+            if taxonomy_size * doc_size <= REGEX_BUDGET:
+                regex = f"{best_of(lambda: regex_loop(document, skill_ids), repeats=1) * 1000:10.1f}"
+            else:
+                regex = f"{'skipped':>10}"
+            print(
+                f"{taxonomy_size:>7} {doc_size:>10} {build_ms:>9.1f} {matcher * 1000:>11.2f} "
+                f"{matcher * 1e6 / (doc_size / 1000):>9.1f} {regex}"
+            )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+Skill matrix benchmark: bitset AND + popcount vs. per-candidate Python sets
+
+Usage: python benchmarks/bench_skill_matrix.py [candidates]
+
+Answers "who has at least 4 of these 6 skills" over a synthetic pool.
+"""
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.skill_matrix import SkillMatrix
+
+SKILLS_PER_CANDIDATE = (5, 25)
+REQUIRED = ["python", "django", "postgresql", "docker", "aws", "kubernetes"]
+MIN_REQUIRED = 4
+
+
+def main():
+    candidates = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    matrix = SkillMatrix(capacity=candidates)
+    skill_ids = list(matrix.taxonomy.skills)
+    pool = [set(rng.sample(skill_ids, rng.randint(*SKILLS_PER_CANDIDATE))) for _ in range(candidates)]
+    
+    tracemalloc.start()
+    sets = [set(skills) for skills in pool]
+    set_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    started = time.perf_counter()
+    for index, skills in enumerate(pool):
+        matrix.add(str(index), skills)
+    load_seconds = time.perf_counter() - started
+    
+    required = set(REQUIRED)
+    started = time.perf_counter()
+    set_hits = sum(1 for skills in sets if len(skills & required) >= MIN_REQUIRED)
+    set_ms = (time.perf_counter() - started) * 1000
+    
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        result = matrix.match(REQUIRED, min_required=MIN_REQUIRED)
+        timings.append((time.perf_counter() - started) * 1000)
+    assert result["total"] == set_hits
+    
+    stats = matrix.get_stats()
+    print(f"candidates: {candidates:,}  skills: {stats['skills']}  matches: {set_hits:,}")
+    print(f"memory   sets: {set_bytes / 1e6:8.1f} MB   bitsets: {stats['bytes'] / 1e6:8.1f} MB")
+    print(f"query    sets: {set_ms:8.1f} ms   bitsets: {min(timings):8.1f} ms (best of 5)")
+    print(f"load bitsets: {load_seconds:.1f} s  (numpy {np.__version__})")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -3,10 +3,13 @@
 ## 📄 FILE 26: `src/agents/analytics/agent.py`
 
 import json
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from collections import Counter
+import numpy as np
 from ..base_agent import BaseAgent
 from .report_gen import ReportGenerator
+from ...utils.resume_parser import parse_resume
+from ...utils.skill_matrix import SkillMatrix
 from ...utils.logger import logger
 
 class AnalyticsAgent(BaseAgent):
@@ -38,7 +41,7 @@ class AnalyticsAgent(BaseAgent):
             elif report_type == "pipeline":
                 return self._generate_pipeline_report(data_points)
             elif report_type == "skills":
-                return self._generate_skill_analysis(data_points)
+                return self._generate_skill_analysis(data_points, input_data.get("required_skills"))
             else:
                 return {
                     "success": False,
@@ -52,8 +55,32 @@ class AnalyticsAgent(BaseAgent):
                 "error": str(e)
             }
     
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()"""
+        try:
+            if input_data.get("report_type", "summary") != "summary":
+                # Pipeline and skills reports need no LLM call
+                return self.process(input_data)
+            
+            summary = self._prepare_summary(input_data.get("data", self.data_store))
+            ai_insights = await self.agenerate_response(**summary.pop("llm"))
+            return self._summary_result(summary, ai_insights)
+            
+        except Exception as e:
+            logger.error(f"Analytics error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def _generate_summary(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate overall summary"""
+        summary = self._prepare_summary(data)
+        ai_insights = self.generate_response(**summary.pop("llm"))
+        return self._summary_result(summary, ai_insights)
+    
+    def _prepare_summary(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Calculate summary metrics and build the insights request"""
         # Calculate basic metrics
         total_candidates = len(data)
         resume_scores = [d.get("resume_score", 0) for d in data if "resume_score" in d]
@@ -62,31 +89,38 @@ class AnalyticsAgent(BaseAgent):
         avg_resume = sum(resume_scores) / len(resume_scores) if resume_scores else 0
         avg_interview = sum(interview_scores) / len(interview_scores) if interview_scores else 0
         
-        # Generate AI insights
-        prompt = f"""
-Analyze this HR data and provide insights:
-
-Total Candidates: {total_candidates}
-Average Resume Score: {avg_resume:.2f}
-Average Interview Score: {avg_interview:.2f}
-
-Provide:
+        # Generate AI insights; fixed instructions first so their prefill is reused
+        prefix = """
+Analyze the HR data below and provide:
 1. 3 key insights
 2. 3 actionable recommendations
 3. Trends observed
 
 Be specific and data-driven.
+"""
+        prompt = f"""
+Total Candidates: {total_candidates}
+Average Resume Score: {avg_resume:.2f}
+Average Interview Score: {avg_interview:.2f}
 """
         
-        ai_insights = self.generate_response(prompt, temperature=0.3, max_tokens=512)
-        
+        return {
+            "total_candidates": total_candidates,
+            "avg_resume_score": round(avg_resume, 2),
+            "avg_interview_score": round(avg_interview, 2),
+            "llm": {
+                "prefix": prefix,
+                "prompt": prompt,
+                "temperature": 0.3,
+                "max_tokens": 512
+            }
+        }
+    
+    def _summary_result(self, summary: Dict[str, Any], ai_insights: str) -> Dict[str, Any]:
+        """Build the summary report"""
         return {
             "success": True,
-            "summary": {
-                "total_candidates": total_candidates,
-                "avg_resume_score": round(avg_resume, 2),
-                "avg_interview_score": round(avg_interview, 2)
-            },
+            "summary": summary,
             "ai_insights": ai_insights,
             "generated_at": self.report_gen.get_timestamp()
         }
@@ -122,21 +156,41 @@ Be specific and data-driven.
             }
         }
     
-    def _generate_skill_analysis(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze skill gaps"""
+    def _generate_skill_analysis(
+        self,
+        data: List[Dict[str, Any]],
+        required_skills: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Analyze skill gaps, and optionally how many candidates have k of the required skills"""
         all_skills = []
         missing_skills = []
+        matrix = SkillMatrix(capacity=len(data)) if required_skills else None
         
-        for candidate in data:
-            all_skills.extend(candidate.get("skills_matched", []))
+        for index, candidate in enumerate(data):
+            # Candidates not screened yet contribute their resume's skills section
+            if "skills_matched" not in candidate and candidate.get("resume"):
+                candidate_skills = parse_resume(candidate["resume"]).skills
+            else:
+                candidate_skills = candidate.get("skills_matched", [])
+            all_skills.extend(candidate_skills)
             missing_skills.extend(candidate.get("skills_missing", []))
+            if matrix is not None:
+                matrix.add(str(index), candidate_skills)
         
         skill_counts = Counter(all_skills)
         gap_counts = Counter(missing_skills)
         
-        return {
+        result = {
             "success": True,
             "most_common_skills": dict(skill_counts.most_common(10)),
             "skill_gaps": dict(gap_counts.most_common(10)),
             "analysis": f"Analyzed {len(data)} candidates"
-        }
\ No newline at end of file
+        }
+        if matrix is not None:
+            required = matrix.canonical(required_skills)
+            histogram = np.bincount(matrix.counts(required), minlength=len(required) + 1)
+            result["required_skill_coverage"] = {
+                "required": sorted(required),
+                "candidates_with": {f"{k}_of_{len(required)}": int(n) for k, n in enumerate(histogram)}
+            }
+        return result
\ No newline at end of file
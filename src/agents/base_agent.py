@@ -1,6 +1,10 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator, List
 from ..llm.llm_client import LLMClient
+from ..llm.early_stop import StopCondition
+from ..llm.json_repair import parse_json, ParseStats, PARSED, FAILED
+from ..llm.tokens import Section, estimate_tokens, fit_sections
 from ..utils.logger import logger
 
 class BaseAgent(ABC):
@@ -10,6 +14,7 @@ class BaseAgent(ABC):
         self.name = name
         self.llm = llm_client
         self.conversation_history = []
+        self.parse_stats = ParseStats()
         logger.info(f"Initialized {self.name}")
     
     @abstractmethod
@@ -17,6 +22,14 @@ class BaseAgent(ABC):
         """Process agent-specific task"""
         pass
     
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()
+        
+        Agents override this with a native async implementation; the
+        default runs process() in a worker thread.
+        """
+        return await asyncio.to_thread(self.process, input_data)
+    
     @abstractmethod
     def get_system_prompt(self) -> str:
         """Return agent's system prompt"""
@@ -31,21 +44,117 @@ class BaseAgent(ABC):
             logger.error(f"Error loading prompt {prompt_file}: {e}")
             return ""
     
+    # Headroom for estimator error against the model's real tokenizer
+    CONTEXT_MARGIN = 0.1
+    
+    def fit_to_context(self, sections: List[Section], max_tokens: int, overhead: str = "") -> Dict[str, str]:
+        """Trim prompt sections so prompt + completion fit the model's context window
+        
+        `overhead` is the fixed prompt text around the sections. Sections
+        come back unchanged when the window is unknown or already fits.
+        """
+        window = getattr(self.llm, "context_window", None)
+        if not isinstance(window, int) or window <= 0:
+            return {s.name: s.text for s in sections}
+        
+        fixed = estimate_tokens(self.get_system_prompt()) + estimate_tokens(overhead) + max_tokens
+        budget = int(window * (1 - self.CONTEXT_MARGIN)) - fixed
+        fitted = fit_sections(sections, max(budget, 0))
+        trimmed = [s.name for s in sections if fitted[s.name] != s.text]
+        if trimmed:
+            logger.info(f"{self.name} trimmed {', '.join(trimmed)} to fit {window}-token context")
+        return fitted
+    
     def generate_response(
         self,
         prompt: str,
         temperature: float = 0.7,
-        max_tokens: int = 1024
+        max_tokens: int = 1024,
+        use_cache: bool = True,
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        stop_when: Optional[List[StopCondition]] = None
     ) -> str:
-        """Generate LLM response"""
+        """Generate LLM response
+        
+        `prefix` is a prompt head shared across calls (e.g. the job
+        description) whose prefill the client may reuse; `schema`
+        requests JSON output matching a JSON Schema; `stop_when` ends
+        generation as soon as the answer is complete.
+        """
         system_prompt = self.get_system_prompt()
         return self.llm.generate(
             prompt=prompt,
             temperature=temperature,
             max_tokens=max_tokens,
-            system=system_prompt
+            system=system_prompt,
+            use_cache=use_cache,
+            prefix=prefix,
+            schema=schema,
+            stop_when=stop_when
+        )
+    
+    async def agenerate_response(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        use_cache: bool = True,
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        stop_when: Optional[List[StopCondition]] = None
+    ) -> str:
+        """Generate LLM response without blocking the event loop"""
+        system_prompt = self.get_system_prompt()
+        return await self.llm.agenerate(
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system=system_prompt,
+            use_cache=use_cache,
+            prefix=prefix,
+            schema=schema,
+            stop_when=stop_when
+        )
+    
+    def generate_response_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        use_cache: bool = True,
+        prefix: Optional[str] = None
+    ) -> Iterator[str]:
+        """Generate LLM response, yielding chunks as they arrive"""
+        system_prompt = self.get_system_prompt()
+        return self.llm.generate_stream(
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system=system_prompt,
+            use_cache=use_cache,
+            prefix=prefix
         )
     
+    def parse_json_output(self, response: str) -> Optional[Dict[str, Any]]:
+        """Parse (and if truncated, repair) a JSON object from LLM output
+        
+        Outcomes are counted per agent; None means the output was unusable.
+        """
+        if response.startswith("Error:"):
+            return None
+        data, status = parse_json(response)
+        if not isinstance(data, dict):
+            data, status = None, FAILED
+        self.parse_stats.record(status)
+        if status != PARSED:
+            logger.warning(f"{self.name} JSON output {status}")
+        return data
+    
+    def get_parse_stats(self) -> Dict[str, Any]:
+        """Return structured-output parse statistics"""
+        return self.parse_stats.get_stats()
+    
     def reset_context(self):
         """Clear conversation history"""
         self.conversation_history = []
@@ -1,13 +1,42 @@
-import json
-import re
 from typing import Dict, Any, List
 from ..base_agent import BaseAgent
+from ...llm.early_stop import JSONComplete
+from ...llm.tokens import Section
+from ...utils.resume_parser import parse_resume
 from .validators import ResumeValidator
 from ...utils.logger import logger
 
 class DocumentVerificationAgent(BaseAgent):
     """Document Verification Agent - Verifies resume credibility"""
     
+    # Mirrors the output format in prompts.md
+    OUTPUT_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "verification_status": {"type": "string", "enum": ["verified", "suspicious", "high_risk"]},
+            "risk_score": {"type": "integer", "minimum": 0, "maximum": 100},
+            "issues_found": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "type": {"type": "string"},
+                        "severity": {"type": "string", "enum": ["low", "medium", "high", "critical"]},
+                        "description": {"type": "string"},
+                        "recommendation": {"type": "string"}
+                    },
+                    "required": ["type", "severity", "description"]
+                }
+            },
+            "recommendations": {"type": "array", "items": {"type": "string"}},
+            "verified_claims": {"type": "array", "items": {"type": "string"}}
+        },
+        "required": ["issues_found", "recommendations"]
+    }
+    
+    # Everything but contact details: claimed skills and summary are checked against experience
+    RESUME_SECTIONS = ("summary", "skills", "experience", "education", "certifications")
+    
     def __init__(self, llm_client):
         super().__init__("Document Verification Agent", llm_client)
         self.validator = ResumeValidator()
@@ -21,52 +50,12 @@ class DocumentVerificationAgent(BaseAgent):
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Verify resume document"""
         try:
-            resume_text = input_data.get("resume", "")
-            
-            if not resume_text:
-                return {
-                    "success": False,
-                    "error": "No resume provided"
-                }
-            
-            # Run rule-based checks
-            rule_based_issues = self.validator.check_resume(resume_text)
-            
-            # LLM-based analysis
-            prompt = f"""
-Analyze this resume for credibility and consistency:
-
-RESUME:
-{resume_text}
-
-Identify:
-1. Any inconsistencies or red flags
-2. Suspicious claims
-3. Timeline issues
-4. Skill-experience mismatches
-
-Provide detailed verification report in JSON format as specified.
-"""
-            
-            response = self.generate_response(prompt, temperature=0.1, max_tokens=2048)
+            request = self._prepare_request(input_data)
+            if "llm" not in request:
+                return request
             
-            # Parse verification result
-            verification = self._parse_verification(response)
-            
-            # Merge rule-based and LLM findings
-            all_issues = rule_based_issues + verification.get("issues_found", [])
-            
-            # Calculate final risk score
-            risk_score = self._calculate_risk_score(all_issues)
-            
-            return {
-                "success": True,
-                "verification_status": self._get_status(risk_score),
-                "risk_score": risk_score,
-                "issues_found": all_issues,
-                "recommendations": verification.get("recommendations", []),
-                "agent": self.name
-            }
+            response = self.generate_response(**request["llm"])
+            return self._build_result(request, response)
             
         except Exception as e:
             logger.error(f"Document verification error: {e}")
@@ -75,24 +64,107 @@ Provide detailed verification report in JSON format as specified.
                 "error": str(e)
             }
     
-    def _parse_verification(self, response: str) -> Dict[str, Any]:
-        """Parse verification response"""
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()"""
         try:
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
+            request = self._prepare_request(input_data)
+            if "llm" not in request:
+                return request
             
+            response = await self.agenerate_response(**request["llm"])
+            return self._build_result(request, response)
+            
+        except Exception as e:
+            logger.error(f"Document verification error: {e}")
             return {
-                "issues_found": [],
-                "recommendations": [],
-                "raw_analysis": response
+                "success": False,
+                "error": str(e)
             }
-        except Exception as e:
-            logger.warning(f"Verification parsing failed: {e}")
+    
+    def _prepare_request(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run rule-based checks and build the LLM request (or an error result)"""
+        resume_text = input_data.get("resume", "")
+        
+        if not resume_text:
             return {
-                "issues_found": [],
-                "recommendations": []
+                "success": False,
+                "error": "No resume provided"
             }
+        
+        # Run rule-based checks
+        rule_based_issues = self.validator.check_resume(resume_text)
+        
+        # LLM-based analysis; fixed instructions first so their prefill is reused
+        prefix = """
+Analyze the resume below for credibility and consistency.
+
+Identify:
+1. Any inconsistencies or red flags
+2. Suspicious claims
+3. Timeline issues
+4. Skill-experience mismatches
+
+Provide detailed verification report in JSON format as specified.
+"""
+        # Contact details play no part in the checks
+        sections = parse_resume(resume_text).render(self.RESUME_SECTIONS)
+        max_tokens = 2048
+        fitted = self.fit_to_context([Section("resume", sections)], max_tokens, overhead=prefix)
+        prompt = f"""
+RESUME:
+{fitted["resume"]}
+"""
+        
+        return {
+            "rule_based_issues": rule_based_issues,
+            "llm": {
+                "prefix": prefix,
+                "prompt": prompt,
+                "temperature": 0.1,
+                "max_tokens": max_tokens,
+                "schema": self.OUTPUT_SCHEMA,
+                "stop_when": [JSONComplete()]
+            }
+        }
+    
+    def _build_result(self, request: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Merge rule-based and LLM findings into the verification result"""
+        # Parse verification result
+        verification = self._parse_verification(response)
+        
+        # Merge rule-based and LLM findings
+        all_issues = request["rule_based_issues"] + verification.get("issues_found", [])
+        
+        # Calculate final risk score
+        risk_score = self._calculate_risk_score(all_issues)
+        
+        result = {
+            "success": True,
+            "verification_status": self._get_status(risk_score),
+            "risk_score": risk_score,
+            "issues_found": all_issues,
+            "recommendations": verification.get("recommendations", []),
+            "agent": self.name,
+            "provenance": verification["provenance"]
+        }
+        if verification["provenance"] == "fallback":
+            result["raw_analysis"] = verification["raw_analysis"]
+        return result
+    
+    def _parse_verification(self, response: str) -> Dict[str, Any]:
+        """Parse verification response, repairing truncated output"""
+        data = self.parse_json_output(response)
+        if data is not None:
+            data["provenance"] = "llm"
+            return data
+        
+        # Only rule-based findings remain; "Error:" raw analysis means the LLM never answered
+        return {
+            "issues_found": [],
+            "recommendations": [],
+            "raw_analysis": response,
+            "provenance": "fallback"
+        }
     
     def _calculate_risk_score(self, issues: List[Dict[str, Any]]) -> int:
         """Calculate overall risk score"""
@@ -1,17 +1,24 @@
 import os
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
 from ..base_agent import BaseAgent
 from .tools import PolicySearchTool
+from .semantic_cache import SemanticCache
 from ...utils.logger import logger
 
 class HRAssistantAgent(BaseAgent):
     """HR Assistant Agent - Answers policy and benefits questions"""
     
-    def __init__(self, llm_client, policy_dir: str = "data/hr_policies"):
+    def __init__(
+        self,
+        llm_client,
+        policy_dir: str = "data/hr_policies",
+        semantic_cache: Optional[SemanticCache] = None
+    ):
         super().__init__("HR Assistant Agent", llm_client)
         self.policy_dir = policy_dir
         self.policy_tool = PolicySearchTool(policy_dir)
+        self.semantic_cache = semantic_cache
     
     def get_system_prompt(self) -> str:
         return "You are a helpful HR assistant. Answer briefly."
@@ -21,56 +28,145 @@ class HRAssistantAgent(BaseAgent):
         try:
             query = input_data.get("query", "").lower()
             
-            # RULE-BASED RESPONSES for common queries
-            quick_answer = self._get_quick_answer(query)
-            if quick_answer:
-                return quick_answer
+            result = self._prepare_answer(query)
+            if "llm" not in result:
+                return result
             
-            # For other queries, use MINIMAL LLM
-            relevant_policies = self.policy_tool.search(query, top_k=1)
+            response = self.generate_response(**result.pop("llm"))
             
-            if not relevant_policies:
-                return {
-                    "success": True,
-                    "query": query,
-                    "answer": "I don't have specific information about that. Please check the HR handbook or contact hr@company.com",
-                    "policies_referenced": []
-                }
+            result["answer"] = response if response else "Please check the HR policy documents."
+            self._remember_answer(result)
+            return result
             
-            # Get ONLY the most relevant snippet
-            policy_name, full_content = list(relevant_policies.items())[0]
+        except Exception as e:
+            logger.error(f"HR Assistant error: {e}")
+            return self._fallback_answer(input_data.get("query", ""))
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()"""
+        try:
+            query = input_data.get("query", "").lower()
             
-            # Extract ONLY relevant section (max 300 chars)
-            snippet = self._extract_relevant_snippet(full_content, query, max_len=300)
+            result = self._prepare_answer(query)
+            if "llm" not in result:
+                return result
             
-            # ULTRA SHORT PROMPT
-            prompt = f"""Policy: {snippet}
-
-Question: {query}
-
-Answer in 1-2 sentences:"""
+            response = await self.agenerate_response(**result.pop("llm"))
             
-            response = self.generate_response(
-                prompt,
-                temperature=0.3,
-                max_tokens=100  # VERY SHORT
-            )
+            result["answer"] = response if response else "Please check the HR policy documents."
+            self._remember_answer(result)
+            return result
             
-            return {
-                "success": True,
-                "query": query,
-                "answer": response if response else "Please check the HR policy documents.",
-                "policies_referenced": [policy_name]
-            }
+        except Exception as e:
+            logger.error(f"HR Assistant error: {e}")
+            return self._fallback_answer(input_data.get("query", ""))
+    
+    def process_stream(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Process HR query, returning an 'answer_stream' iterator when the LLM is needed"""
+        try:
+            query = input_data.get("query", "").lower()
+            
+            result = self._prepare_answer(query)
+            if "llm" not in result:
+                return result
+            
+            stream = self.generate_response_stream(**result.pop("llm"))
+            result["answer_stream"] = self._remember_stream(result, stream)
+            return result
             
         except Exception as e:
             logger.error(f"HR Assistant error: {e}")
+            return self._fallback_answer(input_data.get("query", ""))
+    
+    def _prepare_answer(self, query: str) -> Dict[str, Any]:
+        """Resolve query without the LLM, or build the prompt that needs one"""
+        # RULE-BASED RESPONSES for common queries
+        quick_answer = self._get_quick_answer(query)
+        if quick_answer:
+            return quick_answer
+        
+        # Answers cached for earlier policy versions are stale
+        if self.policy_tool.refresh_if_changed() and self.semantic_cache is not None:
+            self.semantic_cache.clear()
+        
+        # Previously answered (similar) question
+        if self.semantic_cache is not None:
+            cached = self.semantic_cache.lookup(query)
+            if cached:
+                return {
+                    "success": True,
+                    "query": query,
+                    "answer": cached["answer"],
+                    "policies_referenced": cached["policies_referenced"],
+                    "semantic_cache_hit": True,
+                    "similarity": cached["similarity"]
+                }
+        
+        # For other queries, use MINIMAL LLM
+        relevant_policies = self.policy_tool.search(query, top_k=1)
+        
+        if not relevant_policies:
             return {
                 "success": True,
                 "query": query,
-                "answer": "Please check the HR policy documents in data/hr_policies folder or contact HR.",
+                "answer": "I don't have specific information about that. Please check the HR handbook or contact hr@company.com",
                 "policies_referenced": []
             }
+        
+        # Get ONLY the most relevant snippet
+        policy_name, full_content = list(relevant_policies.items())[0]
+        
+        # Extract ONLY relevant section (max 300 chars)
+        snippet = self._extract_relevant_snippet(full_content, query, max_len=300)
+        
+        # ULTRA SHORT PROMPT
+        prompt = f"""Policy: {snippet}
+
+Question: {query}
+
+Answer in 1-2 sentences:"""
+        
+        return {
+            "success": True,
+            "query": query,
+            "policies_referenced": [policy_name],
+            "llm": {
+                "prompt": prompt,
+                "temperature": 0.3,
+                "max_tokens": 100  # VERY SHORT
+            }
+        }
+    
+    def _remember_answer(self, result: Dict[str, Any]):
+        """Store an LLM answer in the semantic cache"""
+        if self.semantic_cache is None:
+            return
+        answer = result.get("answer", "")
+        if answer and not answer.startswith("Error:") and result.get("policies_referenced"):
+            self.semantic_cache.store(result["query"], answer, result["policies_referenced"])
+    
+    def _remember_stream(self, result: Dict[str, Any], stream: Iterator[str]) -> Iterator[str]:
+        """Pass chunks through, caching the full answer once the stream completes"""
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        
+        if not any(chunk.startswith("Error:") for chunk in chunks):
+            self._remember_answer({**result, "answer": "".join(chunks)})
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return semantic cache statistics"""
+        return self.semantic_cache.get_stats() if self.semantic_cache is not None else {}
+    
+    def _fallback_answer(self, query: str) -> Dict[str, Any]:
+        """Answer used when query processing fails"""
+        return {
+            "success": True,
+            "query": query,
+            "answer": "Please check the HR policy documents in data/hr_policies folder or contact HR.",
+            "policies_referenced": []
+        }
     
     def _get_quick_answer(self, query: str) -> Dict[str, Any]:
         """Rule-based quick answers for common queries"""
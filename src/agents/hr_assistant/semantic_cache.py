@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, Any, List, Optional
+import numpy as np
+from ...utils.logger import logger
+
+
+class SemanticCache:
+    """Answer cache matched by query embedding similarity"""
+    
+    def __init__(self, embedder, threshold: Optional[float] = None, max_entries: int = 1000):
+        self.embedder = embedder
+        self.threshold = threshold if threshold is not None else embedder.default_threshold
+        self.max_entries = max_entries
+        
+        # Preallocated float16 matrix used as a ring buffer; rows are unit vectors
+        self._vectors = np.zeros((max_entries, embedder.dim), dtype=np.float16)
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+    
+    def _embed(self, query: str) -> np.ndarray:
+        return self.embedder.embed([query])[0]
+    
+    def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """Return the stored answer for the most similar query above the threshold"""
+        vector = self._embed(query)
+        with self._lock:
+            if self._size == 0:
+                self._stats["misses"] += 1
+                return None
+            
+            scores = self._vectors[:self._size].astype(np.float32) @ vector
+            best = int(np.argmax(scores))
+            similarity = float(scores[best])
+            if similarity < self.threshold:
+                self._stats["misses"] += 1
+                return None
+            
+            self._stats["hits"] += 1
+            entry = dict(self._entries[best])
+        
+        entry["similarity"] = round(similarity, 4)
+        logger.info(f"Semantic cache hit ({similarity:.2f}): '{query}' ~ '{entry['query']}'")
+        return entry
+    
+    def store(self, query: str, answer: str, policies_referenced: List[str]):
+        """Remember an answer, replacing the oldest entry when full"""
+        vector = self._embed(query)
+        with self._lock:
+            slot = self._next
+            self._vectors[slot] = vector
+            self._entries[slot] = {
+                "query": query,
+                "answer": answer,
+                "policies_referenced": list(policies_referenced)
+            }
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+            self._stats["stores"] += 1
+    
+    def clear(self):
+        """Drop all entries (e.g. after policy documents change)"""
+        with self._lock:
+            self._vectors[:] = 0
+            self._entries = [None] * self.max_entries
+            self._size = 0
+            self._next = 0
+            self._stats["invalidations"] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = self._size
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["threshold"] = self.threshold
+        stats["embedder"] = self.embedder.name
+        return stats
@@ -1,3 +1,4 @@
+import hashlib
 from pathlib import Path
 from typing import Dict, List
 from ...utils.file_loader import FileLoader
@@ -8,8 +9,32 @@ class PolicySearchTool:
     
     def __init__(self, policy_dir: str):
         self.policy_dir = Path(policy_dir)
+        self.fingerprint = self._fingerprint()
         self.policies = self._load_policies()
     
+    def _fingerprint(self) -> str:
+        """Hash of policy file names, sizes and modification times"""
+        if not self.policy_dir.exists():
+            return ""
+        
+        digest = hashlib.sha1()
+        for file in sorted(self.policy_dir.iterdir()):
+            if file.suffix in ['.md', '.txt']:
+                stat = file.stat()
+                digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+    
+    def refresh_if_changed(self) -> bool:
+        """Reload policies if files were added, removed or edited"""
+        fingerprint = self._fingerprint()
+        if fingerprint == self.fingerprint:
+            return False
+        
+        logger.info("Policy documents changed, reloading")
+        self.fingerprint = fingerprint
+        self.policies = self._load_policies()
+        return True
+    
     def _load_policies(self) -> Dict[str, str]:
         """Load all policy documents"""
         policies = {}
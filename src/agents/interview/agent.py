@@ -1,16 +1,20 @@
 import json
 import re
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from ..base_agent import BaseAgent
+from ...llm.early_stop import ItemsComplete
 from .evaluator import InterviewEvaluator
+from ...utils.jd_analyzer import JDAnalyzer
 from ...utils.logger import logger
 
 class InterviewAgent(BaseAgent):
     """Interview Agent - Conducts and evaluates interviews"""
     
-    def __init__(self, llm_client):
+    def __init__(self, llm_client, jd_analyzer: Optional[JDAnalyzer] = None):
         super().__init__("Interview Agent", llm_client)
         self.evaluator = InterviewEvaluator()
+        # Shared with resume screening, so a JD screened against is not re-read here
+        self.jd_analyzer = jd_analyzer or JDAnalyzer()
         self.current_interview = None
     
     def get_system_prompt(self) -> str:
@@ -19,14 +23,42 @@ class InterviewAgent(BaseAgent):
     def generate_questions(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate interview questions with robust parsing"""
         try:
-            job_role = input_data.get("job_role", "")
-            job_description = input_data.get("job_description", "")
-            num_questions = input_data.get("num_questions", 5)
+            request = self._prepare_questions_request(input_data)
+            response = self.generate_response(**request["llm"])
+            return self._start_interview(request, response)
             
-            # ULTRA SIMPLE PROMPT - No JSON request
-            prompt = f"""Generate {num_questions} interview questions for: {job_role}
+        except Exception as e:
+            logger.error(f"Question generation error: {e}")
+            return self._fallback_questions_result(input_data)
+    
+    async def agenerate_questions(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of generate_questions()"""
+        try:
+            request = self._prepare_questions_request(input_data)
+            response = await self.agenerate_response(**request["llm"])
+            return self._start_interview(request, response)
+            
+        except Exception as e:
+            logger.error(f"Question generation error: {e}")
+            return self._fallback_questions_result(input_data)
+    
+    def _prepare_questions_request(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the question generation request"""
+        job_role = input_data.get("job_role", "")
+        job_description = input_data.get("job_description", "")
+        num_questions = input_data.get("num_questions", 5)
+        
+        analysis = self.jd_analyzer.analyze(job_description) if job_description else None
+        if analysis is not None and analysis.structured:
+            job_role = job_role or analysis.title
+            requirements = "; ".join(analysis.must_haves)[:400]
+        else:
+            requirements = job_description[:200]
+        
+        # ULTRA SIMPLE PROMPT - No JSON request
+        prompt = f"""Generate {num_questions} interview questions for: {job_role}
 
-Requirements: {job_description[:200]}
+Requirements: {requirements}
 
 List each question on a new line starting with "Q1:", "Q2:", etc.
 
@@ -36,36 +68,69 @@ Q2: Describe a challenging project you worked on
 Q3: How do you handle tight deadlines?
 
 Now generate {num_questions} questions:"""
-            
-            response = self.generate_response(prompt, temperature=0.7, max_tokens=500)
-            
-            # Parse questions from plain text
-            questions = self._parse_questions_from_text(response, num_questions)
-            
-            # Initialize interview session
-            self.current_interview = {
-                "job_role": job_role,
-                "questions": questions,
-                "answers": [],
-                "current_question": 0
-            }
-            
-            return {
-                "success": True,
-                "questions": questions,
-                "session_id": id(self.current_interview)
-            }
-            
-        except Exception as e:
-            logger.error(f"Question generation error: {e}")
-            # FALLBACK: Generate generic questions
-            return {
-                "success": True,
-                "questions": self._get_fallback_questions(num_questions, job_role)
+        
+        return {
+            "job_role": job_role,
+            "num_questions": num_questions,
+            "llm": {
+                "prompt": prompt,
+                "temperature": 0.7,
+                "max_tokens": 500,
+                # Stop as soon as the last question line is complete
+                "stop_when": [ItemsComplete(
+                    lambda text: len(self._extract_questions(text)), num_questions, name="questions"
+                )]
             }
+        }
+    
+    def _start_interview(self, request: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Parse generated questions and open an interview session"""
+        # Parse questions from plain text
+        questions = self._parse_questions_from_text(response, request["num_questions"])
+        
+        # Initialize interview session
+        self.current_interview = {
+            "job_role": request["job_role"],
+            "questions": questions,
+            "answers": [],
+            "current_question": 0
+        }
+        
+        return {
+            "success": True,
+            "questions": questions,
+            "session_id": id(self.current_interview)
+        }
+    
+    def _fallback_questions_result(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """FALLBACK: Generate generic questions"""
+        return {
+            "success": True,
+            "questions": self._get_fallback_questions(
+                input_data.get("num_questions", 5),
+                input_data.get("job_role", "")
+            )
+        }
     
     def _parse_questions_from_text(self, text: str, expected_num: int) -> List[Dict[str, Any]]:
         """Parse questions from plain text response"""
+        questions = self._extract_questions(text)
+        
+        # Ensure we have expected number
+        if len(questions) < expected_num:
+            logger.warning(f"Only parsed {len(questions)} questions, expected {expected_num}")
+            # Add fallback questions
+            while len(questions) < expected_num:
+                questions.append({
+                    "id": len(questions) + 1,
+                    "question": f"Describe your relevant experience and skills for this role.",
+                    "type": "general"
+                })
+        
+        return questions[:expected_num]
+    
+    def _extract_questions(self, text: str) -> List[Dict[str, Any]]:
+        """Questions found in the text, without padding"""
         questions = []
         
         # Try multiple parsing strategies
@@ -102,18 +167,7 @@ Now generate {num_questions} questions:"""
                     "type": self._guess_question_type(line)
                 })
         
-        # Ensure we have expected number
-        if len(questions) < expected_num:
-            logger.warning(f"Only parsed {len(questions)} questions, expected {expected_num}")
-            # Add fallback questions
-            while len(questions) < expected_num:
-                questions.append({
-                    "id": len(questions) + 1,
-                    "question": f"Describe your relevant experience and skills for this role.",
-                    "type": "general"
-                })
-        
-        return questions[:expected_num]
+        return questions
     
     def _guess_question_type(self, question: str) -> str:
         """Guess question type from content"""
@@ -151,17 +205,44 @@ Now generate {num_questions} questions:"""
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process interview answer and evaluate"""
         try:
-            question = input_data.get("question", "")
-            answer = input_data.get("answer", "")
+            request = self._prepare_evaluation_request(input_data)
+            if "llm" not in request:
+                return request
             
-            if not question or not answer:
-                return {
-                    "success": False,
-                    "error": "Missing question or answer"
-                }
+            response = self.generate_response(**request["llm"])
+            return self._record_evaluation(request, response)
             
-            # Simple evaluation prompt - no JSON
-            prompt = f"""Evaluate this interview answer on a scale of 0-10.
+        except Exception as e:
+            logger.error(f"Interview evaluation error: {e}")
+            return self._fallback_evaluation()
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()"""
+        try:
+            request = self._prepare_evaluation_request(input_data)
+            if "llm" not in request:
+                return request
+            
+            response = await self.agenerate_response(**request["llm"])
+            return self._record_evaluation(request, response)
+            
+        except Exception as e:
+            logger.error(f"Interview evaluation error: {e}")
+            return self._fallback_evaluation()
+    
+    def _prepare_evaluation_request(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate input and build the evaluation request (or an error result)"""
+        question = input_data.get("question", "")
+        answer = input_data.get("answer", "")
+        
+        if not question or not answer:
+            return {
+                "success": False,
+                "error": "Missing question or answer"
+            }
+        
+        # Simple evaluation prompt - no JSON
+        prompt = f"""Evaluate this interview answer on a scale of 0-10.
 
 Question: {question}
 
@@ -172,32 +253,43 @@ Provide:
 - Feedback:
 
 Keep it brief."""
-            
-            response = self.generate_response(prompt, temperature=0.3, max_tokens=300)
-            evaluation = self._parse_evaluation_from_text(response)
-            
-            # Store in session if active
-            if self.current_interview:
-                self.current_interview["answers"].append({
-                    "question": question,
-                    "answer": answer,
-                    "evaluation": evaluation
-                })
-            
-            return {
-                "success": True,
-                "evaluation": evaluation
+        
+        return {
+            "question": question,
+            "answer": answer,
+            "llm": {
+                "prompt": prompt,
+                "temperature": 0.3,
+                "max_tokens": 300
             }
-            
-        except Exception as e:
-            logger.error(f"Interview evaluation error: {e}")
-            return {
-                "success": True,
-                "evaluation": {
-                    "score": 5,
-                    "feedback": "Evaluation completed. Response noted."
-                }
+        }
+    
+    def _record_evaluation(self, request: Dict[str, Any], response: str) -> Dict[str, Any]:
+        """Parse the evaluation and store it in the active session"""
+        evaluation = self._parse_evaluation_from_text(response)
+        
+        # Store in session if active
+        if self.current_interview:
+            self.current_interview["answers"].append({
+                "question": request["question"],
+                "answer": request["answer"],
+                "evaluation": evaluation
+            })
+        
+        return {
+            "success": True,
+            "evaluation": evaluation
+        }
+    
+    def _fallback_evaluation(self) -> Dict[str, Any]:
+        """Neutral evaluation used when scoring fails"""
+        return {
+            "success": True,
+            "evaluation": {
+                "score": 5,
+                "feedback": "Evaluation completed. Response noted."
             }
+        }
     
     def _parse_evaluation_from_text(self, text: str) -> Dict[str, Any]:
         """Parse evaluation from plain text"""
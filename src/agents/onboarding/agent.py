@@ -37,8 +37,44 @@ class OnboardingAgent(BaseAgent):
                 "error": str(e)
             }
     
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()"""
+        try:
+            action = input_data.get("action", "create_plan")
+            
+            if action == "create_plan":
+                result = self._prepare_plan(input_data)
+                result["welcome_message"] = await self.agenerate_response(**result.pop("llm"))
+                return result
+            elif action == "answer_question":
+                request = self._prepare_question(input_data)
+                return self._question_result(request, await self.agenerate_response(**request["llm"]))
+            
+            # Remaining actions need no LLM call
+            return self.process(input_data)
+            
+        except Exception as e:
+            logger.error(f"Onboarding error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def _create_onboarding_plan(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create personalized onboarding plan"""
+        result = self._prepare_plan(input_data)
+        request = result.pop("llm")
+        
+        # Streaming callers render the welcome message as it is generated
+        if input_data.get("stream"):
+            result["welcome_message_stream"] = self.generate_response_stream(**request)
+        else:
+            result["welcome_message"] = self.generate_response(**request)  # Plain text string
+        
+        return result
+    
+    def _prepare_plan(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the plan and the welcome message request"""
         employee_name = input_data.get("employee_name", "New Employee")
         role = input_data.get("role", "Employee")
         start_date = input_data.get("start_date", "")
@@ -56,22 +92,24 @@ Include:
 
 Keep it under 100 words and friendly."""
         
-        welcome_message = self.generate_response(prompt, temperature=0.6, max_tokens=200)
-        
         # Structured response (NOT asking LLM for JSON)
         return {
             "success": True,
             "employee_name": employee_name,
             "role": role,
             "start_date": start_date,
-            "welcome_message": welcome_message,  # Plain text string
             "checklist": checklist,
             "completion_percentage": 0,
             "next_steps": [
                 "Complete all pre-joining tasks",
                 "Prepare required documents",
                 "Note your start date and time"
-            ]
+            ],
+            "llm": {
+                "prompt": prompt,
+                "temperature": 0.6,
+                "max_tokens": 200
+            }
         }
     
     def _update_progress(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -88,6 +126,11 @@ Keep it under 100 words and friendly."""
     
     def _answer_question(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Answer onboarding question"""
+        request = self._prepare_question(input_data)
+        return self._question_result(request, self.generate_response(**request["llm"]))
+    
+    def _prepare_question(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the onboarding question request"""
         question = input_data.get("question", "")
         
         prompt = f"""Answer this onboarding question briefly:
@@ -96,10 +139,19 @@ Keep it under 100 words and friendly."""
 
 Answer in 2-3 sentences:"""
         
-        answer = self.generate_response(prompt, temperature=0.3, max_tokens=150)
-        
         return {
-            "success": True,
             "question": question,
+            "llm": {
+                "prompt": prompt,
+                "temperature": 0.3,
+                "max_tokens": 150
+            }
+        }
+    
+    def _question_result(self, request: Dict[str, Any], answer: str) -> Dict[str, Any]:
+        """Build the onboarding answer result"""
+        return {
+            "success": True,
+            "question": request["question"],
             "answer": answer
         }
\ No newline at end of file
@@ -1,16 +1,57 @@
-import json
-import re
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ..base_agent import BaseAgent
+from ...llm.early_stop import JSONComplete
+from ...llm.tokens import Section
+from ...utils.resume_parser import parse_resume
+from ...utils.jd_analyzer import JDAnalyzer
 from .scorer import ResumeScorer
+from .cascade import ScreeningCascade
+from .candidate_index import CandidateIndex
 from ...utils.logger import logger
 
 class ResumeScreeningAgent(BaseAgent):
     """Resume Screening Agent - Ranks and scores candidates"""
     
-    def __init__(self, llm_client):
+    # Mirrors the output format in prompts.md
+    OUTPUT_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "score": {"type": "integer", "minimum": 0, "maximum": 100},
+            "skills_matched": {"type": "array", "items": {"type": "string"}},
+            "skills_missing": {"type": "array", "items": {"type": "string"}},
+            "seniority_fit": {"type": "string", "enum": ["low", "medium", "high"]},
+            "education_match": {"type": "boolean"},
+            "years_experience": {"type": "number"},
+            "reasoning": {"type": "string"},
+            "recommendation": {"type": "string"}
+        },
+        "required": ["score", "skills_matched", "skills_missing", "reasoning", "recommendation"]
+    }
+    
+    # Contact details and unrelated sections (projects, awards) are left out
+    RESUME_SECTIONS = ("summary", "skills", "experience", "education", "certifications")
+    
+    # Fixed instruction text around the JD and resume, for token budgeting
+    PROMPT_OVERHEAD = (
+        "Analyze this resume against the job description and provide a detailed scoring. "
+        "JOB DESCRIPTION: RESUME: Evaluate the candidate and provide your assessment "
+        "in the exact JSON format specified in your instructions."
+    )
+    
+    def __init__(
+        self,
+        llm_client,
+        cascade: Optional[ScreeningCascade] = None,
+        candidate_index: Optional[CandidateIndex] = None,
+        jd_analyzer: Optional[JDAnalyzer] = None
+    ):
         super().__init__("Resume Screening Agent", llm_client)
         self.scorer = ResumeScorer()
+        # One JD reading per requisition, shared by every resume screened against it
+        self.jd_analyzer = jd_analyzer or JDAnalyzer(self.scorer.taxonomy)
+        # Clear-cut candidates are decided without an LLM call
+        self.cascade = cascade or ScreeningCascade(self.scorer, analyzer=self.jd_analyzer)
+        self.candidate_index = candidate_index
         self.prompt_template = self._load_prompt_template(
             "src/agents/resume_screening/prompts.md"
         )
@@ -21,40 +62,13 @@ class ResumeScreeningAgent(BaseAgent):
     def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Screen resume against job description"""
         try:
-            resume_text = input_data.get("resume", "")
-            jd_text = input_data.get("job_description", "")
-            
-            if not resume_text or not jd_text:
-                return {
-                    "success": False,
-                    "error": "Missing resume or job description"
-                }
-            
-            # Build evaluation prompt
-            prompt = f"""
-Analyze this resume against the job description and provide a detailed scoring.
-
-JOB DESCRIPTION:
-{jd_text}
-
-RESUME:
-{resume_text}
-
-Evaluate the candidate and provide your assessment in the exact JSON format specified in your instructions.
-"""
+            request = self._prepare_request(input_data)
+            if "llm" not in request:
+                return request
             
             # Generate assessment
-            response = self.generate_response(prompt, temperature=0.2, max_tokens=2048)
-            
-            # Parse JSON response
-            result = self._parse_json_response(response)
-            
-            # Add calculated metrics
-            if result.get("success"):
-                result["match_percentage"] = result.get("score", 0)
-                result["agent"] = self.name
-            
-            return result
+            response = self.generate_response(**request["llm"])
+            return self._build_result(response)
             
         except Exception as e:
             logger.error(f"Resume screening error: {e}")
@@ -63,28 +77,131 @@ Evaluate the candidate and provide your assessment in the exact JSON format spec
                 "error": str(e)
             }
     
-    def _parse_json_response(self, response: str) -> Dict[str, Any]:
-        """Extract and parse JSON from LLM response"""
+    async def aprocess(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of process()"""
         try:
-            # Try to find JSON block
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                data = json.loads(json_str)
-                data["success"] = True
-                return data
-            else:
-                # Fallback parsing
-                return {
-                    "success": True,
-                    "score": 0,
-                    "reasoning": response,
-                    "recommendation": "Manual Review"
-                }
+            request = self._prepare_request(input_data)
+            if "llm" not in request:
+                return request
+            
+            response = await self.agenerate_response(**request["llm"])
+            return self._build_result(response)
+            
         except Exception as e:
-            logger.error(f"JSON parsing error: {e}")
+            logger.error(f"Resume screening error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _prepare_request(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate input and build the LLM request (or an error result)"""
+        resume_text = input_data.get("resume", "")
+        jd_text = input_data.get("job_description", "")
+        
+        if not resume_text or not jd_text:
             return {
                 "success": False,
-                "error": f"Failed to parse response: {str(e)}",
-                "raw_response": response
-            }
\ No newline at end of file
+                "error": "Missing resume or job description"
+            }
+        
+        analysis = self.jd_analyzer.analyze(jd_text)
+        fast = self.cascade.decide(resume_text, jd_text, analysis)
+        if fast is not None:
+            return self._with_metrics(fast)
+        
+        # The extracted requirements stand in for the full JD (company blurb,
+        # benefits and location add nothing to the assessment)
+        if analysis.structured:
+            jd_text = analysis.render()
+        resume_text = parse_resume(resume_text).render(self.RESUME_SECTIONS)
+        
+        # Fit both into the context window; the resume is trimmed first so
+        # the JD (and its reusable prefix) stays the same across resumes
+        max_tokens = 2048
+        fitted = self.fit_to_context(
+            [
+                Section("resume", resume_text, priority=1, min_tokens=256),
+                Section("job_description", jd_text, priority=2)
+            ],
+            max_tokens,
+            overhead=self.PROMPT_OVERHEAD
+        )
+        
+        # Build evaluation prompt; the JD part is shared by every resume
+        # screened against it, so its prefill can be reused
+        prefix = f"""
+Analyze this resume against the job description and provide a detailed scoring.
+
+JOB DESCRIPTION:
+{fitted["job_description"]}
+"""
+        prompt = f"""
+RESUME:
+{fitted["resume"]}
+
+Evaluate the candidate and provide your assessment in the exact JSON format specified in your instructions.
+"""
+        
+        return {
+            "llm": {
+                "prefix": prefix,
+                "prompt": prompt,
+                "temperature": 0.2,
+                "max_tokens": max_tokens,
+                "schema": self.OUTPUT_SCHEMA,
+                "stop_when": [JSONComplete()]
+            }
+        }
+    
+    def _build_result(self, response: str) -> Dict[str, Any]:
+        """Turn the LLM assessment into the screening result"""
+        # Parse JSON response
+        return self._with_metrics(self._parse_json_response(response))
+    
+    def _with_metrics(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Add calculated metrics to a successful screening result"""
+        if result.get("success"):
+            result["match_percentage"] = result.get("score", 0)
+            result["agent"] = self.name
+        return result
+    
+    def search_candidates(self, job_description: str, top_k: int = 20) -> Dict[str, Any]:
+        """Top-k pooled candidates for a JD from the ANN index, without LLM calls"""
+        if self.candidate_index is None:
+            return {"success": False, "error": "Candidate index not enabled"}
+        if not job_description:
+            return {"success": False, "error": "Missing job description"}
+        return {
+            "success": True,
+            "candidates": self.candidate_index.search(job_description, top_k),
+            "pool_size": len(self.candidate_index)
+        }
+    
+    def get_candidate_index_stats(self) -> Dict[str, Any]:
+        return self.candidate_index.get_stats() if self.candidate_index is not None else {}
+    
+    def get_jd_analysis_stats(self) -> Dict[str, Any]:
+        """Return JD analyses done vs. reused across candidates"""
+        return self.jd_analyzer.get_stats()
+    
+    def get_cascade_stats(self) -> Dict[str, Any]:
+        """Return deterministic pre-filter decisions and LLM calls saved"""
+        return self.cascade.get_stats()
+    
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """Parse the JSON assessment, repairing truncated output"""
+        data = self.parse_json_output(response)
+        if data is not None:
+            data["success"] = True
+            data["provenance"] = "llm"
+            return data
+        
+        # Fallback when no usable JSON came back; "Error:" reasoning means the LLM never answered
+        return {
+            "success": True,
+            "score": 0,
+            "reasoning": response,
+            "recommendation": "Manual Review",
+            "provenance": "fallback"
+        }
\ No newline at end of file
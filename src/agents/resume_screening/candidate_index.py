@@ -0,0 +1,84 @@
+import threading
+from typing import Dict, Any, List, Sequence
+from ...llm.ann_index import ANNIndex
+from ...utils.logger import logger
+
+
+class CandidateIndex:
+    """Resume embeddings in a persistent ANN index, queried by job description
+
+    Candidates are added as they enter the pipeline and removed as they
+    leave. The index is snapshotted to disk after every `snapshot_every`
+    adds (and on demand) and right after a removal, so a departed
+    candidate does not come back with the next restart.
+    """
+    
+    def __init__(self, embedder, index: ANNIndex, snapshot_every: int = 100, batch_size: int = 64):
+        self.embedder = embedder
+        self.index = index
+        self.snapshot_every = snapshot_every
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending = 0
+    
+    @classmethod
+    def from_config(cls, embedder, config: Dict[str, Any]) -> "CandidateIndex":
+        """Build from `agents.resume_screening.candidate_index` in settings.yaml"""
+        index = ANNIndex(
+            embedder.dim,
+            nlist=int(config.get("nlist", 64)),
+            nprobe=int(config.get("nprobe", 8)),
+            path=config.get("path")
+        )
+        return cls(embedder, index, snapshot_every=int(config.get("snapshot_every", 100)))
+    
+    def __len__(self) -> int:
+        return len(self.index)
+    
+    def add(self, candidates: Dict[str, str]) -> int:
+        """Embed and insert resumes by candidate id; a known id is replaced"""
+        ids = list(candidates)
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            self.index.add(batch, self.embedder.embed([candidates[doc_id] or "" for doc_id in batch]))
+        self._changed(len(ids))
+        return len(ids)
+    
+    def remove(self, candidate_ids: Sequence[str]) -> int:
+        """Drop candidates who left the pipeline"""
+        removed = self.index.remove(list(candidate_ids))
+        if removed:
+            with self._lock:
+                self._pending = 0
+            self.snapshot()
+        return removed
+    
+    def _changed(self, count: int):
+        with self._lock:
+            self._pending += count
+            due = self._pending >= self.snapshot_every
+            if due:
+                self._pending = 0
+        if due:
+            self.snapshot()
+    
+    def snapshot(self):
+        try:
+            self.index.snapshot()
+        except Exception as e:
+            logger.error(f"Candidate index snapshot failed: {e}")
+    
+    def search(self, job_description: str, top_k: int = 20) -> List[Dict[str, Any]]:
+        """Approximate top-k candidates for a JD by cosine similarity"""
+        query = self.embedder.embed([job_description])[0]
+        return [
+            {"rank": rank, "candidate_id": doc_id, "similarity": round(score, 4)}
+            for rank, (doc_id, score) in enumerate(self.index.search(query, top_k), start=1)
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.index.get_stats()
+        stats["embedder"] = self.embedder.name
+        with self._lock:
+            stats["unsaved_changes"] = self._pending
+        return stats
\ No newline at end of file
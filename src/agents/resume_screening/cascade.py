@@ -0,0 +1,191 @@
+import re
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from .scorer import ResumeScorer
+from ...utils.jd_analyzer import JDAnalyzer, JDAnalysis
+from ...utils.resume_parser import parse_resume, ExperienceEntry
+
+_YEAR = re.compile(r"(19|20)\d{2}")
+_YEAR_RANGE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to|until)\s*((?:19|20)\d{2}|present|current|now)\b", re.IGNORECASE
+)
+_EDUCATION = re.compile(r"universit|college|school|institute|academy|degree|bachelor|master|ph\.?d", re.IGNORECASE)
+
+
+class ScreeningCascade:
+    """Cheap deterministic pre-filter in front of LLM screening
+
+    Scores skill overlap with the JD's must-haves (via ResumeScorer) and
+    experience against the years asked for. Each group of alternatives
+    ("Python or Node.js") counts as one requirement, met by any of its
+    skills; soft skills ("communication") are left to the LLM, since
+    resumes rarely name them. Candidates clearly below `reject_below` or above
+    `accept_above` get a fast decision marked provenance="deterministic";
+    the ambiguous middle band goes to the LLM. JDs with fewer than
+    `min_required_skills` requirements, and resumes whose experience
+    could not be dated when the JD asks for years, are always left to the
+    LLM, since the keyword score means little there. The JD side comes
+    from the shared JDAnalyzer, so it is extracted once per requisition
+    rather than once per resume.
+    """
+    
+    def __init__(
+        self,
+        scorer: Optional[ResumeScorer] = None,
+        reject_below: float = 30,
+        accept_above: float = 80,
+        min_required_skills: int = 3,
+        skill_weight: float = 0.7,
+        enabled: bool = True,
+        analyzer: Optional[JDAnalyzer] = None
+    ):
+        self.scorer = scorer or ResumeScorer()
+        self.analyzer = analyzer or JDAnalyzer(self.scorer.taxonomy)
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.min_required_skills = min_required_skills
+        self.skill_weight = skill_weight
+        self.enabled = enabled
+        
+        self._lock = threading.Lock()
+        self._stats = {"rejected": 0, "accepted": 0, "escalated": 0}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], analyzer: Optional[JDAnalyzer] = None) -> "ScreeningCascade":
+        """Build cascade from `agents.resume_screening.cascade` in settings.yaml"""
+        return cls(
+            analyzer=analyzer,
+            reject_below=float(config.get("reject_below", 30)),
+            accept_above=float(config.get("accept_above", 80)),
+            min_required_skills=int(config.get("min_required_skills", 3)),
+            skill_weight=float(config.get("skill_weight", 0.7)),
+            enabled=bool(config.get("enabled", True))
+        )
+    
+    @classmethod
+    def _years_from_entries(cls, entries: List[ExperienceEntry]) -> int:
+        """Total years covered by dated roles, overlapping roles counted once"""
+        current_year = datetime.now().year
+        spans = []
+        for entry in entries:
+            start = _YEAR.search(entry.start or "")
+            if not start:
+                continue
+            end = _YEAR.search(entry.end or "")
+            spans.append((int(start.group()), int(end.group()) if end else current_year))
+        return cls._covered_years(spans)
+    
+    @classmethod
+    def _years_from_text(cls, text: str, education: str = "") -> int:
+        """Years covered by date ranges anywhere outside education, for resumes without an Experience heading"""
+        current_year = datetime.now().year
+        skip = {line.strip() for line in education.splitlines()}
+        spans = []
+        for line in text.splitlines():
+            if line.strip() in skip or _EDUCATION.search(line):
+                continue
+            for start, end in _YEAR_RANGE.findall(line):
+                spans.append((int(start), int(end) if end.isdigit() else current_year))
+        return cls._covered_years(spans)
+    
+    @staticmethod
+    def _covered_years(spans: List[Tuple[int, int]]) -> int:
+        years = 0
+        covered_until = None
+        for start, end in sorted(spans):
+            if covered_until is not None:
+                start = max(start, covered_until)
+            if end > start:
+                years += end - start
+                covered_until = end
+        return years
+    
+    def score(self, resume: str, job_description: str, analysis: Optional[JDAnalysis] = None) -> Dict[str, Any]:
+        """Deterministic 0-100 match score and the signals behind it"""
+        analysis = analysis or self.analyzer.analyze(job_description)
+        taxonomy = self.scorer.taxonomy
+        groups = [
+            group for group in analysis.required_groups
+            if any(taxonomy.category(skill) != "soft" for skill in group)
+        ]
+        found = self.scorer.extract_skills(resume)
+        missing = [group for group in groups if found.isdisjoint(group)]
+        skill_score = (len(groups) - len(missing)) / len(groups) * 100 if groups else 100.0
+        
+        required_years = analysis.required_years
+        years = self.scorer.extract_years_experience(resume)
+        if not years:
+            parsed = parse_resume(resume)
+            years = self._years_from_entries(parsed.experience) or self._years_from_text(
+                resume, parsed.sections.get("education", "")
+            )
+        years_score = min(years / required_years, 1.0) * 100 if required_years else 100.0
+        
+        return {
+            "score": round(self.skill_weight * skill_score + (1 - self.skill_weight) * years_score),
+            "skills_matched": sorted(skill for group in groups for skill in group if skill in found),
+            "skills_missing": [" or ".join(group) for group in missing],
+            "required_skills": len(groups),
+            "skills_met": len(groups) - len(missing),
+            "years_experience": years,
+            "required_years": required_years,
+            "years_known": bool(years) or not required_years
+        }
+    
+    def decide(
+        self,
+        resume: str,
+        job_description: str,
+        analysis: Optional[JDAnalysis] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fast screening result for a clear-cut candidate, or None to ask the LLM"""
+        if not self.enabled:
+            return None
+        
+        signals = self.score(resume, job_description, analysis)
+        score = signals["score"]
+        if signals["required_skills"] < self.min_required_skills or not signals["years_known"]:
+            outcome = None
+        elif score < self.reject_below:
+            outcome = "rejected"
+        elif score >= self.accept_above:
+            outcome = "accepted"
+        else:
+            outcome = None
+        
+        with self._lock:
+            self._stats[outcome or "escalated"] += 1
+        if outcome is None:
+            return None
+        
+        return {
+            "success": True,
+            "score": score,
+            "skills_matched": signals["skills_matched"],
+            "skills_missing": signals["skills_missing"],
+            "seniority_fit": self._seniority_fit(signals),
+            "years_experience": signals["years_experience"],
+            "reasoning": (
+                f"Deterministic pre-filter: {signals['skills_met']}/{signals['required_skills']} "
+                f"required skills, {signals['years_experience']} years experience"
+                + (f" ({signals['required_years']} required)" if signals["required_years"] else "")
+            ),
+            "recommendation": "Interview" if outcome == "accepted" else "Reject",
+            "provenance": "deterministic"
+        }
+    
+    def _seniority_fit(self, signals: Dict[str, Any]) -> str:
+        if not signals["required_years"]:
+            return "medium"
+        ratio = signals["years_experience"] / signals["required_years"]
+        return "high" if ratio >= 1 else "medium" if ratio >= 0.5 else "low"
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        decided = stats["rejected"] + stats["accepted"]
+        total = decided + stats["escalated"]
+        stats["llm_calls_saved"] = decided
+        stats["savings_rate"] = round(decided / total, 3) if total else 0.0
+        return stats
\ No newline at end of file
@@ -1,29 +1,16 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Optional
 import re
+from ...utils.skill_taxonomy import SkillTaxonomy
 
 class ResumeScorer:
     """Deterministic scoring utilities for resume screening"""
     
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None):
+        self.taxonomy = taxonomy or SkillTaxonomy.default()
+    
     def extract_skills(self, text: str) -> Set[str]:
-        """Extract technical skills from text"""
-        # Common tech skills patterns
-        skill_keywords = [
-            'python', 'java', 'javascript', 'typescript', 'c\\+\\+', 'c#',
-            'react', 'angular', 'vue', 'node.js', 'django', 'flask',
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes',
-            'sql', 'postgresql', 'mongodb', 'redis',
-            'machine learning', 'deep learning', 'nlp', 'computer vision',
-            'git', 'ci/cd', 'agile', 'scrum'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = set()
-        
-        for skill in skill_keywords:
-            if re.search(r'\b' + skill + r'\b', text_lower):
-                found_skills.add(skill.replace('\\', ''))
-        
-        return found_skills
+        """Extract technical skills from text as canonical taxonomy ids"""
+        return self.taxonomy.extract(text or "")
     
     def extract_years_experience(self, text: str) -> int:
         """Extract years of experience"""
@@ -0,0 +1,305 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import numpy as np
+from ..utils.logger import logger
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+
+def _kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids (unit rows) for inner-product search"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = ~np.bincount(assignment, minlength=k).astype(bool)
+        # Reseed empty clusters from random points
+        sums[empty] = vectors[rng.choice(len(vectors), size=int(empty.sum()))]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = sums / norms
+    return centroids.astype(np.float32)
+
+
+class ANNIndex:
+    """Approximate nearest-neighbour index of unit vectors, keyed by string id
+
+    Inverted-file (IVF) layout: once `train_min` vectors are in, k-means
+    partitions them into `nlist` lists and a query scans only the
+    `nprobe` lists closest to it. Before that, search is exact. Uses a
+    faiss IndexIVFFlat when faiss is installed and the same scheme in
+    NumPy otherwise. add()/remove() are incremental; snapshot() writes
+    the index to `path` and a new instance reopens it.
+    """
+    
+    def __init__(
+        self,
+        dim: int,
+        nlist: int = 64,
+        nprobe: int = 8,
+        path: Optional[str] = None,
+        train_min: Optional[int] = None,
+        use_faiss: bool = True
+    ):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.path = Path(path) if path else None
+        # faiss warns below ~39 training points per list
+        self.train_min = train_min if train_min is not None else 39 * nlist
+        self.backend = "faiss" if faiss is not None and use_faiss else "numpy"
+        
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((1024, dim), dtype=np.float16)
+        self._live = np.zeros(1024, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._list_of = np.full(1024, -1, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self._faiss_index = None
+        self._quantizer = None
+        self._stats = {"adds": 0, "removes": 0, "searches": 0, "search_seconds": 0.0, "trainings": 0, "snapshots": 0}
+        
+        if self.path and (self.path / "meta.json").exists():
+            self._load()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        with self._lock:
+            return doc_id in self._rows
+    
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+    
+    def _reserve(self, rows: int):
+        if rows <= len(self._vectors):
+            return
+        capacity = max(rows, 2 * len(self._vectors))
+        for name, fill in (("_vectors", 0), ("_live", False), ("_list_of", -1)):
+            old = getattr(self, name)
+            grown = np.full((capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, name, grown)
+    
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert (or replace) vectors; trains the coarse quantizer once enough are in"""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            replaced = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+            if replaced:
+                self._drop(replaced)
+            
+            start = len(self._ids)
+            rows = np.arange(start, start + len(ids))
+            self._reserve(start + len(ids))
+            self._vectors[rows] = vectors
+            self._live[rows] = True
+            for row, doc_id in zip(rows, ids):
+                self._rows[doc_id] = int(row)
+            self._ids.extend(ids)
+            self._stats["adds"] += len(ids)
+            
+            if self.trained:
+                self._assign(rows)
+            elif len(self._rows) >= self.train_min:
+                self._train()
+    
+    def remove(self, ids: Sequence[str]) -> int:
+        """Delete vectors by id; returns how many were present"""
+        with self._lock:
+            rows = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+            self._drop(rows)
+            for row in rows:
+                del self._rows[self._ids[row]]
+                self._ids[row] = None
+            self._stats["removes"] += len(rows)
+            return len(rows)
+    
+    def _drop(self, rows: List[int]):
+        """Tombstone rows; list members are filtered by liveness at query time"""
+        if not rows:
+            return
+        rows = np.asarray(rows, dtype=np.int64)
+        self._live[rows] = False
+        if self._faiss_index is not None:
+            self._faiss_index.remove_ids(rows)
+    
+    def _assign(self, rows: np.ndarray):
+        """Put new rows into their nearest inverted lists"""
+        vectors = self._vectors[rows].astype(np.float32)
+        # List numbers are kept for snapshots even when faiss does the searching
+        assignment = np.argmax(vectors @ self._centroids.T, axis=1)
+        self._list_of[rows] = assignment
+        if self._faiss_index is not None:
+            self._faiss_index.add_with_ids(vectors, rows.astype(np.int64))
+            return
+        for row, list_no in zip(rows, assignment):
+            self._lists[list_no].append(int(row))
+            self._list_arrays.pop(int(list_no), None)
+    
+    def _train(self):
+        """Cluster the live vectors into nlist lists and (re)build the inverted file"""
+        live_rows = np.flatnonzero(self._live[:len(self._ids)])
+        sample = live_rows
+        if len(sample) > 256 * self.nlist:
+            sample = np.random.default_rng(0).choice(live_rows, size=256 * self.nlist, replace=False)
+        started = time.perf_counter()
+        self._centroids = _kmeans(self._vectors[sample].astype(np.float32), min(self.nlist, len(sample)))
+        self._lists = [[] for _ in range(len(self._centroids))]
+        self._list_arrays = {}
+        self._list_of[:] = -1
+        if self.backend == "faiss":
+            self._faiss_index = self._new_faiss_index()
+        self._assign(live_rows)
+        self._stats["trainings"] += 1
+        logger.info(
+            f"ANN index trained: {len(live_rows)} vectors in {len(self._centroids)} lists "
+            f"({(time.perf_counter() - started) * 1000:.0f} ms, {self.backend})"
+        )
+    
+    def _new_faiss_index(self):
+        """Empty faiss IVF index over the trained centroids"""
+        self._quantizer = faiss.IndexFlatIP(self.dim)
+        self._quantizer.add(self._centroids)
+        index = faiss.IndexIVFFlat(self._quantizer, self.dim, len(self._centroids), faiss.METRIC_INNER_PRODUCT)
+        index.is_trained = True
+        return index
+    
+    def _candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        count = len(self._ids)
+        if not self.trained:
+            return np.flatnonzero(self._live[:count])
+        nprobe = min(nprobe, len(self._centroids))
+        probes = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        members = []
+        for list_no in probes:
+            array = self._list_arrays.get(int(list_no))
+            if array is None:
+                array = np.asarray(self._lists[list_no], dtype=np.int64)
+                self._list_arrays[int(list_no)] = array
+            members.append(array)
+        rows = np.concatenate(members) if members else np.array([], dtype=np.int64)
+        return rows[self._live[rows]]
+    
+    def search(self, query: np.ndarray, top_k: int = 10, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(id, inner product) of the approximate top-k, best first"""
+        started = time.perf_counter()
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        nprobe = nprobe or self.nprobe
+        with self._lock:
+            if self._faiss_index is not None and self.trained:
+                self._faiss_index.nprobe = nprobe
+                scores, rows = self._faiss_index.search(query.reshape(1, -1), top_k)
+                hits = [(self._ids[row], float(score)) for score, row in zip(scores[0], rows[0]) if row >= 0]
+            else:
+                rows = self._candidate_rows(query, nprobe)
+                scores = self._vectors[rows].astype(np.float32) @ query
+                k = min(top_k, len(rows))
+                best = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=np.int64)
+                best = best[np.argsort(-scores[best], kind="stable")]
+                hits = [(self._ids[rows[i]], float(scores[i])) for i in best]
+            self._stats["searches"] += 1
+            self._stats["search_seconds"] += time.perf_counter() - started
+        return hits
+    
+    def snapshot(self):
+        """Write the index to `path`; files are replaced atomically, metadata last"""
+        if self.path is None:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            live_rows = np.flatnonzero(self._live[:len(self._ids)])
+            if len(live_rows) < len(self._ids):
+                self._compact(live_rows)
+            count = len(self._ids)
+            arrays = {"vectors": self._vectors[:count]}
+            if self.trained:
+                arrays["centroids"] = self._centroids
+                arrays["list_of"] = self._list_of[:count]
+            for name, array in arrays.items():
+                tmp_path = self.path / f"{name}.tmp.npy"
+                np.save(tmp_path, array)
+                os.replace(tmp_path, self.path / f"{name}.npy")
+            meta = {"dim": self.dim, "nlist": self.nlist, "ids": self._ids, "trained": self.trained}
+            tmp_path = self.path / "meta.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self.path / "meta.json")
+            self._stats["snapshots"] += 1
+    
+    def _compact(self, live_rows: np.ndarray):
+        """Drop tombstoned rows before a snapshot, renumbering the rest"""
+        ids = [self._ids[row] for row in live_rows]
+        vectors = self._vectors[live_rows]
+        list_of = self._list_of[live_rows]
+        self._vectors[:len(ids)] = vectors
+        self._live[:] = False
+        self._live[:len(ids)] = True
+        self._ids = ids
+        self._rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        if self.trained:
+            self._list_of[:len(ids)] = list_of
+            self._list_of[len(ids):] = -1
+            self._rebuild_lists()
+    
+    def _rebuild_lists(self):
+        count = len(self._ids)
+        list_of = self._list_of[:count]
+        order = np.argsort(list_of, kind="stable")
+        bounds = np.searchsorted(list_of[order], np.arange(len(self._centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]].tolist() for i in range(len(self._centroids))]
+        self._list_arrays = {}
+        if self.backend == "faiss":
+            self._faiss_index = self._new_faiss_index()
+            live_rows = np.flatnonzero(self._live[:count])
+            self._faiss_index.add_with_ids(self._vectors[live_rows].astype(np.float32), live_rows.astype(np.int64))
+    
+    def _load(self):
+        try:
+            with open(self.path / "meta.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta["dim"] != self.dim:
+                logger.warning(f"ANN snapshot at {self.path} has dim {meta['dim']}, expected {self.dim}; ignoring it")
+                return
+            vectors = np.load(self.path / "vectors.npy")
+            count = len(meta["ids"])
+            self._reserve(count)
+            self._vectors[:count] = vectors[:count]
+            self._live[:count] = True
+            self._ids = list(meta["ids"])
+            self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+            if meta.get("trained"):
+                self._centroids = np.load(self.path / "centroids.npy")
+                self._list_of[:count] = np.load(self.path / "list_of.npy")[:count]
+                self._rebuild_lists()
+            logger.info(f"ANN index reopened from {self.path}: {count} vectors")
+        except Exception as e:
+            logger.warning(f"Could not reopen ANN index at {self.path}: {e}")
+            self._ids, self._rows, self._centroids = [], {}, None
+            self._live[:] = False
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["vectors"] = len(self._rows)
+            stats["lists"] = len(self._centroids) if self.trained else 0
+        stats["backend"] = self.backend
+        stats["nprobe"] = self.nprobe
+        seconds = stats.pop("search_seconds")
+        stats["search_ms_avg"] = round(seconds / stats["searches"] * 1000, 2) if stats["searches"] else 0.0
+        return stats
\ No newline at end of file
@@ -0,0 +1,112 @@
+import asyncio
+import os
+import weakref
+from typing import Optional, Dict, Any
+from ..utils.logger import logger
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncTransport:
+    """Shared aiohttp connection pool with per-provider concurrency limits"""
+    
+    DEFAULT_PROVIDER_LIMITS = {
+        "ollama": 4,
+        "google": 16,
+        "openai": 16
+    }
+    
+    def __init__(
+        self,
+        pool_size: int = 100,
+        provider_limits: Optional[Dict[str, int]] = None
+    ):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async LLM calls: pip install aiohttp")
+        
+        self.pool_size = pool_size
+        self.provider_limits = dict(self.DEFAULT_PROVIDER_LIMITS)
+        self.provider_limits.update(provider_limits or {})
+        
+        # aiohttp sessions and asyncio semaphores are bound to one event loop
+        self._sessions = weakref.WeakKeyDictionary()
+        self._semaphores = weakref.WeakKeyDictionary()
+        
+        self._in_flight: Dict[str, int] = {}
+        self._peak_in_flight: Dict[str, int] = {}
+        self._waiting: Dict[str, int] = {}
+    
+    @classmethod
+    def from_env(cls) -> "AsyncTransport":
+        """Build transport from LLM_ASYNC_POOL_SIZE"""
+        return cls(pool_size=int(os.getenv("LLM_ASYNC_POOL_SIZE", "100")))
+    
+    async def session(self) -> "aiohttp.ClientSession":
+        """Get the pooled session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+    
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        """Get the concurrency limiter for a provider"""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if provider not in semaphores:
+            semaphores[provider] = asyncio.Semaphore(self.provider_limits.get(provider, 8))
+        return semaphores[provider]
+    
+    def slot(self, provider: str) -> "_ProviderSlot":
+        """Context manager holding one of the provider's concurrency slots"""
+        return _ProviderSlot(self, provider)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return in-flight and queued request counts per provider"""
+        return {
+            "pool_size": self.pool_size,
+            "provider_limits": dict(self.provider_limits),
+            "in_flight": dict(self._in_flight),
+            "peak_in_flight": dict(self._peak_in_flight),
+            "waiting": dict(self._waiting)
+        }
+    
+    async def close(self):
+        """Close the session of the running event loop"""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+class _ProviderSlot:
+    """Async context manager around a provider semaphore that tracks load"""
+    
+    def __init__(self, transport: AsyncTransport, provider: str):
+        self.transport = transport
+        self.provider = provider
+    
+    async def __aenter__(self):
+        transport = self.transport
+        provider = self.provider
+        transport._waiting[provider] = transport._waiting.get(provider, 0) + 1
+        try:
+            await transport.semaphore(provider).acquire()
+        finally:
+            transport._waiting[provider] -= 1
+        
+        in_flight = transport._in_flight.get(provider, 0) + 1
+        transport._in_flight[provider] = in_flight
+        if in_flight > transport._peak_in_flight.get(provider, 0):
+            transport._peak_in_flight[provider] = in_flight
+            logger.debug(f"{provider} async in-flight peak: {in_flight}")
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.transport._in_flight[self.provider] -= 1
+        self.transport.semaphore(self.provider).release()
+        return False
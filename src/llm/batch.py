@@ -0,0 +1,53 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Awaitable, List, Union, Dict, Any, Optional
+
+BatchItem = Union[str, Dict[str, Any]]
+
+
+def _as_kwargs(item: BatchItem) -> Dict[str, Any]:
+    """A batch item is a bare prompt or a dict of generate() kwargs"""
+    return {"prompt": item} if isinstance(item, str) else dict(item)
+
+
+def run_batch(
+    fn: Callable[..., str],
+    items: List[BatchItem],
+    max_workers: int = 4,
+    **defaults
+) -> List[str]:
+    """Run fn over items on a thread pool, returning results in input order
+
+    Keeps several requests in flight so a batching server (vLLM, llama.cpp
+    with --parallel) can schedule them together.
+    """
+    if not items:
+        return []
+    
+    calls = [{**defaults, **_as_kwargs(item)} for item in items]
+    if max_workers <= 1 or len(calls) == 1:
+        return [fn(**kwargs) for kwargs in calls]
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(calls)), thread_name_prefix="llm-batch") as pool:
+        return list(pool.map(lambda kwargs: fn(**kwargs), calls))
+
+
+async def arun_batch(
+    fn: Callable[..., Awaitable[str]],
+    items: List[BatchItem],
+    max_concurrency: Optional[int] = None,
+    **defaults
+) -> List[str]:
+    """Async counterpart of run_batch(); concurrency is also capped by the transport pool"""
+    if not items:
+        return []
+    
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    
+    async def run(kwargs: Dict[str, Any]) -> str:
+        if semaphore is None:
+            return await fn(**kwargs)
+        async with semaphore:
+            return await fn(**kwargs)
+    
+    return list(await asyncio.gather(*(run({**defaults, **_as_kwargs(item)}) for item in items)))
\ No newline at end of file
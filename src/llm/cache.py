@@ -0,0 +1,246 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+from ..utils.logger import logger
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_cache_key(
+    provider: str,
+    model: str,
+    prompt: str,
+    system: Optional[str],
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """Build a cache key from everything that changes the response"""
+    parts = [
+        provider,
+        model,
+        _sha256(system or ""),
+        _sha256(prompt),
+        f"{float(temperature):.3f}",
+        str(int(max_tokens))
+    ]
+    return _sha256("|".join(parts))
+
+
+class LRUCache:
+    """Bounded in-memory LRU with per-entry TTL"""
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, stored_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, stored_at or time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """Persistent response store with TTL and size-based eviction"""
+    
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_size_mb: float = 100):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)")
+        self._conn.commit()
+        self._total_bytes = self._size_on_disk()
+    
+    def _size_on_disk(self) -> int:
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return int(row[0])
+    
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (value, created) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            value, created, size = row
+            now = time.time()
+            if self.ttl and now - created > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                return None
+            
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value, created
+    
+    def set(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, accessed, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, now, now, size)
+            )
+            self._total_bytes += size - (row[0] if row else 0)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+    
+    def _evict(self):
+        """Drop expired entries, then least recently used until under 90% of the limit"""
+        if self.ttl:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        
+        target = int(self.max_bytes * 0.9)
+        total = self._size_on_disk()
+        if total > target:
+            evicted = 0
+            rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+            for key, size in rows:
+                if total <= target:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+            logger.info(f"LLM disk cache evicted {evicted} entries")
+        self._total_bytes = total
+    
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total_bytes = 0
+    
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    """Two-tier LLM response cache: in-memory LRU in front of SQLite"""
+    
+    def __init__(
+        self,
+        memory_entries: int = 256,
+        memory_ttl: float = 3600,
+        disk_path: Optional[str] = None,
+        disk_ttl: float = 7 * 24 * 3600,
+        disk_max_size_mb: float = 100
+    ):
+        self.memory = LRUCache(memory_entries, memory_ttl)
+        self.disk = SQLiteCache(disk_path, disk_ttl, disk_max_size_mb) if disk_path else None
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResponseCache":
+        """Build cache from the `cache:` section of model_config.yaml"""
+        memory = config.get("memory", {})
+        disk = config.get("disk", {})
+        return cls(
+            memory_entries=int(memory.get("max_entries", 256)),
+            memory_ttl=float(memory.get("ttl", 3600)),
+            disk_path=disk.get("path") if disk.get("enabled", True) else None,
+            disk_ttl=float(disk.get("ttl", 7 * 24 * 3600)),
+            disk_max_size_mb=float(disk.get("max_size_mb", 100))
+        )
+    
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look up a response, promoting disk hits into memory"""
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+        
+        if self.disk is not None:
+            try:
+                entry = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM disk cache read failed: {e}")
+                entry = None
+            if entry is not None:
+                value, created = entry
+                self.memory.set(key, value, stored_at=created)
+                self._count("disk_hits")
+                return value
+        
+        self._count("misses")
+        return None
+    
+    def set(self, key: str, value: str):
+        """Store a response in both tiers"""
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                logger.warning(f"LLM disk cache write failed: {e}")
+        self._count("writes")
+    
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        stats["disk_entries"] = self.disk.count() if self.disk is not None else 0
+        return stats
@@ -0,0 +1,110 @@
+import threading
+import time
+from typing import Optional, Dict, Any
+from ..utils.logger import logger
+
+
+class CircuitBreaker:
+    """Stop calling a provider after repeated failures or slow responses
+
+    closed     -> calls flow; consecutive failures / latency-SLO breaches are counted
+    open       -> calls are rejected immediately until recovery_timeout elapses
+    half_open  -> a single probe call is let through; success closes, failure re-opens
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        latency_slo: Optional[float] = None,
+        slo_breach_threshold: int = 3
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.latency_slo = latency_slo
+        self.slo_breach_threshold = slo_breach_threshold
+        
+        self.state = self.CLOSED
+        self._failures = 0
+        self._slow_calls = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._stats = {"rejected": 0, "opened": 0}
+    
+    @classmethod
+    def from_config(cls, name: str, config: Dict[str, Any]) -> "CircuitBreaker":
+        """Build breaker from the `circuit_breaker:` section of model_config.yaml"""
+        latency_slo = config.get("latency_slo")
+        return cls(
+            name,
+            failure_threshold=int(config.get("failure_threshold", 3)),
+            recovery_timeout=float(config.get("recovery_timeout", 30.0)),
+            latency_slo=float(latency_slo) if latency_slo else None,
+            slo_breach_threshold=int(config.get("slo_breach_threshold", 3))
+        )
+    
+    def allow_request(self) -> bool:
+        """True if a call may be attempted now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"Circuit {self.name} half-open, probing recovery")
+            
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            
+            self._stats["rejected"] += 1
+            return False
+    
+    def record_success(self, latency: Optional[float] = None):
+        """Record a successful call; slow successes count against the latency SLO"""
+        with self._lock:
+            if self.latency_slo and latency is not None and latency > self.latency_slo:
+                self._slow_calls += 1
+                if self.state == self.HALF_OPEN or self._slow_calls >= self.slo_breach_threshold:
+                    self._open(f"{self._slow_calls} call(s) slower than {self.latency_slo}s")
+                return
+            
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit {self.name} closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._slow_calls = 0
+            self._probe_in_flight = False
+    
+    def record_failure(self):
+        """Record a failed call"""
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._open(f"{self._failures} consecutive failure(s)")
+    
+    def _open(self, reason: str):
+        if self.state != self.OPEN:
+            logger.warning(f"Circuit {self.name} opened: {reason}")
+            self._stats["opened"] += 1
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Return state and counters"""
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "slow_calls": self._slow_calls,
+                **self._stats
+            }
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+from ..utils.logger import logger
+
+
+class _Call:
+    """One in-flight execution shared by every caller with the same key"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into one execution
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight wait and receive the same result (or exception).
+    Works for threads (do) and asyncio tasks (ado).
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        # asyncio tasks are bound to one event loop
+        self._tasks = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn once for all concurrent callers with the same key"""
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executions"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.info(f"Coalesced {call.waiters} duplicate LLM request(s)")
+            call.done.set()
+    
+    async def ado(self, key: str, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of do()"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._stats["calls"] += 1
+            tasks = self._tasks.setdefault(loop, {})
+            task = tasks.get(key)
+            if task is None:
+                # Run as a task so a cancelled leader does not cancel the followers
+                task = loop.create_task(coro_fn())
+                tasks[key] = task
+                task.add_done_callback(lambda _: self._finish_task(tasks, key))
+                self._stats["executions"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        
+        return await asyncio.shield(task)
+    
+    def _finish_task(self, tasks: Dict[str, asyncio.Task], key: str):
+        with self._lock:
+            tasks.pop(key, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return coalescing counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls) + sum(len(t) for t in self._tasks.values())
+        stats["coalesce_rate"] = round(stats["coalesced"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
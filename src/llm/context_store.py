@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
+from .cache import make_cache_key
+
+
+class ChatTemplate(NamedTuple):
+    """A model's chat template split around the user turn, for raw-mode prompts
+
+    head() is the system turn and the opening of the user turn up to the
+    shared prefix; tail() closes the user turn and opens the assistant's.
+    head(system, prefix) + tail(prompt) is exactly what Ollama's own
+    template renders for system + prefix + prompt.
+    """
+    system: str
+    user: str
+    assistant: str
+    
+    def head(self, system: Optional[str], prefix: str) -> str:
+        return (self.system.replace("{system}", system) if system else "") + self.user + prefix
+    
+    def tail(self, prompt: str) -> str:
+        return prompt + self.assistant
+
+
+# Ollama chat templates by model family (name before the tag), longest match wins
+CHAT_TEMPLATES = {
+    "phi3": ChatTemplate("<|system|>\n{system}<|end|>\n", "<|user|>\n", "<|end|>\n<|assistant|>\n"),
+    "deepseek-r1": ChatTemplate("{system}", "<｜User｜>", "<｜Assistant｜>"),
+    "llama3": ChatTemplate(
+        "<|start_header_id|>system<|end_header_id|>\n\n{system}<|eot_id|>",
+        "<|start_header_id|>user<|end_header_id|>\n\n",
+        "<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+    ),
+    "qwen": ChatTemplate(
+        "<|im_start|>system\n{system}<|im_end|>\n", "<|im_start|>user\n", "<|im_end|>\n<|im_start|>assistant\n"
+    ),
+}
+
+
+class ContextStore:
+    """LRU of Ollama `context` token arrays keyed by model, system prompt and prefix
+
+    Passing a stored context back to /api/generate lets Ollama skip
+    re-tokenising the shared prefix and reuse its KV cache, so only the
+    new part of the prompt is prefilled.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 32,
+        ttl: float = 1800,
+        templates: Optional[Dict[str, ChatTemplate]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.templates = {**CHAT_TEMPLATES, **(templates or {})}
+        self._entries: "OrderedDict[str, Tuple[List[int], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ContextStore":
+        """Build store from the `context_reuse:` section of model_config.yaml"""
+        return cls(
+            max_entries=int(config.get("max_entries", 32)),
+            ttl=float(config.get("ttl", 1800)),
+            templates={
+                family: ChatTemplate(parts.get("system", "{system}"), parts.get("user", ""), parts.get("assistant", ""))
+                for family, parts in (config.get("templates") or {}).items()
+            }
+        )
+    
+    def template(self, model: str) -> Optional[ChatTemplate]:
+        """Chat template for a model, or None if unknown (its prefixes are then not primed)"""
+        family = model.split(":", 1)[0].lower()
+        matches = [name for name in self.templates if family.startswith(name)]
+        return self.templates[max(matches, key=len)] if matches else None
+    
+    @staticmethod
+    def key(model: str, system: Optional[str], prefix: str) -> str:
+        return make_cache_key("ollama-context", model, prefix, system, 0.0, 0)
+    
+    def get(self, key: str) -> Optional[List[int]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+    
+    def set(self, key: str, context: List[int]):
+        with self._lock:
+            self._entries[key] = (list(context), time.time())
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
\ No newline at end of file
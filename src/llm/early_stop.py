@@ -0,0 +1,140 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Sequence
+from .json_repair import json_end
+from ..utils.logger import logger
+
+
+class StopCondition(ABC):
+    """Completion predicate over the text generated so far
+
+    __call__ returns the index where the answer ends (text beyond it is
+    discarded) or None while it is still incomplete. `triggers` are the
+    characters that can complete it; the check only runs on chunks
+    containing one, so long generations aren't rescanned per token.
+    """
+    
+    triggers: str = ""
+    key: str = ""
+    
+    @abstractmethod
+    def __call__(self, text: str) -> Optional[int]:
+        pass
+
+
+class JSONComplete(StopCondition):
+    """Complete once the first top-level JSON object (or array) closes"""
+    
+    triggers = "}]"
+    key = "json"
+    
+    def __call__(self, text: str) -> Optional[int]:
+        return json_end(text)
+
+
+class ItemsComplete(StopCondition):
+    """Complete once `count(text)` reaches n on whole lines, e.g. N questions parsed
+
+    The cut falls at the end of the line holding the Nth item.
+    """
+    
+    triggers = "\n"
+    
+    def __init__(self, count: Callable[[str], int], n: int, name: str = "items"):
+        self.count = count
+        self.n = n
+        self.key = f"{name}:{n}"
+    
+    def __call__(self, text: str) -> Optional[int]:
+        if "\n" not in text:
+            return None
+        complete = text[:text.rfind("\n")]
+        if self.count(complete) < self.n:
+            return None
+        
+        # Find the line on which the Nth item became complete
+        end = 0
+        while True:
+            end = complete.find("\n", end + 1)
+            if end == -1:
+                return len(complete)
+            if self.count(complete[:end]) >= self.n:
+                return end
+
+
+class EarlyStopper:
+    """Consume a chunk stream until a stop sequence or completion predicate fires
+
+    Closing the stream drops the HTTP connection, which makes Ollama and
+    the cloud APIs stop generating; the text after the cut is discarded.
+    """
+    
+    def __init__(
+        self,
+        stop: Optional[Sequence[str]] = None,
+        stop_when: Optional[List[StopCondition]] = None
+    ):
+        self.stop = [s for s in (stop or []) if s]
+        self.stop_when = list(stop_when or [])
+        self.stopped_early = False
+    
+    @staticmethod
+    def describe(stop: Optional[Sequence[str]], stop_when: Optional[List[StopCondition]]) -> str:
+        """Stable description of the stop rules, for cache keys"""
+        return f"\n#stop:{list(stop or [])}|{[c.key for c in stop_when or []]}"
+    
+    def _cut(self, text: str, chunk: str) -> Optional[int]:
+        cuts = []
+        # Stop sequences may straddle chunk boundaries; search the overlap too
+        window = len(chunk) + max((len(s) for s in self.stop), default=0)
+        for sequence in self.stop:
+            index = text.find(sequence, max(len(text) - window, 0))
+            if index != -1:
+                cuts.append(index)
+        for condition in self.stop_when:
+            if any(ch in chunk for ch in condition.triggers):
+                end = condition(text)
+                if end is not None:
+                    cuts.append(end)
+        return min(cuts) if cuts else None
+    
+    def _feed(self, text: str, chunk: str) -> Optional[int]:
+        """Cut index once the answer is complete, else None"""
+        cut = self._cut(text, chunk)
+        if cut is not None:
+            self.stopped_early = True
+            logger.info(f"Answer complete after {cut} chars, stopping generation")
+        return cut
+    
+    def run(self, stream: Iterator[str]) -> str:
+        """Return the generated text, cut where the answer is complete"""
+        text = ""
+        try:
+            for chunk in stream:
+                if chunk.startswith("Error:") and not text:
+                    return chunk
+                text += chunk
+                cut = self._feed(text, chunk)
+                if cut is not None:
+                    return text[:cut]
+            return text
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+    
+    async def arun(self, stream: AsyncIterator[str]) -> str:
+        """Async counterpart of run()"""
+        text = ""
+        try:
+            async for chunk in stream:
+                if chunk.startswith("Error:") and not text:
+                    return chunk
+                text += chunk
+                cut = self._feed(text, chunk)
+                if cut is not None:
+                    return text[:cut]
+            return text
+        finally:
+            close = getattr(stream, "aclose", None)
+            if close is not None:
+                await close()
\ No newline at end of file
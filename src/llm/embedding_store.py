@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+import numpy as np
+from ..utils.logger import logger
+
+
+class EmbeddingStore:
+    """Float16 vectors in a memory-mapped file, keyed by id
+
+    Texts are embedded once: re-adding an id with unchanged text (same
+    sha256) is a no-op, changed text overwrites its row in place, and a
+    removed id's row is filled with the last row so the file stays dense. The
+    rows live in `<name>.f16` and the ids/hashes in `<name>.json`, so a
+    restart reopens the pool without re-encoding. A store written by a
+    different embedder or dimension is discarded.
+    """
+    
+    def __init__(self, embedder, path: Optional[str] = None, name: str = "vectors", batch_size: int = 64):
+        self.embedder = embedder
+        self.dim = embedder.dim
+        self.batch_size = batch_size
+        self._dir = Path(path) if path else None
+        self._name = name
+        
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._hashes: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._vectors = np.zeros((0, self.dim), dtype=np.float16)
+        self._stats = {"encoded": 0, "reused": 0, "removed": 0}
+        self._open()
+    
+    @property
+    def _data_path(self) -> Optional[Path]:
+        return self._dir / f"{self._name}.f16" if self._dir else None
+    
+    @property
+    def _meta_path(self) -> Optional[Path]:
+        return self._dir / f"{self._name}.json" if self._dir else None
+    
+    def _open(self):
+        """Reopen an existing store from disk, if it matches the embedder"""
+        if not self._dir or not self._meta_path.exists() or not self._data_path.exists():
+            return
+        try:
+            with open(self._meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get("embedder") != self.embedder.name or meta.get("dim") != self.dim:
+                logger.info(f"Embedding store {self._name} was built with another embedder, re-encoding")
+                return
+            count = len(meta["ids"])
+            if not count:
+                return
+            capacity = os.path.getsize(self._data_path) // (self.dim * 2)
+            if capacity < count:
+                raise ValueError(f"{self._data_path} holds {capacity} rows, metadata lists {count}")
+            self._vectors = np.memmap(self._data_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+            self._ids = list(meta["ids"])
+            self._hashes = list(meta["hashes"])
+            self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+            logger.info(f"Embedding store {self._name}: reopened {count} vectors")
+        except Exception as e:
+            logger.warning(f"Could not reopen embedding store {self._name}: {e}")
+            self._ids, self._hashes, self._rows = [], [], {}
+    
+    def _reserve(self, rows: int):
+        """Make room for `rows` vectors, doubling the backing file when full"""
+        if rows <= len(self._vectors):
+            return
+        capacity = max(rows, 2 * len(self._vectors), 64)
+        count = len(self._ids)
+        if self._dir is None:
+            grown = np.zeros((capacity, self.dim), dtype=np.float16)
+            grown[:count] = self._vectors[:count]
+            self._vectors = grown
+            return
+        
+        self._dir.mkdir(parents=True, exist_ok=True)
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        del self._vectors
+        # Growing the file keeps existing rows where they are
+        with open(self._data_path, "ab") as f:
+            f.truncate(capacity * self.dim * 2)
+        self._vectors = np.memmap(self._data_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+    
+    def _save_meta(self):
+        if self._dir is None:
+            return
+        self._vectors.flush()
+        tmp_path = self._meta_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"embedder": self.embedder.name, "dim": self.dim, "ids": self._ids, "hashes": self._hashes}, f)
+        os.replace(tmp_path, self._meta_path)
+    
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> int:
+        """Embed and store texts not stored yet (or changed); returns how many were encoded"""
+        with self._lock:
+            pending = {}
+            for doc_id, text in zip(ids, texts):
+                digest = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+                row = self._rows.get(doc_id)
+                if row is not None and self._hashes[row] == digest:
+                    self._stats["reused"] += 1
+                    continue
+                pending[doc_id] = (text or "", digest)
+            if not pending:
+                return 0
+            
+            pending_ids = list(pending)
+            new_rows = sum(1 for doc_id in pending_ids if doc_id not in self._rows)
+            self._reserve(len(self._ids) + new_rows)
+            
+            for start in range(0, len(pending_ids), self.batch_size):
+                batch = pending_ids[start:start + self.batch_size]
+                vectors = self.embedder.embed([pending[doc_id][0] for doc_id in batch])
+                for doc_id, vector in zip(batch, vectors):
+                    row = self._rows.get(doc_id)
+                    if row is None:
+                        row = len(self._ids)
+                        self._rows[doc_id] = row
+                        self._ids.append(doc_id)
+                        self._hashes.append(pending[doc_id][1])
+                    else:
+                        self._hashes[row] = pending[doc_id][1]
+                    self._vectors[row] = vector
+            
+            self._stats["encoded"] += len(pending_ids)
+            self._save_meta()
+            return len(pending_ids)
+    
+    def remove(self, ids: Sequence[str]) -> int:
+        """Drop stored vectors by id; returns how many were stored"""
+        with self._lock:
+            removed = 0
+            for doc_id in ids:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                last = len(self._ids) - 1
+                if row != last:
+                    moved = self._ids[last]
+                    self._vectors[row] = self._vectors[last]
+                    self._ids[row] = moved
+                    self._hashes[row] = self._hashes[last]
+                    self._rows[moved] = row
+                self._ids.pop()
+                self._hashes.pop()
+                removed += 1
+            
+            if removed:
+                self._stats["removed"] += removed
+                self._save_meta()
+            return removed
+    
+    @property
+    def ids(self) -> List[str]:
+        with self._lock:
+            return list(self._ids)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        with self._lock:
+            return doc_id in self._rows
+    
+    def row(self, doc_id: str) -> Optional[int]:
+        with self._lock:
+            return self._rows.get(doc_id)
+    
+    def vectors(self) -> np.ndarray:
+        """float16 view of the stored rows (memory-mapped when backed by a file)"""
+        with self._lock:
+            return self._vectors[:len(self._ids)]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["vectors"] = len(self._ids)
+            stats["bytes"] = len(self._ids) * self.dim * 2
+        stats["dim"] = self.dim
+        stats["embedder"] = self.embedder.name
+        return stats
\ No newline at end of file
@@ -0,0 +1,104 @@
+import re
+import zlib
+from typing import List, Optional
+import numpy as np
+from ..utils.logger import logger
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "am", "was", "were", "be", "do", "does", "did",
+    "i", "me", "my", "we", "our", "you", "your", "it", "its", "of", "to", "in",
+    "on", "for", "and", "or", "what", "whats", "how", "can", "could", "should",
+    "would", "will", "about", "with", "at", "by", "from", "this", "that", "there",
+    "please", "tell", "get", "have", "has", "any"
+}
+
+
+class HashingEmbedder:
+    """Dependency-free embedder using hashed word and character n-grams
+
+    Catches reworded and re-punctuated repeats of a question; true
+    paraphrases need a sentence-transformers model.
+    """
+    
+    name = "hashing"
+    default_threshold = 0.9
+    
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+    
+    @staticmethod
+    def _tokens(text: str) -> List[str]:
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        tokens = []
+        for word in words:
+            if word in STOPWORDS:
+                continue
+            # Crude plural folding: "days" -> "day", "policies" -> "policy"
+            if len(word) > 4 and word.endswith("ies"):
+                word = word[:-3] + "y"
+            elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+                word = word[:-1]
+            tokens.append(word)
+        return tokens
+    
+    def _add(self, vector: np.ndarray, feature: str, weight: float):
+        h = zlib.crc32(feature.encode("utf-8"))
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % self.dim] += sign * weight
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return L2-normalised float32 vectors, one row per text"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = self._tokens(text)
+            for token in tokens:
+                self._add(vectors[row], f"w:{token}", 1.0)
+                padded = f"#{token}#"
+                for i in range(len(padded) - 2):
+                    self._add(vectors[row], f"c:{padded[i:i + 3]}", 0.3)
+            for first, second in zip(tokens, tokens[1:]):
+                self._add(vectors[row], f"b:{first} {second}", 0.5)
+        
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class SentenceTransformerEmbedder:
+    """Embedder backed by a sentence-transformers model"""
+    
+    default_threshold = 0.85
+    
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+        if SentenceTransformer is None:
+            raise ImportError("sentence-transformers is not installed")
+        self.name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dim = self.model.get_sentence_embedding_dimension()
+    
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return L2-normalised float32 vectors, one row per text"""
+        vectors = self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def get_embedder(model_name: Optional[str] = "all-MiniLM-L6-v2"):
+    """Return a sentence-transformers embedder, falling back to hashing"""
+    if not model_name or model_name == "hashing":
+        return HashingEmbedder()
+    
+    try:
+        embedder = SentenceTransformerEmbedder(model_name)
+        logger.info(f"Loaded embedding model: {model_name}")
+        return embedder
+    except ImportError:
+        logger.info("sentence-transformers not installed, using hashing embedder")
+    except Exception as e:
+        logger.warning(f"Could not load embedding model {model_name}: {e}, using hashing embedder")
+    return HashingEmbedder()
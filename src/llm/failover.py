@@ -0,0 +1,160 @@
+import time
+from typing import List, Tuple, Optional, Dict, Any, Iterator
+from .llm_client import LLMClient
+from .circuit_breaker import CircuitBreaker
+from .batch import run_batch, arun_batch
+from ..utils.logger import logger
+
+
+class FailoverClient:
+    """LLMClient-compatible wrapper that tries an ordered chain of providers
+
+    A provider is skipped while its circuit is open; an "Error: ..." result
+    counts as a failure and moves on to the next provider. When the chain
+    is exhausted an error string is returned immediately so agents fall
+    back to their rule-based answers.
+    """
+    
+    def __init__(self, chain: List[Tuple[LLMClient, CircuitBreaker]]):
+        if not chain:
+            raise ValueError("FailoverClient needs at least one provider")
+        self.chain = chain
+        self.last_provider: Optional[str] = None
+        self.failovers = 0
+    
+    @property
+    def primary(self) -> LLMClient:
+        return self.chain[0][0]
+    
+    @property
+    def context_window(self) -> Optional[int]:
+        """Smallest context window in the chain, so a prompt fits any fallback"""
+        windows = [client.context_window for client, _ in self.chain if client.context_window]
+        return min(windows) if windows else None
+    
+    def __getattr__(self, name: str):
+        # Stats helpers, metrics and settings come from the primary client
+        return getattr(self.chain[0][0], name)
+    
+    @staticmethod
+    def _is_error(result: str) -> bool:
+        return isinstance(result, str) and result.startswith("Error:")
+    
+    def _exhausted(self, last_error: Optional[str]) -> str:
+        detail = f" Last error: {last_error[len('Error:'):].strip()}" if last_error else ""
+        logger.error(f"All LLM providers unavailable.{detail}")
+        return f"Error: All LLM providers unavailable.{detail}"
+    
+    def _note_failover(self, client: LLMClient, index: int):
+        if index > 0:
+            self.failovers += 1
+            logger.info(f"Failed over to {client.provider}:{client.model}")
+        self.last_provider = f"{client.provider}:{client.model}"
+    
+    def _call(self, method: str, *args, **kwargs) -> str:
+        last_error = None
+        for index, (client, breaker) in enumerate(self.chain):
+            if not breaker.allow_request():
+                continue
+            
+            started = time.perf_counter()
+            try:
+                result = getattr(client, method)(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"{breaker.name} {method} failed: {e}")
+                result = f"Error: {e}"
+            
+            if self._is_error(result):
+                breaker.record_failure()
+                last_error = result
+                continue
+            
+            breaker.record_success(time.perf_counter() - started)
+            self._note_failover(client, index)
+            return result
+        
+        return self._exhausted(last_error)
+    
+    async def _acall(self, method: str, *args, **kwargs) -> str:
+        last_error = None
+        for index, (client, breaker) in enumerate(self.chain):
+            if not breaker.allow_request():
+                continue
+            
+            started = time.perf_counter()
+            try:
+                result = await getattr(client, method)(*args, **kwargs)
+            except ImportError:
+                raise
+            except Exception as e:
+                logger.error(f"{breaker.name} {method} failed: {e}")
+                result = f"Error: {e}"
+            
+            if self._is_error(result):
+                breaker.record_failure()
+                last_error = result
+                continue
+            
+            breaker.record_success(time.perf_counter() - started)
+            self._note_failover(client, index)
+            return result
+        
+        return self._exhausted(last_error)
+    
+    def _stream(self, method: str, *args, **kwargs) -> Iterator[str]:
+        """Fail over until a provider yields a non-error first chunk"""
+        last_error = None
+        for index, (client, breaker) in enumerate(self.chain):
+            if not breaker.allow_request():
+                continue
+            
+            started = time.perf_counter()
+            try:
+                stream = iter(getattr(client, method)(*args, **kwargs))
+                first = next(stream, "")
+            except Exception as e:
+                logger.error(f"{breaker.name} {method} failed: {e}")
+                first, stream = f"Error: {e}", iter(())
+            
+            if self._is_error(first):
+                breaker.record_failure()
+                last_error = first
+                continue
+            
+            # Latency SLO applies to time-to-first-token for streams
+            breaker.record_success(time.perf_counter() - started)
+            self._note_failover(client, index)
+            yield first
+            yield from stream
+            return
+        
+        yield self._exhausted(last_error)
+    
+    def generate(self, *args, **kwargs) -> str:
+        return self._call("generate", *args, **kwargs)
+    
+    def chat(self, *args, **kwargs) -> str:
+        return self._call("chat", *args, **kwargs)
+    
+    async def agenerate(self, *args, **kwargs) -> str:
+        return await self._acall("agenerate", *args, **kwargs)
+    
+    async def achat(self, *args, **kwargs) -> str:
+        return await self._acall("achat", *args, **kwargs)
+    
+    def generate_stream(self, *args, **kwargs) -> Iterator[str]:
+        return self._stream("generate_stream", *args, **kwargs)
+    
+    def chat_stream(self, *args, **kwargs) -> Iterator[str]:
+        return self._stream("chat_stream", *args, **kwargs)
+    
+    def generate_batch(self, items: list, max_workers: int = 4, **kwargs) -> List[str]:
+        # Each item fails over independently
+        return run_batch(self.generate, items, max_workers=max_workers, **kwargs)
+    
+    async def agenerate_batch(self, items: list, max_concurrency: Optional[int] = None, **kwargs) -> List[str]:
+        return await arun_batch(self.agenerate, items, max_concurrency=max_concurrency, **kwargs)
+    
+    def get_circuit_status(self) -> Dict[str, Any]:
+        """Return breaker state for every provider in the chain"""
+        return {breaker.name: breaker.get_status() for _, breaker in self.chain}
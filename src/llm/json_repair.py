@@ -0,0 +1,147 @@
+import json
+import re
+import threading
+from typing import Any, Optional, Tuple, List, Dict
+
+_THINK_BLOCK = re.compile(r"<think>.*?(</think>|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_JSON_START = re.compile(r"[{\[]")
+_CLOSERS = {"{": "}", "[": "]"}
+
+PARSED = "parsed"
+REPAIRED = "repaired"
+FAILED = "failed"
+
+
+def _scan(text: str, start: int) -> Tuple[Optional[int], List[Tuple[int, str]], str, bool]:
+    """Single pass over text[start:] tracking strings and bracket depth
+
+    Returns (end, safe_points, open_stack, in_string): `end` is the index
+    just past the top-level value if it closed; safe_points are cut
+    positions where closing the open brackets yields valid JSON.
+    """
+    stack = []
+    safe_points = []
+    in_string = False
+    escaped = False
+    
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+        
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+            safe_points.append((i + 1, "".join(stack)))
+        elif ch in "}]":
+            if not stack or _CLOSERS[stack[-1]] != ch:
+                return None, safe_points, "".join(stack), False
+            stack.pop()
+            if not stack:
+                return i + 1, safe_points, "", False
+            safe_points.append((i + 1, "".join(stack)))
+        elif ch == ",":
+            # Everything before a comma is a complete member
+            safe_points.append((i, "".join(stack)))
+    
+    return None, safe_points, "".join(stack), in_string
+
+
+def _close(fragment: str, stack: str) -> str:
+    return fragment + "".join(_CLOSERS[ch] for ch in reversed(stack))
+
+
+def _loads(candidate: str) -> Optional[Any]:
+    for text in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+        try:
+            return json.loads(text)
+        except ValueError:
+            continue
+    return None
+
+
+def json_end(text: str) -> Optional[int]:
+    """Index just past the first top-level JSON object/array, once it has closed
+
+    Braces inside a leading <think> block are ignored.
+    """
+    offset = 0
+    if "<think>" in text:
+        think_end = text.find("</think>")
+        if think_end == -1:
+            return None
+        offset = think_end + len("</think>")
+    
+    match = _JSON_START.search(text, offset)
+    if not match:
+        return None
+    return _scan(text, match.start())[0]
+
+
+def parse_json(text: str) -> Tuple[Optional[Any], str]:
+    """Parse the first JSON object/array in model output, repairing truncation
+
+    Handles code fences, <think> blocks, prose around the JSON, trailing
+    commas and output cut off by max_tokens (open strings and brackets
+    are closed, an incomplete last member is dropped). Returns
+    (data, status) with status "parsed", "repaired" or "failed".
+    """
+    if not text:
+        return None, FAILED
+    
+    text = _THINK_BLOCK.sub("", text)
+    match = _JSON_START.search(text)
+    if not match:
+        return None, FAILED
+    start = match.start()
+    
+    end, safe_points, stack, in_string = _scan(text, start)
+    if end is not None:
+        data = _loads(text[start:end])
+        if data is not None:
+            return data, PARSED
+    
+    # Truncated: first keep as much as possible (close a dangling string value)
+    fragment = text[start:].rstrip()
+    if in_string:
+        fragment += '"'
+    fragment = fragment.rstrip(",: \n\t")
+    data = _loads(_close(fragment, stack))
+    if data is not None:
+        return data, REPAIRED
+    
+    # Then back off to the last point where every member was complete
+    for cut, cut_stack in reversed(safe_points):
+        data = _loads(_close(text[start:cut], cut_stack))
+        if data is not None:
+            return data, REPAIRED
+    
+    return None, FAILED
+
+
+class ParseStats:
+    """Thread-safe counters of structured-output parse outcomes"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {PARSED: 0, REPAIRED: 0, FAILED: 0}
+    
+    def record(self, status: str):
+        with self._lock:
+            self._counts[status] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._counts)
+        total = sum(stats.values())
+        stats["total"] = total
+        stats["failure_rate"] = round(stats[FAILED] / total, 3) if total else 0.0
+        return stats
\ No newline at end of file
@@ -1,56 +1,708 @@
 import os
+import json
+import time
+import asyncio
+import threading
 import requests
-from typing import Optional, Dict, Any
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Iterator, List, Tuple, Union
 from dotenv import load_dotenv
+from .transport import HTTPTransport
+from .async_transport import AsyncTransport, aiohttp
+from .cache import ResponseCache, make_cache_key
+from .coalescing import SingleFlight
+from .retry import RetryPolicy
+from .rate_limiter import RateLimiter
+from .batch import run_batch, arun_batch, BatchItem
+from .context_store import ContextStore
+from .early_stop import EarlyStopper, StopCondition
+from .tokens import estimate_tokens, TokenUsage
 from ..utils.logger import logger
 
 load_dotenv()
 
+# Token counts reported by the provider for the call in progress; a
+# mutable dict so coalesced tasks and threads write into the caller's scope
+_CALL_USAGE: ContextVar[Optional[Dict[str, int]]] = ContextVar("llm_call_usage", default=None)
+
 class LLMClient:
     """Universal LLM client supporting multiple providers"""
     
-    def __init__(self, provider: str = "ollama", model: str = "phi3:3.8b"):
+    def __init__(
+        self,
+        provider: str = "ollama",
+        model: str = "phi3:3.8b",
+        transport: Optional[HTTPTransport] = None,
+        health_ttl: Optional[float] = None,
+        async_transport: Optional[AsyncTransport] = None,
+        cache: Optional[ResponseCache] = None,
+        coalescer: Optional[SingleFlight] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        keep_alive: Optional[Union[str, int]] = None,
+        context_store: Optional[ContextStore] = None,
+        context_window: Optional[int] = None
+    ):
         self.provider = provider.lower()
         self.model = model
         self.base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.timeout = int(os.getenv("OLLAMA_TIMEOUT", "180"))
+        # How long Ollama keeps the model loaded after a request ("30m"; -1 = forever)
+        self.keep_alive = keep_alive if keep_alive is not None else os.getenv("OLLAMA_KEEP_ALIVE") or None
+        # Model context size in tokens (sent to Ollama as num_ctx; used for prompt budgeting)
+        self.context_window = context_window
         
         # Google AI Studio config
         self.google_api_key = os.getenv("GOOGLE_API_KEY", "")
         self.google_base_url = "https://generativelanguage.googleapis.com/v1beta"
         
+        # OpenAI or any OpenAI-compatible server (vLLM, llama.cpp, LM Studio)
+        self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
+        self.openai_base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+        
+        # Pooled keep-alive transport (shared when passed in by ModelRouter)
+        self.transport = transport or HTTPTransport.from_env()
+        if health_ttl is None:
+            health_ttl = float(os.getenv("OLLAMA_HEALTH_TTL", "30"))
+        self.health = self.transport.health_monitor(
+            f"{self.base_url}/api/tags", self._probe_ollama, health_ttl
+        )
+        
+        # Async connection pool, created on first async call unless shared
+        self._async_transport = async_transport
+        
+        # Response cache and in-flight request coalescing (shared when
+        # passed in by ModelRouter)
+        self.cache = cache
+        self.coalescer = coalescer or SingleFlight()
+        
+        # Retries on 429/5xx and client-side quota pacing
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        
+        # Per-call timing (latency, time-to-first-token) and token counts
+        self.call_metrics = deque(maxlen=200)
+        self.token_usage = TokenUsage()
+        
+        # Ollama contexts for shared prompt prefixes (KV reuse)
+        self.context_store = context_store
+        
+        # Model load (cold start) and prefill timing reported by Ollama
+        self._load_lock = threading.Lock()
+        self._load_stats = {
+            "cold_starts": 0,
+            "load_seconds": 0.0,
+            "last_load_seconds": None,
+            "prefill_seconds": 0.0,
+            "prompt_tokens": 0
+        }
+        self._early_stops = 0
+    
     def generate(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         temperature: float = 0.7,
         max_tokens: int = 1024,
-        system: Optional[str] = None
+        system: Optional[str] = None,
+        use_cache: bool = True,
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        stop: Optional[List[str]] = None,
+        stop_when: Optional[List[StopCondition]] = None
+    ) -> str:
+        """Generate text using configured LLM
+        
+        `prefix` is a prompt head shared by many calls (e.g. a job
+        description); with Ollama its context is reused instead of
+        prefilled again. Other providers see prefix + prompt.
+        
+        `schema` (JSON Schema) constrains the output to JSON via Ollama
+        `format`, Gemini `responseSchema` or OpenAI `response_format`.
+        
+        `stop` sequences and `stop_when` conditions (e.g. JSONComplete)
+        stream the answer and cancel generation once it is complete.
+        """
+        if stop or stop_when:
+            return self._generate_until(
+                prompt, temperature, max_tokens, system, use_cache, prefix, schema, stop, stop_when
+            )
+        
+        started = time.perf_counter()
+        
+        with self._usage_scope() as usage:
+            if use_cache:
+                # Identical concurrent calls share one cache lookup and generation
+                key = self._cache_key(self._keyed_prompt(prompt, prefix, schema), temperature, max_tokens, system)
+                result, cached = self.coalescer.do(
+                    key, lambda: self._generate_cached(key, prompt, temperature, max_tokens, system, prefix, schema)
+                )
+            else:
+                result, cached = self._generate(prompt, temperature, max_tokens, system, prefix, schema), False
+        
+        self._record_call(
+            "generate", started, time.perf_counter(), len(result), streamed=False, cached=cached,
+            tokens=self._call_tokens(usage, (system or "") + (prefix or "") + prompt, result)
+        )
+        return result
+    
+    def _generate_cached(
+        self,
+        key: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, bool]:
+        """Serve from cache or generate and store; returns (text, was_cached)"""
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached, True
+        
+        result = self._generate(prompt, temperature, max_tokens, system, prefix, schema)
+        self._cache_store(key, result)
+        return result, False
+    
+    def _generate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Dispatch a generation to the configured provider"""
+        if self._reuses_context(prefix):
+            context = self._prefix_context(prefix, system)
+            if context is not None:
+                self._throttle(prompt, None, max_tokens)
+                return self._ollama_generate(prompt, temperature, max_tokens, None, context=context, schema=schema)
+        
+        prompt = f"{prefix}{prompt}" if prefix else prompt
+        self._throttle(prompt, system, max_tokens)
+        
+        if self.provider == "ollama":
+            return self._ollama_generate(prompt, temperature, max_tokens, system, schema=schema)
+        elif self.provider == "google" or self.provider == "gemini":
+            return self._google_generate(prompt, temperature, max_tokens, system, schema=schema)
+        elif self.provider == "openai":
+            return self._openai_generate(prompt, temperature, max_tokens, system, schema=schema)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+    
+    def _generate_until(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        use_cache: bool,
+        prefix: Optional[str],
+        schema: Optional[Dict[str, Any]],
+        stop: Optional[List[str]],
+        stop_when: Optional[List[StopCondition]]
     ) -> str:
-        """Generate text using configured LLM"""
+        """Stream a generation and cut it off as soon as the answer is complete"""
+        def run() -> str:
+            return self._stop_early(prompt, temperature, max_tokens, system, prefix, schema, stop, stop_when)
+        
+        if not use_cache:
+            return run()
+        
+        # Identical concurrent calls share one cache lookup and stream
+        keyed = self._keyed_prompt(prompt, prefix, schema) + EarlyStopper.describe(stop, stop_when)
+        key = self._cache_key(keyed, temperature, max_tokens, system)
+        started = time.perf_counter()
+        result, cached = self.coalescer.do(key, lambda: self._stopped_cached(key, run))
+        if cached:
+            self._record_call("generate", started, None, len(result), streamed=False, cached=True)
+        return result
+    
+    def _stopped_cached(self, key: str, run: Callable[[], str]) -> Tuple[str, bool]:
+        """Serve an early-stopped answer from cache or run it and store; returns (text, was_cached)"""
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached, True
+        
+        result = run()
+        self._cache_store(key, result)
+        return result, False
+    
+    def _stop_early(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        prefix: Optional[str],
+        schema: Optional[Dict[str, Any]],
+        stop: Optional[List[str]],
+        stop_when: Optional[List[StopCondition]]
+    ) -> str:
+        stopper = EarlyStopper(stop, stop_when)
+        stream = self.generate_stream(
+            prompt, temperature, max_tokens, system, use_cache=False, prefix=prefix, schema=schema
+        )
+        result = stopper.run(stream)
+        self._note_early_stop(stopper)
+        return result
+    
+    def _note_early_stop(self, stopper: EarlyStopper):
+        if stopper.stopped_early:
+            with self._load_lock:
+                self._early_stops += 1
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        system: Optional[str] = None,
+        use_cache: bool = True,
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Generate text, yielding chunks as the model produces them"""
+        keyed = self._keyed_prompt(prompt, prefix, schema)
+        cache_key = self._cache_key(keyed, temperature, max_tokens, system) if use_cache else None
+        cached = self._cache_lookup(cache_key)
+        if cached is not None:
+            return self._track_stream("generate_stream", iter([cached]), cached=True)
+        
+        context = self._prefix_context(prefix, system) if self._reuses_context(prefix) else None
+        if context is not None:
+            system = None
+        elif prefix:
+            prompt = f"{prefix}{prompt}"
+        
+        self._throttle(prompt, system, max_tokens)
         
         if self.provider == "ollama":
-            return self._ollama_generate(prompt, temperature, max_tokens, system)
+            payload = self._ollama_payload(prompt, temperature, max_tokens, system, stream=True)
+            if context:
+                self._with_context(payload, context)
+            if schema:
+                payload["format"] = schema
+            stream = self._ollama_stream(f"{self.base_url}/api/generate", payload)
         elif self.provider == "google" or self.provider == "gemini":
-            return self._google_generate(prompt, temperature, max_tokens, system)
+            stream = self._google_stream(prompt, temperature, max_tokens, system, schema)
         elif self.provider == "openai":
-            return self._openai_generate(prompt, temperature, max_tokens, system)
+            stream = self._openai_stream(self._openai_messages(prompt, system), temperature, max_tokens, schema)
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
+        
+        if cache_key is not None and self.cache is not None:
+            stream = self._cache_stream(cache_key, stream)
+        return self._track_stream("generate_stream", stream, prompt=(system or "") + prompt)
+    
+    def _estimate_tokens(self, prompt: str, system: Optional[str], max_tokens: int) -> int:
+        """Token cost of a request for quota pacing (estimated prompt plus output budget)"""
+        return estimate_tokens(prompt) + estimate_tokens(system) + max_tokens
+    
+    def _throttle(self, prompt: str, system: Optional[str], max_tokens: int):
+        """Wait for the provider/model rate limit, if one is configured"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(
+                self._provider_key, self.model, self._estimate_tokens(prompt, system, max_tokens)
+            )
+    
+    async def _athrottle(self, prompt: str, system: Optional[str], max_tokens: int):
+        """Async counterpart of _throttle()"""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(
+                self._provider_key, self.model, self._estimate_tokens(prompt, system, max_tokens)
+            )
+    
+    def _post(self, url: str, timeout: float, **kwargs) -> requests.Response:
+        """POST through the pooled transport, retrying 429/5xx with backoff"""
+        attempt = 0
+        while True:
+            response = self.transport.post(url, timeout=timeout, **kwargs)
+            if not self.retry_policy.should_retry(response.status_code, attempt):
+                return response
+            
+            delay = self.retry_policy.delay(attempt, response.headers.get("Retry-After"))
+            response.close()
+            attempt += 1
+            logger.warning(
+                f"{self.provider} returned {response.status_code}, retrying in {delay:.1f}s "
+                f"({attempt}/{self.retry_policy.max_retries})"
+            )
+            time.sleep(delay)
+    
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        """Return retry and rate limit statistics"""
+        return {
+            "retry": self.retry_policy.get_stats(),
+            "rate_limits": self.rate_limiter.get_stats() if self.rate_limiter is not None else {}
+        }
     
     def _check_ollama_health(self) -> bool:
-        """Check if Ollama server is reachable"""
+        """Check if Ollama server is reachable (cached, refreshed in background)"""
+        return self.health.is_healthy()
+    
+    def _probe_ollama(self) -> bool:
+        """Probe Ollama server directly"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.transport.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except Exception:
             return False
     
-    def _ollama_generate(
-        self, 
-        prompt: str, 
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """Return connection pool and health statistics"""
+        return self.transport.get_stats()
+    
+    def _cache_key(
+        self,
+        prompt: str,
         temperature: float,
         max_tokens: int,
         system: Optional[str]
+    ) -> str:
+        """Key identifying identical requests (for caching and coalescing)"""
+        return make_cache_key(self.provider, self.model, prompt, system, temperature, max_tokens)
+    
+    def _cache_lookup(self, cache_key: Optional[str]) -> Optional[str]:
+        """Return a cached response, if any"""
+        if cache_key is None or self.cache is None:
+            return None
+        return self.cache.get(cache_key)
+    
+    def _cache_store(self, cache_key: Optional[str], result: str):
+        """Cache successful responses (errors are never cached)"""
+        if cache_key is None or self.cache is None:
+            return
+        if result and not result.startswith("Error:"):
+            self.cache.set(cache_key, result)
+    
+    def _cache_stream(self, cache_key: str, stream: Iterator[str]) -> Iterator[str]:
+        """Pass chunks through, caching the full text once the stream completes"""
+        chunks = []
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            self._close_stream(stream)
+        
+        # Abandoned or failed streams never reach the cache
+        if not any(chunk.startswith("Error:") for chunk in chunks):
+            self._cache_store(cache_key, "".join(chunks))
+    
+    def generate_batch(
+        self,
+        items: List[BatchItem],
+        max_workers: int = 4,
+        **kwargs
+    ) -> List[str]:
+        """Generate for many prompts with several requests in flight
+        
+        Items are prompts or dicts of generate() kwargs; results keep input order.
+        """
+        return run_batch(self.generate, items, max_workers=max_workers, **kwargs)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return response cache statistics"""
+        return self.cache.get_stats() if self.cache is not None else {}
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Return in-flight request coalescing statistics"""
+        return self.coalescer.get_stats()
+    
+    def _record_call(
+        self,
+        kind: str,
+        started: float,
+        first_token_at: Optional[float],
+        chars: int,
+        streamed: bool,
+        cached: bool = False,
+        tokens: Optional[Tuple[int, int, bool]] = None
+    ):
+        """Record timing and (prompt, completion, estimated) token counts for a single call"""
+        finished = time.perf_counter()
+        # Cache hits consume no model tokens
+        prompt_tokens, completion_tokens, estimated = (0, 0, False) if cached or tokens is None else tokens
+        ttft = (first_token_at - started) if first_token_at is not None else None
+        metrics = {
+            "kind": kind,
+            "provider": self.provider,
+            "model": self.model,
+            "streamed": streamed,
+            "cached": cached,
+            "latency": round(finished - started, 4),
+            "time_to_first_token": round(ttft, 4) if ttft is not None else None,
+            "chars": chars,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_estimated": estimated
+        }
+        self.call_metrics.append(metrics)
+        if not cached and tokens is not None:
+            self.token_usage.add(prompt_tokens, completion_tokens, estimated)
+        if streamed and ttft is not None:
+            logger.info(f"{self.model} first token after {ttft:.2f}s ({chars} chars streamed)")
+    
+    @property
+    def last_call_metrics(self) -> Optional[Dict[str, Any]]:
+        """Metrics of the most recent call"""
+        return self.call_metrics[-1] if self.call_metrics else None
+    
+    @contextmanager
+    def _usage_scope(self) -> Iterator[Dict[str, int]]:
+        """Collect provider-reported token counts for the calls made inside the block"""
+        usage: Dict[str, int] = {}
+        token = _CALL_USAGE.set(usage)
+        try:
+            yield usage
+        finally:
+            _CALL_USAGE.reset(token)
+    
+    @staticmethod
+    def _note_usage(prompt_tokens: Optional[int], completion_tokens: Optional[int]):
+        """Add provider-reported token counts to the current call (prefix priming included)"""
+        usage = _CALL_USAGE.get()
+        if usage is None or prompt_tokens is None:
+            return
+        usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + int(prompt_tokens)
+        usage["completion_tokens"] = usage.get("completion_tokens", 0) + int(completion_tokens or 0)
+    
+    @staticmethod
+    def _call_tokens(usage: Dict[str, int], prompt: str, result: str) -> Tuple[int, int, bool]:
+        """Reported token counts, or estimates when the provider sent none (or the call was coalesced)"""
+        if "prompt_tokens" in usage:
+            return usage["prompt_tokens"], usage["completion_tokens"], False
+        return estimate_tokens(prompt), estimate_tokens(result), True
+    
+    def get_token_stats(self) -> Dict[str, Any]:
+        """Return prompt/completion token totals and the configured context window"""
+        stats = self.token_usage.get_stats()
+        stats["context_window"] = self.context_window
+        return stats
+    
+    # Loads shorter than this are just Ollama re-attaching a resident model
+    COLD_START_THRESHOLD = 0.5
+    
+    def _note_timings(self, data: Dict[str, Any], elapsed: Optional[float] = None) -> Optional[float]:
+        """Record Ollama's load and prefill durations apart from generation time"""
+        self._note_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+        with self._load_lock:
+            self._load_stats["prefill_seconds"] += data.get("prompt_eval_duration", 0) / 1e9
+            self._load_stats["prompt_tokens"] += data.get("prompt_eval_count", 0)
+        
+        load_ns = data.get("load_duration")
+        load_seconds = load_ns / 1e9 if load_ns is not None else elapsed
+        if load_seconds is None:
+            return None
+        
+        with self._load_lock:
+            self._load_stats["last_load_seconds"] = round(load_seconds, 3)
+            if load_seconds >= self.COLD_START_THRESHOLD:
+                self._load_stats["cold_starts"] += 1
+                self._load_stats["load_seconds"] += load_seconds
+        
+        if load_seconds >= self.COLD_START_THRESHOLD:
+            eval_seconds = data.get("eval_duration", 0) / 1e9
+            logger.info(f"Cold start: loaded {self.model} in {load_seconds:.2f}s (generation {eval_seconds:.2f}s)")
+        return load_seconds
+    
+    def _reuses_context(self, prefix: Optional[str]) -> bool:
+        return (
+            bool(prefix) and self.provider == "ollama" and self.context_store is not None
+            and self.context_store.template(self.model) is not None
+        )
+    
+    def _prefix_payload(self, prefix: str, system: Optional[str]) -> Dict[str, Any]:
+        """Prefill-only request for system + prefix, templated by hand in raw mode
+        
+        The prefix stays an open user turn, so a later call can append the
+        rest of the prompt to it. One token is generated so Ollama returns
+        a context; _store_context() drops it again.
+        """
+        head = self.context_store.template(self.model).head(system, prefix)
+        payload = self._ollama_payload(head, 0.0, 1, None, stream=False)
+        payload["raw"] = True
+        return payload
+    
+    def _with_context(self, payload: Dict[str, Any], context: List[int]) -> Dict[str, Any]:
+        """Continue a primed prefix: close the user turn in raw mode after its context"""
+        payload["prompt"] = self.context_store.template(self.model).tail(payload["prompt"])
+        payload["raw"] = True
+        payload["context"] = context
+        return payload
+    
+    def _store_context(self, key: str, data: Dict[str, Any]) -> Optional[List[int]]:
+        self._note_timings(data)
+        context = data.get("context") or []
+        # The context ends with the generated token(s), which are not part of the prompt
+        generated = data.get("eval_count") or 0
+        context = context[:len(context) - generated] if generated < len(context) else []
+        if context:
+            self.context_store.set(key, context)
+        return context or None
+    
+    def _prefix_context(self, prefix: str, system: Optional[str]) -> Optional[List[int]]:
+        """Stored context for system + prefix, prefilling it once on a miss"""
+        key = ContextStore.key(self.model, system, prefix)
+        context = self.context_store.get(key)
+        if context is not None:
+            return context
+        # Concurrent callers with the same prefix share one prefill
+        return self.coalescer.do(f"ctx:{key}", lambda: self._prime_context(key, prefix, system))
+    
+    def _prime_context(self, key: str, prefix: str, system: Optional[str]) -> Optional[List[int]]:
+        if not self._check_ollama_health():
+            return None
+        try:
+            self._throttle(prefix, system, 1)
+            response = self._post(
+                f"{self.base_url}/api/generate", json=self._prefix_payload(prefix, system), timeout=self.timeout
+            )
+            response.raise_for_status()
+            self.health.mark(True)
+            return self._store_context(key, response.json())
+        except Exception as e:
+            logger.warning(f"Could not prefill shared prefix, sending full prompt: {e}")
+            return None
+    
+    async def _aprefix_context(self, prefix: str, system: Optional[str]) -> Optional[List[int]]:
+        """Async counterpart of _prefix_context()"""
+        key = ContextStore.key(self.model, system, prefix)
+        context = self.context_store.get(key)
+        if context is not None:
+            return context
+        return await self.coalescer.ado(f"ctx:{key}", lambda: self._aprime_context(key, prefix, system))
+    
+    async def _aprime_context(self, key: str, prefix: str, system: Optional[str]) -> Optional[List[int]]:
+        if self.health.known_down():
+            return None
+        try:
+            await self._athrottle(prefix, system, 1)
+            data = await self._ollama_apost("/api/generate", self._prefix_payload(prefix, system))
+            return self._store_context(key, data)
+        except Exception as e:
+            logger.warning(f"Could not prefill shared prefix, sending full prompt: {e}")
+            return None
+    
+    def get_context_stats(self) -> Dict[str, Any]:
+        """Return prefix context reuse statistics"""
+        return self.context_store.get_stats() if self.context_store is not None else {}
+    
+    def preload(self) -> Dict[str, Any]:
+        """Load the model into Ollama memory ahead of the first request
+        
+        An empty /api/generate request loads the model and applies keep_alive.
+        """
+        if self.provider != "ollama":
+            return {"model": self.model, "loaded": False, "skipped": f"{self.provider} has no model loading"}
+        
+        started = time.perf_counter()
+        try:
+            payload = {"model": self.model}
+            if self.keep_alive:
+                payload["keep_alive"] = self.keep_alive
+            
+            response = self._post(f"{self.base_url}/api/generate", json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            self.health.mark(True)
+            
+            load_seconds = self._note_timings(response.json(), elapsed=time.perf_counter() - started)
+            logger.info(f"Preloaded {self.model} ({load_seconds:.2f}s)")
+            return {"model": self.model, "loaded": True, "load_seconds": round(load_seconds, 3)}
+        
+        except requests.exceptions.ConnectionError:
+            self.health.mark(False)
+            logger.warning(f"Cannot preload {self.model}: Ollama not reachable")
+            return {"model": self.model, "loaded": False, "error": "Cannot connect to Ollama"}
+        
+        except Exception as e:
+            logger.warning(f"Cannot preload {self.model}: {e}")
+            return {"model": self.model, "loaded": False, "error": str(e)}
+    
+    def get_load_stats(self) -> Dict[str, Any]:
+        """Return model load (cold start), prefill and early-stop statistics"""
+        with self._load_lock:
+            stats = dict(self._load_stats)
+            stats["early_stops"] = self._early_stops
+        stats["load_seconds"] = round(stats["load_seconds"], 3)
+        stats["prefill_seconds"] = round(stats["prefill_seconds"], 3)
+        stats["keep_alive"] = self.keep_alive
+        return stats
+    
+    def _track_stream(
+        self,
+        kind: str,
+        stream: Iterator[str],
+        cached: bool = False,
+        prompt: str = ""
+    ) -> Iterator[str]:
+        """Wrap a chunk stream to record time-to-first-token and estimated token counts"""
+        started = time.perf_counter()
+        first_token_at = None
+        chars = 0
+        completion_tokens = 0
+        try:
+            for chunk in stream:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chars += len(chunk)
+                completion_tokens += estimate_tokens(chunk)
+                yield chunk
+        finally:
+            self._close_stream(stream)
+            self._record_call(
+                kind, started, first_token_at, chars, streamed=True, cached=cached,
+                tokens=(estimate_tokens(prompt), completion_tokens, True)
+            )
+    
+    @staticmethod
+    def _close_stream(stream: Iterator[str]):
+        """Close an abandoned inner stream so its HTTP response (and the generation) ends now"""
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    
+    def _ollama_payload(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        stream: bool
+    ) -> Dict[str, Any]:
+        """Build /api/generate request body"""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+        if self.context_window:
+            payload["options"]["num_ctx"] = self.context_window
+        
+        if system:
+            payload["system"] = system
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        
+        return payload
+    
+    def _ollama_generate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        context: Optional[List[int]] = None,
+        schema: Optional[Dict[str, Any]] = None
     ) -> str:
         """Generate using Ollama with improved error handling"""
         
@@ -61,49 +713,178 @@ class LLMClient:
         
         try:
             url = f"{self.base_url}/api/generate"
-            
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens
-                }
-            }
-            
-            if system:
-                payload["system"] = system
+            payload = self._ollama_payload(prompt, temperature, max_tokens, system, stream=False)
+            if context:
+                self._with_context(payload, context)
+            if schema:
+                payload["format"] = schema
             
             logger.info(f"Generating with model {self.model} (timeout: {self.timeout}s)")
             
-            response = requests.post(url, json=payload, timeout=self.timeout)
+            response = self._post(url, json=payload, timeout=self.timeout)
             response.raise_for_status()
+            self.health.mark(True)
             
-            result = response.json().get("response", "")
+            data = response.json()
+            self._note_timings(data)
+            result = data.get("response", "")
             logger.info(f"Generation completed ({len(result)} chars)")
             return result
-            
+        
         except requests.exceptions.Timeout:
             error_msg = f"⏱️ Request timed out after {self.timeout}s"
             logger.error(error_msg)
             return f"Error: {error_msg}"
-            
+        
         except requests.exceptions.ConnectionError:
+            self.health.mark(False)
             error_msg = "❌ Cannot connect to Ollama"
             logger.error(error_msg)
             return f"Error: {error_msg}"
-            
+        
         except Exception as e:
             logger.error(f"Ollama generation error: {e}")
             return f"Error: {str(e)}"
     
+    def _ollama_stream(self, url: str, payload: Dict[str, Any]) -> Iterator[str]:
+        """Stream NDJSON chunks from Ollama /api/generate or /api/chat"""
+        
+        if not self._check_ollama_health():
+            error_msg = "❌ Ollama server not responding. Please start Ollama."
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+            return
+        
+        try:
+            logger.info(f"Streaming with model {self.model} (timeout: {self.timeout}s)")
+            
+            with self._post(url, json=payload, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                self.health.mark(True)
+                
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    if "error" in data:
+                        yield f"Error: {data['error']}"
+                        return
+                    
+                    chunk = data.get("response") or data.get("message", {}).get("content", "")
+                    if chunk:
+                        yield chunk
+                    if data.get("done"):
+                        self._note_timings(data)
+                        break
+        
+        except requests.exceptions.Timeout:
+            error_msg = f"⏱️ Request timed out after {self.timeout}s"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except requests.exceptions.ConnectionError:
+            self.health.mark(False)
+            error_msg = "❌ Cannot connect to Ollama"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except Exception as e:
+            logger.error(f"Ollama streaming error: {e}")
+            yield f"Error: {str(e)}"
+    
+    def _google_model(self) -> str:
+        """Resolve Gemini model name"""
+        return self.model if self.model.startswith("gemini") else "gemini-pro"
+    
+    def _google_payload(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build Gemini generateContent request body"""
+        # Build prompt with system instruction if provided
+        full_prompt = prompt
+        if system:
+            full_prompt = f"{system}\n\n{prompt}"
+        
+        payload = {
+            "contents": [{
+                "parts": [{
+                    "text": full_prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_tokens,
+            }
+        }
+        
+        if schema:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = self._google_schema(schema)
+        
+        return payload
+    
+    # JSON Schema keywords Gemini's OpenAPI-subset schema accepts
+    GOOGLE_SCHEMA_KEYS = {"type", "properties", "required", "items", "enum", "description", "nullable", "format"}
+    
+    @classmethod
+    def _google_schema(cls, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop JSON Schema keywords Gemini rejects (additionalProperties, minimum, ...)"""
+        cleaned = {}
+        for key, value in schema.items():
+            if key not in cls.GOOGLE_SCHEMA_KEYS:
+                continue
+            if key == "properties":
+                value = {name: cls._google_schema(prop) for name, prop in value.items()}
+            elif key == "items":
+                value = cls._google_schema(value)
+            cleaned[key] = value
+        return cleaned
+    
+    @staticmethod
+    def _keyed_prompt(prompt: str, prefix: Optional[str], schema: Optional[Dict[str, Any]]) -> str:
+        """Everything prompt-like that changes the response, for cache keys"""
+        keyed = f"{prefix or ''}{prompt}"
+        if schema:
+            keyed += f"\n#schema:{json.dumps(schema, sort_keys=True)}"
+        return keyed
+    
+    @staticmethod
+    def _google_text(data: Dict[str, Any]) -> Optional[str]:
+        """Extract text from a Gemini response chunk"""
+        if "candidates" in data and len(data["candidates"]) > 0:
+            candidate = data["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                return candidate["content"]["parts"][0].get("text", "")
+        return None
+    
+    @classmethod
+    def _note_google_usage(cls, data: Dict[str, Any]):
+        """Record Gemini usageMetadata token counts"""
+        usage = data.get("usageMetadata") or {}
+        cls._note_usage(usage.get("promptTokenCount"), usage.get("candidatesTokenCount"))
+    
+    @staticmethod
+    def _google_http_error(status_code: int) -> str:
+        """Format Gemini HTTP error"""
+        error_msg = f"Google API error: {status_code}"
+        if status_code == 429:
+            error_msg += " - Rate limit exceeded. Wait 1 minute or upgrade plan."
+        elif status_code == 403:
+            error_msg += " - Invalid API key. Check GOOGLE_API_KEY in .env"
+        return error_msg
+    
     def _google_generate(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         temperature: float,
         max_tokens: int,
-        system: Optional[str]
+        system: Optional[str],
+        schema: Optional[Dict[str, Any]] = None
     ) -> str:
         """Generate using Google AI Studio (Gemini) - FULLY IMPLEMENTED"""
         
@@ -113,73 +894,284 @@ class LLMClient:
             return f"Error: {error_msg}\n\nGet your FREE key at: https://makersuite.google.com/app/apikey"
         
         try:
-            # Use gemini-pro model
-            model = self.model if self.model.startswith("gemini") else "gemini-pro"
-            
+            model = self._google_model()
             url = f"{self.google_base_url}/models/{model}:generateContent?key={self.google_api_key}"
-            
-            # Build prompt with system instruction if provided
-            full_prompt = prompt
-            if system:
-                full_prompt = f"{system}\n\n{prompt}"
-            
-            payload = {
-                "contents": [{
-                    "parts": [{
-                        "text": full_prompt
-                    }]
-                }],
-                "generationConfig": {
-                    "temperature": temperature,
-                    "maxOutputTokens": max_tokens,
-                }
-            }
+            payload = self._google_payload(prompt, temperature, max_tokens, system, schema)
             
             logger.info(f"Generating with Google {model}")
             
-            response = requests.post(url, json=payload, timeout=60)
+            response = self._post(url, json=payload, timeout=60)
             response.raise_for_status()
             
             data = response.json()
-            
-            # Extract text from response
-            if "candidates" in data and len(data["candidates"]) > 0:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    text = candidate["content"]["parts"][0].get("text", "")
-                    logger.info(f"Generation completed ({len(text)} chars)")
-                    return text
+            self._note_google_usage(data)
+            text = self._google_text(data)
+            if text is not None:
+                logger.info(f"Generation completed ({len(text)} chars)")
+                return text
             
             return "Error: No response generated"
-            
+        
         except requests.exceptions.Timeout:
             error_msg = "⏱️ Google API timeout"
             logger.error(error_msg)
             return f"Error: {error_msg}"
-            
+        
         except requests.exceptions.HTTPError as e:
-            error_msg = f"Google API error: {e.response.status_code}"
-            if e.response.status_code == 429:
-                error_msg += " - Rate limit exceeded. Wait 1 minute or upgrade plan."
-            elif e.response.status_code == 403:
-                error_msg += " - Invalid API key. Check GOOGLE_API_KEY in .env"
+            error_msg = self._google_http_error(e.response.status_code)
             logger.error(f"{error_msg} - {e.response.text}")
             return f"Error: {error_msg}"
-            
+        
         except Exception as e:
             logger.error(f"Google generation error: {e}")
             return f"Error: {str(e)}"
     
+    def _google_stream(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Stream using Gemini streamGenerateContent (server-sent events)"""
+        
+        if not self.google_api_key:
+            error_msg = "❌ GOOGLE_API_KEY not set in .env file"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}\n\nGet your FREE key at: https://makersuite.google.com/app/apikey"
+            return
+        
+        try:
+            model = self._google_model()
+            url = (
+                f"{self.google_base_url}/models/{model}:streamGenerateContent"
+                f"?alt=sse&key={self.google_api_key}"
+            )
+            payload = self._google_payload(prompt, temperature, max_tokens, system, schema)
+            
+            logger.info(f"Streaming with Google {model}")
+            
+            with self._post(url, json=payload, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    text = self._google_text(json.loads(line[len("data:"):].strip()))
+                    if text:
+                        yield text
+        
+        except requests.exceptions.Timeout:
+            error_msg = "⏱️ Google API timeout"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except requests.exceptions.HTTPError as e:
+            error_msg = self._google_http_error(e.response.status_code)
+            logger.error(f"{error_msg} - {e.response.text}")
+            yield f"Error: {error_msg}"
+        
+        except Exception as e:
+            logger.error(f"Google streaming error: {e}")
+            yield f"Error: {str(e)}"
+    
+    @staticmethod
+    def _openai_messages(prompt: str, system: Optional[str]) -> List[Dict[str, str]]:
+        """Build chat messages for a single prompt"""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _openai_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stream: bool,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build /chat/completions request body"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": stream
+        }
+        
+        if schema:
+            payload["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": "response", "schema": schema}
+            }
+        
+        return payload
+    
+    def _openai_headers(self) -> Dict[str, str]:
+        """Auth headers (local OpenAI-compatible servers may not need a key)"""
+        return {"Authorization": f"Bearer {self.openai_api_key}"} if self.openai_api_key else {}
+    
+    @classmethod
+    def _note_openai_usage(cls, data: Dict[str, Any]):
+        """Record chat-completions `usage` token counts"""
+        usage = data.get("usage") or {}
+        cls._note_usage(usage.get("prompt_tokens"), usage.get("completion_tokens"))
+    
+    @staticmethod
+    def _openai_http_error(status_code: int, body: str = "") -> str:
+        """Format OpenAI-compatible HTTP error"""
+        error_msg = f"OpenAI API error: {status_code}"
+        if status_code == 401:
+            error_msg += " - Invalid API key. Check OPENAI_API_KEY in .env"
+        elif status_code == 429:
+            error_msg += " - Rate limit or quota exceeded"
+        elif status_code == 404:
+            error_msg += " - Model or endpoint not found. Check OPENAI_BASE_URL"
+        return error_msg
+    
     def _openai_generate(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         temperature: float,
         max_tokens: int,
-        system: Optional[str]
+        system: Optional[str],
+        schema: Optional[Dict[str, Any]] = None
     ) -> str:
-        """Generate using OpenAI (placeholder)"""
-        logger.warning("OpenAI integration not yet implemented")
-        return "OpenAI integration pending"
+        """Generate using an OpenAI-compatible chat completions endpoint"""
+        return self._openai_complete(self._openai_messages(prompt, system), temperature, max_tokens, schema)
+    
+    def _openai_complete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """POST /chat/completions and return the message content"""
+        try:
+            url = f"{self.openai_base_url}/chat/completions"
+            payload = self._openai_payload(messages, temperature, max_tokens, stream=False, schema=schema)
+            
+            logger.info(f"Generating with OpenAI-compatible {self.model}")
+            
+            response = self._post(url, json=payload, headers=self._openai_headers(), timeout=self.timeout)
+            response.raise_for_status()
+            
+            data = response.json()
+            self._note_openai_usage(data)
+            choices = data.get("choices") or []
+            if not choices:
+                return "Error: No response generated"
+            
+            text = choices[0].get("message", {}).get("content") or ""
+            logger.info(f"Generation completed ({len(text)} chars)")
+            return text
+        
+        except requests.exceptions.Timeout:
+            error_msg = f"⏱️ OpenAI request timed out after {self.timeout}s"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+        
+        except requests.exceptions.HTTPError as e:
+            error_msg = self._openai_http_error(e.response.status_code)
+            logger.error(f"{error_msg} - {e.response.text}")
+            return f"Error: {error_msg}"
+        
+        except requests.exceptions.ConnectionError:
+            error_msg = f"❌ Cannot connect to {self.openai_base_url}"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+        
+        except Exception as e:
+            logger.error(f"OpenAI generation error: {e}")
+            return f"Error: {str(e)}"
+    
+    def _openai_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """Stream /chat/completions deltas (server-sent events)"""
+        try:
+            url = f"{self.openai_base_url}/chat/completions"
+            payload = self._openai_payload(messages, temperature, max_tokens, stream=True, schema=schema)
+            
+            logger.info(f"Streaming with OpenAI-compatible {self.model}")
+            
+            with self._post(
+                url,
+                json=payload,
+                headers=self._openai_headers(),
+                stream=True,
+                timeout=self.timeout
+            ) as response:
+                response.raise_for_status()
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices") or []
+                    if choices:
+                        chunk = choices[0].get("delta", {}).get("content")
+                        if chunk:
+                            yield chunk
+        
+        except requests.exceptions.Timeout:
+            error_msg = f"⏱️ OpenAI request timed out after {self.timeout}s"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except requests.exceptions.HTTPError as e:
+            error_msg = self._openai_http_error(e.response.status_code)
+            logger.error(f"{error_msg} - {e.response.text}")
+            yield f"Error: {error_msg}"
+        
+        except requests.exceptions.ConnectionError:
+            error_msg = f"❌ Cannot connect to {self.openai_base_url}"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            yield f"Error: {str(e)}"
+    
+    def _ollama_chat_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stream: bool
+    ) -> Dict[str, Any]:
+        """Build /api/chat request body"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens
+            }
+        }
+        if self.context_window:
+            payload["options"]["num_ctx"] = self.context_window
+        
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        
+        return payload
+    
+    @staticmethod
+    def _messages_to_prompt(messages: List[Dict[str, str]]) -> str:
+        """Flatten chat messages for providers without a chat endpoint"""
+        return "\n".join([f"{m['role']}: {m['content']}" for m in messages])
     
     def chat(
         self,
@@ -189,33 +1181,542 @@ class LLMClient:
     ) -> str:
         """Chat-style generation"""
         
+        if self.provider == "ollama" and not self._check_ollama_health():
+            return "Error: Ollama not running"
+        
+        if self.provider in ("ollama", "openai"):
+            chat_fn = self._ollama_chat if self.provider == "ollama" else self._openai_chat
+            started = time.perf_counter()
+            with self._usage_scope() as usage:
+                content = self.coalescer.do(
+                    self._chat_key(messages, temperature, max_tokens),
+                    lambda: chat_fn(messages, temperature, max_tokens)
+                )
+            if not content.startswith("Error:"):
+                self._record_call(
+                    "chat", started, time.perf_counter(), len(content), streamed=False,
+                    tokens=self._call_tokens(usage, self._messages_to_prompt(messages), content)
+                )
+            return content
+        
+        else:
+            # For Google, convert to simple generate
+            prompt = self._messages_to_prompt(messages)
+            return self.generate(prompt, temperature, max_tokens)
+    
+    def _chat_key(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Key identifying identical chat requests"""
+        return "chat:" + self._cache_key(json.dumps(messages, sort_keys=True), temperature, max_tokens, None)
+    
+    def _ollama_chat(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Chat using Ollama /api/chat"""
+        self._throttle(self._messages_to_prompt(messages), None, max_tokens)
+        try:
+            url = f"{self.base_url}/api/chat"
+            payload = self._ollama_chat_payload(messages, temperature, max_tokens, stream=False)
+            
+            response = self._post(url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            self.health.mark(True)
+            
+            data = response.json()
+            self._note_timings(data)
+            return data.get("message", {}).get("content", "")
+        
+        except requests.exceptions.ConnectionError as e:
+            self.health.mark(False)
+            logger.error(f"Ollama chat error: {e}")
+            return f"Error: {str(e)}"
+        
+        except Exception as e:
+            logger.error(f"Ollama chat error: {e}")
+            return f"Error: {str(e)}"
+    
+    def _openai_chat(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Chat using an OpenAI-compatible /chat/completions endpoint"""
+        self._throttle(self._messages_to_prompt(messages), None, max_tokens)
+        return self._openai_complete(messages, temperature, max_tokens)
+    
+    def chat_stream(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> Iterator[str]:
+        """Chat-style generation, yielding chunks as they arrive"""
+        
         if self.provider == "ollama":
-            if not self._check_ollama_health():
-                return "Error: Ollama not running"
+            self._throttle(self._messages_to_prompt(messages), None, max_tokens)
+            stream = self._ollama_stream(
+                f"{self.base_url}/api/chat",
+                self._ollama_chat_payload(messages, temperature, max_tokens, stream=True)
+            )
+            return self._track_stream("chat_stream", stream, prompt=self._messages_to_prompt(messages))
+        
+        if self.provider == "openai":
+            self._throttle(self._messages_to_prompt(messages), None, max_tokens)
+            stream = self._openai_stream(messages, temperature, max_tokens)
+            return self._track_stream("chat_stream", stream, prompt=self._messages_to_prompt(messages))
+        
+        # For Google, convert to simple generate
+        prompt = self._messages_to_prompt(messages)
+        return self.generate_stream(prompt, temperature, max_tokens)
+    
+    # ------------------------------------------------------------------
+    # Async API
+    # ------------------------------------------------------------------
+    
+    @property
+    def async_transport(self) -> AsyncTransport:
+        """Shared aiohttp pool (requires aiohttp)"""
+        if self._async_transport is None:
+            self._async_transport = AsyncTransport.from_env()
+        return self._async_transport
+    
+    @property
+    def _provider_key(self) -> str:
+        """Provider name used for concurrency limits"""
+        return "google" if self.provider == "gemini" else self.provider
+    
+    async def _apost_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """POST JSON through the shared async pool, bounded per provider
+
+        429/5xx responses are retried with backoff; the provider slot is
+        released while waiting.
+        """
+        transport = self.async_transport
+        session = await transport.session()
+        attempt = 0
+        while True:
+            async with transport.slot(self._provider_key):
+                async with session.post(
+                    url,
+                    json=payload,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    if not self.retry_policy.should_retry(response.status, attempt):
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+                    delay = self.retry_policy.delay(attempt, response.headers.get("Retry-After"))
+                    status = response.status
             
-            try:
-                url = f"{self.base_url}/api/chat"
-                
-                payload = {
-                    "model": self.model,
-                    "messages": messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
-                }
-                
-                response = requests.post(url, json=payload, timeout=self.timeout)
-                response.raise_for_status()
-                
-                return response.json().get("message", {}).get("content", "")
-                
-            except Exception as e:
-                logger.error(f"Ollama chat error: {e}")
-                return f"Error: {str(e)}"
+            attempt += 1
+            logger.warning(
+                f"{self.provider} returned {status}, retrying in {delay:.1f}s "
+                f"({attempt}/{self.retry_policy.max_retries})"
+            )
+            await asyncio.sleep(delay)
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1024,
+        system: Optional[str] = None,
+        use_cache: bool = True,
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None,
+        stop: Optional[List[str]] = None,
+        stop_when: Optional[List[StopCondition]] = None
+    ) -> str:
+        """Async counterpart of generate()"""
+        self.async_transport  # raises ImportError early when aiohttp is missing
+        if stop or stop_when:
+            return await self._agenerate_until(
+                prompt, temperature, max_tokens, system, use_cache, prefix, schema, stop, stop_when
+            )
+        
+        started = time.perf_counter()
+        
+        with self._usage_scope() as usage:
+            if use_cache:
+                key = self._cache_key(self._keyed_prompt(prompt, prefix, schema), temperature, max_tokens, system)
+                result, cached = await self.coalescer.ado(
+                    key, lambda: self._agenerate_cached(key, prompt, temperature, max_tokens, system, prefix, schema)
+                )
+            else:
+                result, cached = await self._agenerate(prompt, temperature, max_tokens, system, prefix, schema), False
+        
+        self._record_call(
+            "agenerate", started, time.perf_counter(), len(result), streamed=False, cached=cached,
+            tokens=self._call_tokens(usage, (system or "") + (prefix or "") + prompt, result)
+        )
+        return result
+    
+    async def _agenerate_until(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        use_cache: bool,
+        prefix: Optional[str],
+        schema: Optional[Dict[str, Any]],
+        stop: Optional[List[str]],
+        stop_when: Optional[List[StopCondition]]
+    ) -> str:
+        """Async counterpart of _generate_until()"""
+        async def run() -> str:
+            stopper = EarlyStopper(stop, stop_when)
+            result = await stopper.arun(await self._astream(prompt, temperature, max_tokens, system, prefix, schema))
+            self._note_early_stop(stopper)
+            return result
+        
+        started = time.perf_counter()
+        
+        with self._usage_scope() as usage:
+            if use_cache:
+                keyed = self._keyed_prompt(prompt, prefix, schema) + EarlyStopper.describe(stop, stop_when)
+                key = self._cache_key(keyed, temperature, max_tokens, system)
+                result, cached = await self.coalescer.ado(key, lambda: self._astopped_cached(key, run))
+            else:
+                result, cached = await run(), False
+        
+        self._record_call(
+            "agenerate", started, time.perf_counter(), len(result), streamed=not cached, cached=cached,
+            tokens=self._call_tokens(usage, (system or "") + (prefix or "") + prompt, result)
+        )
+        return result
+    
+    async def _astopped_cached(self, key: str, run: Callable[[], Any]) -> Tuple[str, bool]:
+        """Async counterpart of _stopped_cached()"""
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached, True
+        
+        result = await run()
+        self._cache_store(key, result)
+        return result, False
+    
+    async def _astream(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        prefix: Optional[str],
+        schema: Optional[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """Chunk stream for an async early stop, inside the provider's connection limit
+
+        Ollama streams over the shared aiohttp pool, so closing the stream
+        cancels generation; other providers answer in a single chunk.
+        """
+        if self.provider != "ollama":
+            return self._achunks(self._agenerate(prompt, temperature, max_tokens, system, prefix, schema))
+        
+        context = await self._aprefix_context(prefix, system) if self._reuses_context(prefix) else None
+        if context is not None:
+            system = None
+        elif prefix:
+            prompt = f"{prefix}{prompt}"
+        await self._athrottle(prompt, system, max_tokens)
+        
+        payload = self._ollama_payload(prompt, temperature, max_tokens, system, stream=True)
+        if context:
+            self._with_context(payload, context)
+        if schema:
+            payload["format"] = schema
+        return self._ollama_astream(payload)
+    
+    @staticmethod
+    async def _achunks(answer) -> AsyncIterator[str]:
+        yield await answer
+    
+    async def _agenerate_cached(
+        self,
+        key: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, bool]:
+        """Async counterpart of _generate_cached()"""
+        cached = self._cache_lookup(key)
+        if cached is not None:
+            return cached, True
         
+        result = await self._agenerate(prompt, temperature, max_tokens, system, prefix, schema)
+        self._cache_store(key, result)
+        return result, False
+    
+    async def _agenerate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        prefix: Optional[str] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Dispatch an async generation to the configured provider"""
+        if self._reuses_context(prefix):
+            context = await self._aprefix_context(prefix, system)
+            if context is not None:
+                await self._athrottle(prompt, None, max_tokens)
+                return await self._ollama_agenerate(prompt, temperature, max_tokens, None, context=context, schema=schema)
+        
+        prompt = f"{prefix}{prompt}" if prefix else prompt
+        await self._athrottle(prompt, system, max_tokens)
+        
+        if self.provider == "ollama":
+            return await self._ollama_agenerate(prompt, temperature, max_tokens, system, schema=schema)
+        elif self.provider == "google" or self.provider == "gemini":
+            return await self._google_agenerate(prompt, temperature, max_tokens, system, schema=schema)
+        elif self.provider == "openai":
+            return await self._openai_acomplete(
+                self._openai_messages(prompt, system), temperature, max_tokens, schema=schema
+            )
         else:
-            # For Google/OpenAI, convert to simple generate
-            prompt = "\n".join([f"{m['role']}: {m['content']}" for m in messages])
-            return self.generate(prompt, temperature, max_tokens)
\ No newline at end of file
+            raise ValueError(f"Unsupported provider: {self.provider}")
+    
+    async def _ollama_apost(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to Ollama, updating shared health state"""
+        try:
+            data = await self._apost_json(f"{self.base_url}{path}", payload, self.timeout)
+            self.health.mark(True)
+            return data
+        except aiohttp.ClientConnectionError:
+            self.health.mark(False)
+            raise
+    
+    async def _ollama_astream(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async counterpart of _ollama_stream(), holding an Ollama slot until closed"""
+        if self.health.known_down():
+            error_msg = "❌ Ollama server not responding. Please start Ollama."
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+            return
+        
+        transport = self.async_transport
+        try:
+            session = await transport.session()
+            async with transport.slot(self._provider_key):
+                async with session.post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout)
+                ) as response:
+                    response.raise_for_status()
+                    self.health.mark(True)
+                    
+                    async for line in response.content:
+                        if not line.strip():
+                            continue
+                        data = json.loads(line)
+                        if "error" in data:
+                            yield f"Error: {data['error']}"
+                            return
+                        
+                        chunk = data.get("response", "")
+                        if chunk:
+                            yield chunk
+                        if data.get("done"):
+                            self._note_timings(data)
+                            break
+        
+        except asyncio.TimeoutError:
+            error_msg = f"⏱️ Request timed out after {self.timeout}s"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except aiohttp.ClientConnectionError:
+            self.health.mark(False)
+            error_msg = "❌ Cannot connect to Ollama"
+            logger.error(error_msg)
+            yield f"Error: {error_msg}"
+        
+        except Exception as e:
+            logger.error(f"Ollama async streaming error: {e}")
+            yield f"Error: {str(e)}"
+    
+    async def _ollama_agenerate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        context: Optional[List[int]] = None,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Async generate using Ollama"""
+        
+        # Async calls never block on a probe; they trust recent health state
+        if self.health.known_down():
+            error_msg = "❌ Ollama server not responding. Please start Ollama."
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+        
+        try:
+            payload = self._ollama_payload(prompt, temperature, max_tokens, system, stream=False)
+            if context:
+                self._with_context(payload, context)
+            if schema:
+                payload["format"] = schema
+            data = await self._ollama_apost("/api/generate", payload)
+            self._note_timings(data)
+            return data.get("response", "")
+            
+        except asyncio.TimeoutError:
+            error_msg = f"⏱️ Request timed out after {self.timeout}s"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except aiohttp.ClientConnectionError:
+            error_msg = "❌ Cannot connect to Ollama"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except Exception as e:
+            logger.error(f"Ollama async generation error: {e}")
+            return f"Error: {str(e)}"
+    
+    async def _google_agenerate(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        system: Optional[str],
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Async generate using Google AI Studio (Gemini)"""
+        
+        if not self.google_api_key:
+            error_msg = "❌ GOOGLE_API_KEY not set in .env file"
+            logger.error(error_msg)
+            return f"Error: {error_msg}\n\nGet your FREE key at: https://makersuite.google.com/app/apikey"
+        
+        try:
+            model = self._google_model()
+            url = f"{self.google_base_url}/models/{model}:generateContent?key={self.google_api_key}"
+            payload = self._google_payload(prompt, temperature, max_tokens, system, schema)
+            
+            data = await self._apost_json(url, payload, 60)
+            self._note_google_usage(data)
+            text = self._google_text(data)
+            return text if text is not None else "Error: No response generated"
+            
+        except asyncio.TimeoutError:
+            error_msg = "⏱️ Google API timeout"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except aiohttp.ClientResponseError as e:
+            error_msg = self._google_http_error(e.status)
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except Exception as e:
+            logger.error(f"Google async generation error: {e}")
+            return f"Error: {str(e)}"
+    
+    async def achat(
+        self,
+        messages: list,
+        temperature: float = 0.7,
+        max_tokens: int = 1024
+    ) -> str:
+        """Async counterpart of chat()"""
+        self.async_transport  # raises ImportError early when aiohttp is missing
+        
+        if self.provider == "ollama" and self.health.known_down():
+            return "Error: Ollama not running"
+        
+        if self.provider in ("ollama", "openai"):
+            chat_fn = self._ollama_achat if self.provider == "ollama" else self._openai_achat
+            started = time.perf_counter()
+            with self._usage_scope() as usage:
+                content = await self.coalescer.ado(
+                    self._chat_key(messages, temperature, max_tokens),
+                    lambda: chat_fn(messages, temperature, max_tokens)
+                )
+            if not content.startswith("Error:"):
+                self._record_call(
+                    "achat", started, time.perf_counter(), len(content), streamed=False,
+                    tokens=self._call_tokens(usage, self._messages_to_prompt(messages), content)
+                )
+            return content
+        
+        # For Google, convert to simple generate
+        prompt = self._messages_to_prompt(messages)
+        return await self.agenerate(prompt, temperature, max_tokens)
+    
+    async def _ollama_achat(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Async chat using Ollama /api/chat"""
+        await self._athrottle(self._messages_to_prompt(messages), None, max_tokens)
+        try:
+            payload = self._ollama_chat_payload(messages, temperature, max_tokens, stream=False)
+            data = await self._ollama_apost("/api/chat", payload)
+            self._note_timings(data)
+            return data.get("message", {}).get("content", "")
+            
+        except Exception as e:
+            logger.error(f"Ollama async chat error: {e}")
+            return f"Error: {str(e)}"
+    
+    async def _openai_achat(self, messages: list, temperature: float, max_tokens: int) -> str:
+        """Async chat using an OpenAI-compatible endpoint"""
+        await self._athrottle(self._messages_to_prompt(messages), None, max_tokens)
+        return await self._openai_acomplete(messages, temperature, max_tokens)
+    
+    async def _openai_acomplete(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Async POST /chat/completions"""
+        try:
+            url = f"{self.openai_base_url}/chat/completions"
+            payload = self._openai_payload(messages, temperature, max_tokens, stream=False, schema=schema)
+            data = await self._apost_json(url, payload, self.timeout, headers=self._openai_headers())
+            self._note_openai_usage(data)
+            
+            choices = data.get("choices") or []
+            if not choices:
+                return "Error: No response generated"
+            return choices[0].get("message", {}).get("content") or ""
+            
+        except asyncio.TimeoutError:
+            error_msg = f"⏱️ OpenAI request timed out after {self.timeout}s"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except aiohttp.ClientResponseError as e:
+            error_msg = self._openai_http_error(e.status)
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except aiohttp.ClientConnectionError:
+            error_msg = f"❌ Cannot connect to {self.openai_base_url}"
+            logger.error(error_msg)
+            return f"Error: {error_msg}"
+            
+        except Exception as e:
+            logger.error(f"OpenAI async generation error: {e}")
+            return f"Error: {str(e)}"
+    
+    async def agenerate_batch(
+        self,
+        items: List[BatchItem],
+        max_concurrency: Optional[int] = None,
+        **kwargs
+    ) -> List[str]:
+        """Async generate for many prompts; results keep input order"""
+        return await arun_batch(self.agenerate, items, max_concurrency=max_concurrency, **kwargs)
+    
+    def get_async_stats(self) -> Dict[str, Any]:
+        """Return async concurrency statistics"""
+        if self._async_transport is None:
+            return {}
+        return self._async_transport.get_stats()
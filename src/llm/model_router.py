@@ -1,16 +1,45 @@
+import os
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List
 from .llm_client import LLMClient
+from .transport import HTTPTransport
+from .async_transport import AsyncTransport
+from .cache import ResponseCache
+from .coalescing import SingleFlight
+from .retry import RetryPolicy
+from .rate_limiter import RateLimiter
+from .circuit_breaker import CircuitBreaker
+from .failover import FailoverClient
+from .warmup import KeepWarmPinger
+from .context_store import ContextStore
+from .tokens import ContextWindows
 from ..utils.logger import logger
 
 class ModelRouter:
     """Route tasks to appropriate models"""
     
-    def __init__(self, config_path: str = "config/model_config.yaml"):
+    def __init__(
+        self,
+        config_path: str = "config/model_config.yaml",
+        settings_path: str = "config/settings.yaml"
+    ):
         self.config = self._load_config(config_path)
-        self.clients: Dict[str, LLMClient] = {}
+        self.settings_path = settings_path
+        self.clients: Dict[str, FailoverClient] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.transport = self._create_transport()
+        self.async_transport = self._create_async_transport()
+        self.cache = self._create_cache()
+        self.coalescer = SingleFlight()
+        self.retry_policy = self._create_retry_policy()
+        self.rate_limiter = RateLimiter(self.config.get('rate_limits') or {})
+        self.context_store = self._create_context_store()
+        self.context_windows = ContextWindows(self.config.get('context_windows') or {})
         self._initialize_clients()
+        self.preloaded: Dict[str, Dict[str, Any]] = {}
+        self.keep_warm = self._start_warmup()
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load model configuration with fallback"""
@@ -42,47 +71,270 @@ class ModelRouter:
                     }
                 }
             },
+            'transport': {
+                'pool_size': 10,
+                'keep_alive': True,
+                'health_ttl': 30,
+                'async_pool_size': 100,
+                'provider_concurrency': {
+                    'ollama': 4,
+                    'google': 16,
+                    'openai': 16
+                }
+            },
+            'cache': {
+                'enabled': True,
+                'memory': {
+                    'max_entries': 256,
+                    'ttl': 3600
+                },
+                'disk': {
+                    'enabled': True,
+                    'path': 'data/cache/llm_responses.db',
+                    'ttl': 604800,
+                    'max_size_mb': 100
+                },
+                'semantic': {
+                    'enabled': True,
+                    'embedding_model': 'all-MiniLM-L6-v2',
+                    'max_entries': 1000
+                }
+            },
+            'retry': {
+                'base_delay': 1.0,
+                'max_delay': 30.0,
+                'retry_on': [429, 500, 502, 503, 504]
+            },
+            'rate_limits': {
+                'google': {
+                    'requests_per_minute': 15,
+                    'tokens_per_minute': 1000000
+                }
+            },
+            'circuit_breaker': {
+                'failure_threshold': 3,
+                'recovery_timeout': 30,
+                'latency_slo': 120,
+                'slo_breach_threshold': 3
+            },
+            'context_reuse': {
+                'enabled': True,
+                'max_entries': 32,
+                'ttl': 1800
+            },
+            'context_windows': {
+                'default': 4096,
+                'deepseek-r1:1.5b': 4096,
+                'phi3:3.8b': 4096,
+                'gemini-pro': 30720,
+                'gpt-4': 8192
+            },
+            'warmup': {
+                'preload_on_startup': False,
+                'keep_alive': '30m',
+                'keep_warm': {
+                    'enabled': False,
+                    'interval': 240,
+                    'business_hours': {'start': 9, 'end': 18, 'days': [0, 1, 2, 3, 4]}
+                }
+            },
             'routing': {
                 'reasoning_tasks': {
                     'tasks': ['resume_screening', 'doc_verification', 'analytics'],
-                    'model': 'deepseek-r1:1.5b'
+                    'model': 'deepseek-r1:1.5b',
+                    'providers': ['ollama', 'google', 'rule_based']
                 },
                 'chat_tasks': {
                     'tasks': ['hr_assistant', 'interview', 'onboarding'],
-                    'model': 'phi3:3.8b'
+                    'model': 'phi3:3.8b',
+                    'providers': ['ollama', 'google', 'rule_based']
                 }
             }
         }
     
-    def _initialize_clients(self):
-        """Initialize LLM clients for different tasks"""
+    def _create_transport(self) -> HTTPTransport:
+        """Create the pooled HTTP transport shared by all clients"""
+        transport_config = self.config.get('transport', {})
+        transport = HTTPTransport(
+            pool_size=int(transport_config.get('pool_size', 10)),
+            keep_alive=bool(transport_config.get('keep_alive', True))
+        )
+        logger.info(
+            f"HTTP transport ready (pool_size={transport.pool_size}, "
+            f"keep_alive={transport.keep_alive})"
+        )
+        return transport
+    
+    def _create_async_transport(self) -> Optional[AsyncTransport]:
+        """Create the shared async pool, if aiohttp is installed"""
+        transport_config = self.config.get('transport', {})
         try:
-            provider = self.config.get('models', {}).get('ollama', {})
-            models = provider.get('models', {})
-            
-            # Reasoning model
-            reasoning_model = models.get('reasoning', 'deepseek-r1:1.5b')
-            self.clients['reasoning'] = LLMClient(
-                provider='ollama',
-                model=reasoning_model
+            return AsyncTransport(
+                pool_size=int(transport_config.get('async_pool_size', 100)),
+                provider_limits=transport_config.get('provider_concurrency', {})
             )
-            logger.info(f"Initialized reasoning client with model: {reasoning_model}")
-            
-            # Chat model
-            chat_model = models.get('chat', 'phi3:3.8b')
-            self.clients['chat'] = LLMClient(
-                provider='ollama',
-                model=chat_model
+        except ImportError:
+            logger.info("aiohttp not installed, async LLM calls disabled")
+            return None
+    
+    def _create_cache(self) -> Optional[ResponseCache]:
+        """Create the response cache shared by all clients"""
+        cache_config = self.config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            logger.info("LLM response cache disabled")
+            return None
+        try:
+            cache = ResponseCache.from_config(cache_config)
+            logger.info(
+                f"LLM response cache ready (memory={cache.memory.max_entries}, "
+                f"disk={cache.disk.path if cache.disk else 'off'})"
             )
-            logger.info(f"Initialized chat client with model: {chat_model}")
-            
+            return cache
+        except Exception as e:
+            logger.error(f"Error creating response cache: {e}")
+            return None
+    
+    def _create_retry_policy(self) -> RetryPolicy:
+        """Create the retry policy; max_retries defaults to settings.yaml"""
+        default_max_retries = 3
+        try:
+            with open(self.settings_path, 'r') as f:
+                settings = yaml.safe_load(f) or {}
+            default_max_retries = int(settings.get('system', {}).get('max_retries', 3))
+        except FileNotFoundError:
+            logger.debug(f"Settings file not found: {self.settings_path}")
         except Exception as e:
-            logger.error(f"Error initializing clients: {e}")
-            # Fallback to default models
-            self.clients['reasoning'] = LLMClient(provider='ollama', model='deepseek-r1:1.5b')
-            self.clients['chat'] = LLMClient(provider='ollama', model='phi3:3.8b')
+            logger.warning(f"Error reading max_retries from settings: {e}")
+        
+        return RetryPolicy.from_config(self.config.get('retry') or {}, default_max_retries)
+    
+    def _create_context_store(self) -> Optional[ContextStore]:
+        """Create the Ollama prefix context store shared by all clients"""
+        context_config = self.config.get('context_reuse') or {}
+        if not context_config.get('enabled', False):
+            return None
+        return ContextStore.from_config(context_config)
     
-    def get_client(self, task_type: str) -> LLMClient:
+    def _client_options(self) -> Dict[str, Any]:
+        """Shared keyword arguments for LLMClient construction"""
+        transport_config = self.config.get('transport', {})
+        return {
+            'transport': self.transport,
+            'health_ttl': float(transport_config.get('health_ttl', 30)),
+            'async_transport': self.async_transport,
+            'cache': self.cache,
+            'coalescer': self.coalescer,
+            'retry_policy': self.retry_policy,
+            'rate_limiter': self.rate_limiter,
+            'keep_alive': (self.config.get('warmup') or {}).get('keep_alive'),
+            'context_store': self.context_store
+        }
+    
+    def _initialize_clients(self):
+        """Initialize provider failover chains for different tasks"""
+        routing = self.config.get('routing', {})
+        defaults = {'reasoning': 'deepseek-r1:1.5b', 'chat': 'phi3:3.8b'}
+        
+        for role, routing_key in (('reasoning', 'reasoning_tasks'), ('chat', 'chat_tasks')):
+            try:
+                self.clients[role] = self._build_chain(role, routing.get(routing_key, {}))
+            except Exception as e:
+                logger.error(f"Error initializing {role} clients: {e}")
+                # Fallback to default local model
+                client = LLMClient(
+                    provider='ollama',
+                    model=defaults[role],
+                    context_window=self.context_windows.for_model(defaults[role]),
+                    **self._client_options()
+                )
+                self.clients[role] = FailoverClient([(client, self._breaker('ollama', defaults[role]))])
+    
+    def _provider_order(self, routing_config: Dict[str, Any]) -> List[str]:
+        """Configured provider chain, with MODEL_SOURCE (if set) tried first"""
+        providers = list(routing_config.get('providers') or ['ollama', 'rule_based'])
+        preferred = os.getenv("MODEL_SOURCE", "").lower()
+        if preferred and preferred in providers and preferred != 'rule_based':
+            providers.remove(preferred)
+            providers.insert(0, preferred)
+        return providers
+    
+    def _model_for(self, provider: str, role: str, routing_config: Dict[str, Any]) -> str:
+        """Model name to use for a provider in a routing group"""
+        models = self.config.get('models', {})
+        if provider == 'ollama':
+            ollama_models = models.get('ollama', {}).get('models', {})
+            return ollama_models.get(role) or routing_config.get('model', 'phi3:3.8b')
+        return models.get(provider, {}).get('default_model', '')
+    
+    def _breaker(self, provider: str, model: str) -> CircuitBreaker:
+        """Circuit breaker shared by every chain using this provider/model"""
+        name = f"{provider}:{model}"
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker.from_config(name, self.config.get('circuit_breaker') or {})
+        return self.breakers[name]
+    
+    def _build_chain(self, role: str, routing_config: Dict[str, Any]) -> FailoverClient:
+        """Build the ordered provider chain for a routing group"""
+        chain = []
+        for provider in self._provider_order(routing_config):
+            if provider == 'rule_based':
+                # Terminal: agents answer from their rule-based fallbacks
+                break
+            
+            provider_config = self.config.get('models', {}).get(provider, {})
+            key_env = provider_config.get('api_key_env')
+            base_url_env = provider_config.get('base_url_env')
+            # A self-hosted endpoint (e.g. vLLM behind OPENAI_BASE_URL) needs no key
+            if key_env and not os.getenv(key_env) and not (base_url_env and os.getenv(base_url_env)):
+                logger.info(f"Skipping {provider} for {role} tasks: {key_env} not set")
+                continue
+            
+            model = self._model_for(provider, role, routing_config)
+            client = LLMClient(
+                provider=provider,
+                model=model,
+                context_window=self.context_windows.for_model(model),
+                **self._client_options()
+            )
+            chain.append((client, self._breaker(provider, model)))
+        
+        if not chain:
+            raise ValueError(f"No usable LLM provider configured for {role} tasks")
+        
+        logger.info(f"Initialized {role} chain: {' -> '.join(b.name for _, b in chain)}")
+        return FailoverClient(chain)
+    
+    def _start_warmup(self) -> Optional[KeepWarmPinger]:
+        """Preload models and start the keep-warm pinger, as configured"""
+        warmup_config = self.config.get('warmup') or {}
+        
+        if warmup_config.get('preload_on_startup', False):
+            # Loading takes seconds per model; don't hold up startup
+            threading.Thread(target=self.preload_models, name="llm-preload", daemon=True).start()
+        
+        keep_warm_config = warmup_config.get('keep_warm') or {}
+        if not keep_warm_config.get('enabled', False):
+            return None
+        pinger = KeepWarmPinger.from_config(self.preload_models, keep_warm_config)
+        pinger.start()
+        return pinger
+    
+    def _ollama_clients(self) -> List[LLMClient]:
+        """One Ollama client per distinct model across all chains"""
+        clients = {}
+        for failover in self.clients.values():
+            for client, _ in failover.chain:
+                if client.provider == 'ollama':
+                    clients.setdefault(client.model, client)
+        return list(clients.values())
+    
+    def preload_models(self) -> Dict[str, Dict[str, Any]]:
+        """Load every configured Ollama model so the first request is warm"""
+        for client in self._ollama_clients():
+            self.preloaded[client.model] = client.preload()
+        return dict(self.preloaded)
+    
+    def get_client(self, task_type: str) -> FailoverClient:
         """Get appropriate LLM client for task"""
         try:
             routing = self.config.get('routing', {})
@@ -100,4 +352,45 @@ class ModelRouter:
         except Exception as e:
             logger.error(f"Error routing task {task_type}: {e}")
             # Default fallback
-            return self.clients.get('chat', self.clients.get('reasoning'))
\ No newline at end of file
+            return self.clients.get('chat', self.clients.get('reasoning'))
+    
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """Return shared connection pool statistics"""
+        return self.transport.get_stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Return response cache statistics"""
+        return self.cache.get_stats() if self.cache is not None else {}
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Return in-flight request coalescing statistics"""
+        return self.coalescer.get_stats()
+    
+    def get_context_stats(self) -> Dict[str, Any]:
+        """Return prefix context reuse statistics"""
+        return self.context_store.get_stats() if self.context_store is not None else {}
+    
+    def get_token_stats(self) -> Dict[str, Any]:
+        """Return prompt/completion token totals per provider/model"""
+        stats = {}
+        for chain in self.clients.values():
+            for client, breaker in chain.chain:
+                stats[breaker.name] = client.get_token_stats()
+        return stats
+    
+    def get_warmup_stats(self) -> Dict[str, Any]:
+        """Return preload results, cold start timings and keep-warm status"""
+        return {
+            'preloaded': dict(self.preloaded),
+            'models': {c.model: c.get_load_stats() for c in self._ollama_clients()},
+            'keep_warm': self.keep_warm.get_stats() if self.keep_warm else None
+        }
+    
+    def get_resilience_stats(self) -> Dict[str, Any]:
+        """Return retry, rate limit and circuit breaker statistics"""
+        return {
+            'retry': self.retry_policy.get_stats(),
+            'rate_limits': self.rate_limiter.get_stats(),
+            'circuits': {name: b.get_status() for name, b in self.breakers.items()},
+            'failovers': sum(c.failovers for c in self.clients.values())
+        }
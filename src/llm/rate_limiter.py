@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple
+from ..utils.logger import logger
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate"""
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+    
+    def reserve(self, amount: float, now: float) -> float:
+        """Take tokens (possibly going into debt) and return the wait needed
+
+        Callers must hold the owning limiter's lock.
+        """
+        elapsed = max(now - self._updated, 0.0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = max(now, self._updated)
+        self._tokens -= min(amount, self.capacity)
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class RateLimiter:
+    """Client-side requests/min and tokens/min limits per provider or model
+
+    Limits are looked up as "provider/model" first, then "provider".
+    `burst` caps how many requests may go out back to back (default: the
+    full per-minute allowance).
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.limits = limits or {}
+        self._buckets: Dict[str, List[Tuple[str, TokenBucket]]] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def _resolve(self, provider: str, model: str) -> Optional[str]:
+        for key in (f"{provider}/{model}", provider):
+            if key in self.limits:
+                return key
+        return None
+    
+    def _reserve(self, provider: str, model: str, tokens: int) -> float:
+        key = self._resolve(provider, model)
+        if key is None:
+            return 0.0
+        
+        with self._lock:
+            buckets = self._buckets.get(key)
+            if buckets is None:
+                config = self.limits[key]
+                buckets = []
+                if config.get("requests_per_minute"):
+                    buckets.append(("requests", TokenBucket(
+                        float(config["requests_per_minute"]),
+                        capacity=config.get("burst")
+                    )))
+                if config.get("tokens_per_minute"):
+                    buckets.append(("tokens", TokenBucket(float(config["tokens_per_minute"]))))
+                self._buckets[key] = buckets
+            
+            now = time.monotonic()
+            wait = 0.0
+            for kind, bucket in buckets:
+                wait = max(wait, bucket.reserve(1 if kind == "requests" else tokens, now))
+            
+            stats = self._stats.setdefault(key, {"requests": 0, "throttled": 0, "wait_seconds": 0.0})
+            stats["requests"] += 1
+            if wait > 0:
+                stats["throttled"] += 1
+                stats["wait_seconds"] += wait
+        
+        if wait > 0:
+            logger.info(f"Rate limit for {key}: waiting {wait:.2f}s")
+        return wait
+    
+    def acquire(self, provider: str, model: str, tokens: int = 0) -> float:
+        """Block until the request fits the limits; returns seconds waited"""
+        wait = self._reserve(provider, model, tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def aacquire(self, provider: str, model: str, tokens: int = 0) -> float:
+        """Async counterpart of acquire()"""
+        wait = self._reserve(provider, model, tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-limit request, throttle and wait counters"""
+        with self._lock:
+            return {
+                key: {**stats, "wait_seconds": round(stats["wait_seconds"], 3)}
+                for key, stats in self._stats.items()
+            }
@@ -0,0 +1,78 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Iterable
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for rate-limited / overloaded servers"""
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        retry_on: Optional[Iterable[int]] = None
+    ):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = set(retry_on or self.RETRY_STATUSES)
+        
+        self._lock = threading.Lock()
+        self._stats = {"retries": 0, "exhausted": 0, "retry_after_honoured": 0}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], default_max_retries: int = 3) -> "RetryPolicy":
+        """Build policy from the `retry:` section of model_config.yaml"""
+        return cls(
+            max_retries=int(config.get("max_retries", default_max_retries)),
+            base_delay=float(config.get("base_delay", 1.0)),
+            max_delay=float(config.get("max_delay", 30.0)),
+            retry_on=config.get("retry_on")
+        )
+    
+    def should_retry(self, status: int, attempt: int) -> bool:
+        """True if a response with this status should be retried"""
+        if status not in self.retry_on:
+            return False
+        with self._lock:
+            if attempt >= self.max_retries:
+                self._stats["exhausted"] += 1
+                return False
+            self._stats["retries"] += 1
+        return True
+    
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        server_delay = self.parse_retry_after(retry_after)
+        if server_delay is not None:
+            with self._lock:
+                self._stats["retry_after_honoured"] += 1
+            return min(server_delay, self.max_delay)
+        
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling)
+    
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header (delta-seconds or HTTP date)"""
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+        except (TypeError, ValueError):
+            return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["max_retries"] = self.max_retries
+        return stats
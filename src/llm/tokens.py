@@ -0,0 +1,137 @@
+import re
+import threading
+from typing import Dict, Any, List, Optional, NamedTuple
+from ..utils.logger import logger
+
+# Words, numbers and single punctuation marks are the units BPE tokenizers
+# split on; common words are one token, longer ones split every ~5 characters
+_PIECES = re.compile(r"\w+|[^\w\s]")
+_BLANK_RUNS = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+TRUNCATION_MARKER = "\n[...]"
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Fast token estimate for BPE tokenizers (llama, phi, GPT) without loading one"""
+    if not text:
+        return 0
+    return sum(1 + max(len(piece) - 3, 0) // 5 for piece in _PIECES.findall(text))
+
+
+class Section(NamedTuple):
+    """A named prompt part; lower priority is trimmed first, never below min_tokens"""
+    name: str
+    text: str
+    priority: int = 1
+    min_tokens: int = 64
+
+
+class ContextWindows:
+    """Per-model context window sizes from the `context_windows:` section of model_config.yaml"""
+    
+    def __init__(self, windows: Optional[Dict[str, int]] = None, default: int = 4096):
+        self.windows = dict(windows or {})
+        self.default = int(self.windows.pop("default", default))
+    
+    def for_model(self, model: str) -> int:
+        if model in self.windows:
+            return int(self.windows[model])
+        # "phi3:3.8b-mini-q4" falls back to "phi3:3.8b", then "phi3"
+        for name, window in self.windows.items():
+            if model.startswith(name) or model.split(":")[0] == name:
+                return int(window)
+        return self.default
+
+
+def condense(text: str) -> str:
+    """Whitespace-only cleanup: collapse runs of blanks, blank lines and repeated lines"""
+    lines = []
+    previous = None
+    for line in _BLANK_RUNS.sub(" ", text).splitlines():
+        line = line.strip()
+        if line and line == previous:
+            continue
+        lines.append(line)
+        previous = line
+    return _BLANK_LINES.sub("\n", "\n".join(lines)).strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep whole lines from the top while they fit; the tail is cut"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            # Partially keep a long first line rather than nothing
+            if not kept:
+                words = line.split()
+                while words and estimate_tokens(" ".join(words)) > budget:
+                    words = words[:len(words) * 3 // 4]
+                kept.append(" ".join(words))
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept) + TRUNCATION_MARKER
+
+
+def fit_sections(sections: List[Section], budget: int) -> Dict[str, str]:
+    """Shrink sections until their total estimate fits the token budget
+
+    Every section is condensed first; if that is not enough, sections
+    are truncated lowest priority first, each down to its min_tokens.
+    """
+    texts = {s.name: s.text for s in sections}
+    if sum(estimate_tokens(t) for t in texts.values()) <= budget:
+        return texts
+    
+    texts = {name: condense(text) for name, text in texts.items()}
+    sizes = {name: estimate_tokens(text) for name, text in texts.items()}
+    over = sum(sizes.values()) - budget
+    
+    for section in sorted(sections, key=lambda s: s.priority):
+        if over <= 0:
+            break
+        size = sizes[section.name]
+        target = max(size - over, min(section.min_tokens, size))
+        if target < size:
+            texts[section.name] = truncate_to_tokens(texts[section.name], target)
+            over -= size - estimate_tokens(texts[section.name])
+    
+    if over > 0:
+        logger.warning(f"Prompt still ~{over} tokens over budget after trimming")
+    return texts
+
+
+class TokenUsage:
+    """Per-client running totals of prompt and completion tokens"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.estimated_calls = 0
+    
+    def add(self, prompt_tokens: int, completion_tokens: int, estimated: bool):
+        # Batch screening threads and async tasks share one client
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            if estimated:
+                self.estimated_calls += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "estimated_calls": self.estimated_calls
+            }
\ No newline at end of file
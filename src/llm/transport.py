@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from typing import Optional, Dict, Any, Callable
+import requests
+from requests.adapters import HTTPAdapter
+from ..utils.logger import logger
+
+
+class HealthMonitor:
+    """Cached server health state with background refresh"""
+    
+    def __init__(self, probe: Callable[[], bool], ttl: float = 30.0):
+        self.probe = probe
+        self.ttl = ttl
+        self.probe_count = 0
+        self._healthy: Optional[bool] = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+    
+    def is_healthy(self) -> bool:
+        """Return cached health, refreshing it when older than the TTL"""
+        with self._lock:
+            healthy = self._healthy
+            stale = time.monotonic() - self._checked_at >= self.ttl
+            refresh_in_background = bool(healthy) and stale and not self._refreshing
+            if refresh_in_background:
+                self._refreshing = True
+        
+        # Unknown or known-down servers are probed inline: a refused
+        # connection fails fast and lets callers see recovery immediately
+        if healthy is None or (not healthy and stale):
+            return self.refresh()
+        
+        if refresh_in_background:
+            threading.Thread(target=self._background_refresh, daemon=True).start()
+        
+        return healthy
+    
+    def known_down(self) -> bool:
+        """True if the server was recently seen down (never probes)"""
+        with self._lock:
+            stale = time.monotonic() - self._checked_at >= self.ttl
+            return self._healthy is False and not stale
+    
+    def refresh(self) -> bool:
+        """Probe the server now and cache the result"""
+        try:
+            healthy = bool(self.probe())
+        except Exception:
+            healthy = False
+        self.mark(healthy)
+        with self._lock:
+            self.probe_count += 1
+        return healthy
+    
+    def mark(self, healthy: bool):
+        """Record health observed from real traffic"""
+        with self._lock:
+            if self._healthy is not None and self._healthy != healthy:
+                logger.info(f"Server health changed: {'up' if healthy else 'down'}")
+            self._healthy = healthy
+            self._checked_at = time.monotonic()
+    
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Return health snapshot"""
+        with self._lock:
+            age = time.monotonic() - self._checked_at if self._healthy is not None else None
+            return {
+                "healthy": self._healthy,
+                "age_seconds": round(age, 2) if age is not None else None,
+                "ttl": self.ttl,
+                "probes": self.probe_count
+            }
+
+
+class HTTPTransport:
+    """Thread-safe pooled keep-alive HTTP session shared by LLM clients"""
+    
+    def __init__(self, pool_size: int = 10, keep_alive: bool = True):
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        
+        # urllib3 connection pools are thread-safe, so one session can be
+        # shared by every client and worker thread
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+        
+        self._health_monitors: Dict[str, HealthMonitor] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls) -> "HTTPTransport":
+        """Build transport from LLM_POOL_SIZE / LLM_HTTP_KEEP_ALIVE"""
+        pool_size = int(os.getenv("LLM_POOL_SIZE", "10"))
+        keep_alive = os.getenv("LLM_HTTP_KEEP_ALIVE", "true").lower() not in ("0", "false", "no")
+        return cls(pool_size=pool_size, keep_alive=keep_alive)
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.session.post(url, **kwargs)
+    
+    def health_monitor(
+        self,
+        name: str,
+        probe: Callable[[], bool],
+        ttl: float = 30.0
+    ) -> HealthMonitor:
+        """Get the shared health monitor for an endpoint"""
+        with self._lock:
+            monitor = self._health_monitors.get(name)
+            if monitor is None:
+                monitor = HealthMonitor(probe, ttl)
+                self._health_monitors[name] = monitor
+            return monitor
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return request and connection-reuse statistics"""
+        total_requests = 0
+        new_connections = 0
+        
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                total_requests += pool.num_requests
+                new_connections += pool.num_connections
+        
+        reused = max(total_requests - new_connections, 0)
+        with self._lock:
+            health = {name: m.get_status() for name, m in self._health_monitors.items()}
+        
+        return {
+            "requests": total_requests,
+            "new_connections": new_connections,
+            "reused_connections": reused,
+            "reuse_rate": round(reused / total_requests, 3) if total_requests else 0.0,
+            "pool_size": self.pool_size,
+            "keep_alive": self.keep_alive,
+            "health": health
+        }
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
@@ -0,0 +1,92 @@
+import threading
+from datetime import datetime
+from typing import Callable, Optional, Dict, Any, List
+from ..utils.logger import logger
+
+
+class KeepWarmPinger:
+    """Background thread that re-loads models so Ollama never unloads them
+
+    Pings only run inside business hours (local time); outside them
+    models are left to Ollama's normal keep_alive expiry.
+    """
+    
+    def __init__(
+        self,
+        ping: Callable[[], Dict[str, Any]],
+        interval: float = 240.0,
+        start_hour: int = 9,
+        end_hour: int = 18,
+        days: Optional[List[int]] = None,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        self.ping = ping
+        self.interval = interval
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+        self.days = set(days if days is not None else range(5))  # Monday=0
+        self.clock = clock
+        
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"pings": 0, "skipped": 0, "errors": 0}
+    
+    @classmethod
+    def from_config(cls, ping: Callable[[], Dict[str, Any]], config: Dict[str, Any]) -> "KeepWarmPinger":
+        """Build pinger from the `warmup.keep_warm:` section of model_config.yaml"""
+        hours = config.get("business_hours") or {}
+        return cls(
+            ping,
+            interval=float(config.get("interval", 240)),
+            start_hour=int(hours.get("start", 9)),
+            end_hour=int(hours.get("end", 18)),
+            days=hours.get("days")
+        )
+    
+    def in_business_hours(self, now: Optional[datetime] = None) -> bool:
+        """True if `now` falls on a business day between start and end hour"""
+        now = now or self.clock()
+        return now.weekday() in self.days and self.start_hour <= now.hour < self.end_hour
+    
+    def tick(self) -> bool:
+        """Ping once if inside business hours; returns True if pinged"""
+        if not self.in_business_hours():
+            self._stats["skipped"] += 1
+            return False
+        try:
+            self.ping()
+            self._stats["pings"] += 1
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Keep-warm ping failed: {e}")
+        return True
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.tick()
+    
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="llm-keep-warm", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Keep-warm pinger started (every {self.interval:.0f}s, "
+            f"{self.start_hour:02d}:00-{self.end_hour:02d}:00)"
+        )
+    
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "running": bool(self._thread and self._thread.is_alive()),
+            "interval": self.interval
+        }
\ No newline at end of file
@@ -6,11 +6,17 @@ from .workflow import WorkflowOrchestrator
 from .router import TaskRouter
 from .agent_registry import AgentRegistry
 from .context_manager import ContextManager
+from .batch_screening import BatchScreener
+from .resume_index import ResumeIndex
+from .requisition_matcher import RequisitionMatcher
 
 __all__ = [
     'CrewManager',
     'WorkflowOrchestrator',
     'TaskRouter',
     'AgentRegistry',
-    'ContextManager'
+    'ContextManager',
+    'BatchScreener',
+    'ResumeIndex',
+    'RequisitionMatcher'
 ]
\ No newline at end of file
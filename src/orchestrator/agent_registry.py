@@ -1,11 +1,17 @@
-from typing import Dict, Any
+import yaml
+from typing import Dict, Any, Optional
 from ..agents.hr_assistant.agent import HRAssistantAgent
+from ..agents.hr_assistant.semantic_cache import SemanticCache
 from ..agents.resume_screening.agent import ResumeScreeningAgent
+from ..agents.resume_screening.cascade import ScreeningCascade
+from ..agents.resume_screening.candidate_index import CandidateIndex
 from ..agents.interview.agent import InterviewAgent
 from ..agents.onboarding.agent import OnboardingAgent
 from ..agents.doc_verification.agent import DocumentVerificationAgent
 from ..agents.analytics.agent import AnalyticsAgent
 from ..llm.model_router import ModelRouter
+from ..llm.embeddings import get_embedder
+from ..utils.jd_analyzer import JDAnalyzer
 from ..utils.logger import logger
 
 class AgentRegistry:
@@ -22,15 +28,26 @@ class AgentRegistry:
         
         # HR Assistant - uses chat model
         hr_client = self.model_router.get_client("hr_assistant")
-        self.agents["hr_assistant"] = HRAssistantAgent(hr_client)
+        self.agents["hr_assistant"] = HRAssistantAgent(
+            hr_client,
+            semantic_cache=self._create_semantic_cache()
+        )
         
         # Resume Screening - uses reasoning model
         resume_client = self.model_router.get_client("resume_screening")
-        self.agents["resume_screening"] = ResumeScreeningAgent(resume_client)
+        screening_settings = self._resume_screening_settings()
+        # One JD analysis per requisition, shared by screening and interviews
+        jd_analyzer = JDAnalyzer.from_config(screening_settings.get('jd_analysis') or {})
+        self.agents["resume_screening"] = ResumeScreeningAgent(
+            resume_client,
+            cascade=ScreeningCascade.from_config(screening_settings.get('cascade') or {}, analyzer=jd_analyzer),
+            candidate_index=self._create_candidate_index(screening_settings.get('candidate_index') or {}),
+            jd_analyzer=jd_analyzer
+        )
         
         # Interview Agent - uses chat model
         interview_client = self.model_router.get_client("interview")
-        self.agents["interview"] = InterviewAgent(interview_client)
+        self.agents["interview"] = InterviewAgent(interview_client, jd_analyzer=jd_analyzer)
         
         # Onboarding Agent - uses chat model
         onboarding_client = self.model_router.get_client("onboarding")
@@ -46,6 +63,49 @@ class AgentRegistry:
         
         logger.info(f"Registered {len(self.agents)} agents")
     
+    def _create_semantic_cache(self) -> Optional[SemanticCache]:
+        """Build the HR assistant's semantic answer cache from model config"""
+        semantic_config = self.model_router.config.get('cache', {}).get('semantic', {})
+        if not semantic_config.get('enabled', False):
+            return None
+        
+        try:
+            embedder = get_embedder(semantic_config.get('embedding_model', 'all-MiniLM-L6-v2'))
+            threshold = semantic_config.get('threshold')
+            return SemanticCache(
+                embedder,
+                threshold=float(threshold) if threshold is not None else None,
+                max_entries=int(semantic_config.get('max_entries', 1000))
+            )
+        except Exception as e:
+            logger.error(f"Error creating semantic cache: {e}")
+            return None
+    
+    def _resume_screening_settings(self) -> Dict[str, Any]:
+        """agents.resume_screening from settings.yaml (cascade, candidate_index, jd_analysis)"""
+        try:
+            with open(self.model_router.settings_path, 'r') as f:
+                settings = yaml.safe_load(f) or {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error reading resume screening settings: {e}")
+            return {}
+        
+        return (settings.get('agents') or {}).get('resume_screening') or {}
+    
+    def _create_candidate_index(self, config: Dict[str, Any]) -> Optional[CandidateIndex]:
+        """Build the resume ANN index, reopening its last snapshot"""
+        if not config.get('enabled', False):
+            return None
+        
+        try:
+            embedder = get_embedder(config.get('embedding_model', 'all-MiniLM-L6-v2'))
+            return CandidateIndex.from_config(embedder, config)
+        except Exception as e:
+            logger.error(f"Error creating candidate index: {e}")
+            return None
+    
     def get_agent(self, agent_name: str):
         """Get agent by name"""
         agent = self.agents.get(agent_name)
@@ -0,0 +1,143 @@
+"""
+Batch Screening - Screen many resumes against one job description
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Iterator, Union, Callable, Optional
+from ..utils.logger import logger
+
+Candidate = Union[str, Dict[str, Any]]
+
+
+class BatchScreener:
+    """Fan a requisition's resumes out to the screening agent on a thread pool
+
+    stream() yields each candidate's result as soon as it completes;
+    summary() then gives the ranked shortlist, throughput and latency.
+    A failing candidate is reported as such without stopping the batch,
+    including one whose screening fell back because the LLM errored.
+    """
+    
+    def __init__(
+        self,
+        agent,
+        max_workers: int = 4,
+        shortlist_size: int = 10,
+        preprocess: Optional[Callable[[str], str]] = None
+    ):
+        self.agent = agent
+        self.max_workers = max(1, int(max_workers))
+        self.shortlist_size = shortlist_size
+        self.preprocess = preprocess or (lambda text: text)
+        
+        self._lock = threading.Lock()
+        self._results: List[Dict[str, Any]] = []
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+    
+    @staticmethod
+    def _normalise(candidates: List[Candidate]) -> List[Dict[str, Any]]:
+        """Accept bare resume strings or {"id", "resume"} dicts"""
+        normalised = []
+        for index, candidate in enumerate(candidates):
+            if isinstance(candidate, str):
+                candidate = {"resume": candidate}
+            normalised.append({
+                "index": index,
+                "candidate_id": candidate.get("id") or candidate.get("candidate_id") or f"candidate_{index + 1}",
+                "resume": candidate.get("resume") or ""
+            })
+        return normalised
+    
+    def _screen_one(self, job_description: str, candidate: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = self.agent.process({
+                "resume": self.preprocess(candidate["resume"]),
+                "job_description": job_description
+            })
+        except Exception as e:
+            # Agents normally return errors, but one bad resume must not sink the batch
+            logger.error(f"Screening {candidate['candidate_id']} failed: {e}")
+            result = {"success": False, "error": str(e)}
+        
+        if result.get("provenance") == "fallback" and str(result.get("reasoning", "")).startswith("Error:"):
+            # The LLM never answered, so the fallback's score of 0 is not a ranking
+            result = {**result, "success": False, "error": result["reasoning"]}
+        
+        return {
+            "index": candidate["index"],
+            "candidate_id": candidate["candidate_id"],
+            "success": bool(result.get("success")),
+            "score": result.get("score", 0) if result.get("success") else None,
+            "recommendation": result.get("recommendation"),
+            "latency": round(time.perf_counter() - started, 3),
+            "result": result,
+            "error": result.get("error")
+        }
+    
+    def stream(self, job_description: str, candidates: List[Candidate]) -> Iterator[Dict[str, Any]]:
+        """Yield per-candidate results in completion order"""
+        items = self._normalise(candidates)
+        job_description = self.preprocess(job_description)
+        with self._lock:
+            self._results = []
+            self._started = time.perf_counter()
+            self._finished = None
+        logger.info(f"Screening {len(items)} resumes with {self.max_workers} workers")
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-screening")
+        try:
+            futures = [pool.submit(self._screen_one, job_description, item) for item in items]
+            for future in as_completed(futures):
+                outcome = future.result()
+                with self._lock:
+                    self._results.append(outcome)
+                yield outcome
+        finally:
+            # An abandoned stream cancels candidates that haven't started
+            pool.shutdown(wait=False, cancel_futures=True)
+            with self._lock:
+                self._finished = time.perf_counter()
+    
+    def run(self, job_description: str, candidates: List[Candidate]) -> Dict[str, Any]:
+        """Screen every candidate and return the summary"""
+        for _ in self.stream(job_description, candidates):
+            pass
+        return self.summary()
+    
+    def summary(self) -> Dict[str, Any]:
+        """Ranked shortlist, results in input order, throughput and latency"""
+        with self._lock:
+            results = sorted(self._results, key=lambda r: r["index"])
+            end = self._finished if self._finished is not None else time.perf_counter()
+            elapsed = end - self._started if self._started is not None else 0.0
+        
+        succeeded = [r for r in results if r["success"]]
+        deterministic = sum(1 for r in succeeded if r["result"].get("provenance") == "deterministic")
+        ranked = sorted(succeeded, key=lambda r: (-(r["score"] or 0), r["index"]))
+        latencies = sorted(r["latency"] for r in results)
+        
+        return {
+            "success": True,
+            "results": results,
+            "shortlist": [
+                {"rank": rank, "candidate_id": r["candidate_id"], "score": r["score"], "recommendation": r["recommendation"]}
+                for rank, r in enumerate(ranked[:self.shortlist_size], start=1)
+            ],
+            "failed": [{"candidate_id": r["candidate_id"], "error": r["error"]} for r in results if not r["success"]],
+            "stats": {
+                "candidates": len(results),
+                "succeeded": len(succeeded),
+                "failed": len(results) - len(succeeded),
+                "workers": self.max_workers,
+                "deterministic_decisions": deterministic,
+                "llm_calls": len(succeeded) - deterministic,
+                "llm_calls_saved_rate": round(deterministic / len(results), 3) if results else 0.0,
+                "elapsed_seconds": round(elapsed, 3),
+                "resumes_per_minute": round(len(results) / elapsed * 60, 1) if elapsed else 0.0,
+                "latency_avg": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+                "latency_p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+            }
+        }
\ No newline at end of file
@@ -18,10 +18,22 @@ class CrewManager:
         
         task_handlers = {
             "resume_pipeline": self.orchestrator.execute_resume_pipeline,
+            "batch_screening": self.orchestrator.execute_batch_screening,
+            "batch_screening_stream": self.orchestrator.stream_batch_screening,
+            "index_resumes": self.orchestrator.index_resumes,
+            "remove_resumes": self.orchestrator.remove_resumes,
+            "candidate_search": self.orchestrator.execute_candidate_search,
+            "pool_screening": self.orchestrator.execute_pool_screening,
+            "skill_search": self.orchestrator.execute_skill_search,
+            "role_matching": self.orchestrator.execute_role_matching,
             "onboarding": self.orchestrator.execute_onboarding_workflow,
             "query": lambda data: self.orchestrator.handle_query(
                 data.get("query", ""),
                 data.get("session_id", "default")
+            ),
+            "query_stream": lambda data: self.orchestrator.handle_query_stream(
+                data.get("query", ""),
+                data.get("session_id", "default")
             )
         }
         
@@ -41,6 +53,38 @@ class CrewManager:
                 "error": str(e)
             }
     
+    async def aexecute_task(
+        self,
+        task_type: str,
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Async counterpart of execute_task()"""
+        
+        task_handlers = {
+            "resume_pipeline": self.orchestrator.aexecute_resume_pipeline,
+            "onboarding": self.orchestrator.aexecute_onboarding_workflow,
+            "query": lambda data: self.orchestrator.ahandle_query(
+                data.get("query", ""),
+                data.get("session_id", "default")
+            )
+        }
+        
+        handler = task_handlers.get(task_type)
+        if not handler:
+            return {
+                "success": False,
+                "error": f"Unknown task type: {task_type}"
+            }
+        
+        try:
+            return await handler(input_data)
+        except Exception as e:
+            logger.error(f"Async task execution error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def get_agent_status(self) -> Dict[str, Any]:
         """Get status of all agents"""
         agents = self.orchestrator.registry.list_agents()
@@ -48,5 +92,26 @@ class CrewManager:
             "success": True,
             "agents": agents,
             "count": len(agents),
-            "status": "operational"
+            "status": "operational",
+            "transport": self.orchestrator.registry.model_router.get_transport_stats(),
+            "cache": self.orchestrator.registry.model_router.get_cache_stats(),
+            "coalescing": self.orchestrator.registry.model_router.get_coalescing_stats(),
+            "resilience": self.orchestrator.registry.model_router.get_resilience_stats(),
+            "warmup": self.orchestrator.registry.model_router.get_warmup_stats(),
+            "context_reuse": self.orchestrator.registry.model_router.get_context_stats(),
+            "tokens": self.orchestrator.registry.model_router.get_token_stats(),
+            "compaction": self.orchestrator.compactor.get_stats(),
+            "resume_index": self.orchestrator.resume_index.get_stats(),
+            "skill_matrix": self.orchestrator.skill_matrix.get_stats(),
+            "requisition_matching": self.orchestrator.get_matching_stats(),
+            "resume_dedup": self.orchestrator.get_dedup_stats(),
+            "jd_analysis": self.orchestrator.registry.get_agent("resume_screening").get_jd_analysis_stats(),
+            "screening_cascade": self.orchestrator.registry.get_agent("resume_screening").get_cascade_stats(),
+            "candidate_index": self.orchestrator.registry.get_agent("resume_screening").get_candidate_index_stats(),
+            "structured_output": {
+                name: agent.get_parse_stats()
+                for name, agent in self.orchestrator.registry.get_all_agents().items()
+                if agent.get_parse_stats()["total"]
+            },
+            "semantic_cache": self.orchestrator.registry.get_agent("hr_assistant").get_cache_stats()
         }
\ No newline at end of file
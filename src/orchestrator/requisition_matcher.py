@@ -0,0 +1,140 @@
+"""
+Requisition Matcher - Embedding similarity of every candidate against every open role
+"""
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+import numpy as np
+from ..llm.embedding_store import EmbeddingStore
+from ..utils.file_loader import FileLoader
+from ..utils.logger import logger
+
+
+class RequisitionMatcher:
+    """Candidate-by-requisition cosine similarity over stored embeddings
+
+    Resumes and JDs are each encoded once into float16 EmbeddingStores
+    (memory-mapped under store_dir when given). similarity() walks the
+    candidate matrix in row blocks of batch_size, one matrix multiply
+    against all requisitions per block, and caches the result until
+    either side changes.
+    """
+    
+    def __init__(self, embedder, store_dir: Optional[str] = None, batch_size: int = 4096):
+        self.batch_size = max(1, int(batch_size))
+        self.candidates = EmbeddingStore(embedder, store_dir, name="candidates")
+        self.requisitions = EmbeddingStore(embedder, store_dir, name="requisitions")
+        
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_key: Optional[Tuple[int, ...]] = None
+        # Row and column ids the cached matrix was built with
+        self._row_ids: List[str] = []
+        self._column_ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._column_of: Dict[str, int] = {}
+        self._stats = {"matrix_builds": 0, "build_seconds": 0.0, "queries": 0}
+    
+    def add_candidates(self, candidates: Dict[str, str]) -> int:
+        """Encode resumes by candidate id; unchanged ones are not re-encoded"""
+        return self.candidates.add(list(candidates), list(candidates.values()))
+    
+    def remove_candidates(self, candidate_ids: List[str]) -> int:
+        """Drop candidates who left the pool, from the store on disk too"""
+        return self.candidates.remove(candidate_ids)
+    
+    def add_requisitions(self, requisitions: Dict[str, str]) -> int:
+        """Encode JDs by requisition id; unchanged ones are not re-encoded"""
+        return self.requisitions.add(list(requisitions), list(requisitions.values()))
+    
+    def load_requisitions(self, jd_dir: str) -> int:
+        """Encode every JD file in a directory, keyed by file name"""
+        if not Path(jd_dir).is_dir():
+            logger.warning(f"Job description directory not found: {jd_dir}")
+            return 0
+        return self.add_requisitions(FileLoader.load_directory(jd_dir))
+    
+    def _blocks(self, candidates: np.ndarray, requisitions: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        """(first row, similarity block) for each batch of candidates"""
+        requisitions_t = np.ascontiguousarray(requisitions.astype(np.float32).T)
+        for start in range(0, len(candidates), self.batch_size):
+            block = candidates[start:start + self.batch_size].astype(np.float32)
+            yield start, block @ requisitions_t
+    
+    def similarity(self) -> np.ndarray:
+        """Cosine similarity, candidates x requisitions, as float16"""
+        return self._snapshot()[0]
+    
+    def _snapshot(self) -> Tuple[np.ndarray, List[str], List[str]]:
+        """The similarity matrix with its row and column ids, rebuilt if either store changed"""
+        candidate_stats, requisition_stats = self.candidates.get_stats(), self.requisitions.get_stats()
+        key = tuple(
+            stats[name] for stats in (candidate_stats, requisition_stats) for name in ("vectors", "encoded", "removed")
+        )
+        with self._lock:
+            if self._matrix is not None and self._matrix_key == key:
+                return self._matrix, self._row_ids, self._column_ids
+            
+            started = time.perf_counter()
+            row_ids, column_ids = self.candidates.ids, self.requisitions.ids
+            candidates = self.candidates.vectors()[:len(row_ids)]
+            requisitions = self.requisitions.vectors()[:len(column_ids)]
+            matrix = np.empty((len(candidates), len(requisitions)), dtype=np.float16)
+            if len(candidates) and len(requisitions):
+                for start, block in self._blocks(candidates, requisitions):
+                    matrix[start:start + len(block)] = block
+            self._matrix, self._matrix_key = matrix, key
+            self._row_ids, self._column_ids = row_ids, column_ids
+            self._row_of = {doc_id: row for row, doc_id in enumerate(row_ids)}
+            self._column_of = {doc_id: column for column, doc_id in enumerate(column_ids)}
+            
+            elapsed = time.perf_counter() - started
+            self._stats["matrix_builds"] += 1
+            self._stats["build_seconds"] += elapsed
+            logger.info(f"Match matrix {matrix.shape[0]}x{matrix.shape[1]} built in {elapsed * 1000:.0f} ms")
+            return matrix, row_ids, column_ids
+    
+    @staticmethod
+    def _top(scores: np.ndarray, ids: List[str], top_k: int, exclude: Tuple[str, ...]) -> List[Dict[str, Any]]:
+        order = np.argsort(-scores.astype(np.float32), kind="stable")
+        matches = []
+        for index in order:
+            if ids[index] in exclude:
+                continue
+            matches.append({"id": ids[index], "similarity": round(float(scores[index]), 4)})
+            if len(matches) == top_k:
+                break
+        return matches
+    
+    def _query(self) -> Tuple[np.ndarray, List[str], List[str], Dict[str, int], Dict[str, int]]:
+        """Current matrix with its ids and id lookups, all read under one lock hold"""
+        self._snapshot()
+        with self._lock:
+            self._stats["queries"] += 1
+            return self._matrix, self._row_ids, self._column_ids, self._row_of, self._column_of
+    
+    def roles_for(self, candidate_id: str, top_k: int = 5, exclude: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+        """Best-fitting requisitions for a candidate, e.g. one rejected for another role"""
+        matrix, row_ids, column_ids, row_of, _ = self._query()
+        row = row_of.get(candidate_id)
+        if row is None:
+            return []
+        return self._top(matrix[row], column_ids, top_k, exclude)
+    
+    def candidates_for(self, requisition_id: str, top_k: int = 10, exclude: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+        """Best-fitting pooled candidates for a requisition"""
+        matrix, row_ids, column_ids, _, column_of = self._query()
+        column = column_of.get(requisition_id)
+        if column is None:
+            return []
+        return self._top(matrix[:, column], row_ids, top_k, exclude)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        seconds = stats.pop("build_seconds")
+        stats["build_ms_avg"] = round(seconds / stats["matrix_builds"] * 1000, 1) if stats["matrix_builds"] else 0.0
+        stats["candidates"] = self.candidates.get_stats()
+        stats["requisitions"] = self.requisitions.get_stats()
+        return stats
\ No newline at end of file
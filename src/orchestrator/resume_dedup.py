@@ -0,0 +1,213 @@
+"""
+Resume Deduplicator - MinHash/LSH detection of exact and near-duplicate resumes
+"""
+import hashlib
+import json
+import re
+import threading
+import zlib
+from typing import Dict, Any, List, Optional, NamedTuple, Set, Tuple
+import numpy as np
+from ..llm.cache import LRUCache
+from ..utils.logger import logger
+
+_WORD = re.compile(r"\w+")
+# Mersenne prime for the universal hash family; hashes stay below 2^31 so
+# a * x + b fits in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+
+class DuplicateMatch(NamedTuple):
+    """The earlier resume a new one duplicates, and their estimated Jaccard similarity"""
+    resume_id: str
+    similarity: float
+    exact: bool
+
+
+class ResumeDeduplicator:
+    """MinHash signatures of word shingles, bucketed by LSH bands
+
+    Each resume is reduced to `num_perm` MinHash values over its
+    `shingle_size`-word shingles (case, punctuation and spacing ignored).
+    Signatures are split into bands; resumes sharing any band bucket are
+    candidates, and a candidate is a duplicate when its estimated Jaccard
+    similarity reaches `threshold`. A lookup therefore only compares
+    against the few resumes in matching buckets, not the whole history.
+    Identical normalised text is caught by hash before any MinHash work.
+
+    Pipeline results are kept per (resume, requisition) so a duplicate
+    screened for the same role reuses the earlier result.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        max_results: int = 1000,
+        result_ttl: float = 7 * 24 * 3600,
+        seed: int = 1
+    ):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = self._band_layout(num_perm, threshold)
+        
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+        
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._exact: Dict[str, str] = {}
+        self._exact_of: Dict[str, str] = {}
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+        self._results = LRUCache(max_entries=max_results, ttl=result_ttl)
+        self._stats = {
+            "checked": 0, "exact_duplicates": 0, "near_duplicates": 0,
+            "candidates_compared": 0, "results_reused": 0
+        }
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResumeDeduplicator":
+        """Build from `workflow.resume_dedup` in settings.yaml"""
+        return cls(
+            threshold=float(config.get("threshold", 0.85)),
+            num_perm=int(config.get("num_perm", 128)),
+            shingle_size=int(config.get("shingle_size", 5)),
+            max_results=int(config.get("max_results", 1000)),
+            result_ttl=float(config.get("result_ttl", 7 * 24 * 3600))
+        )
+    
+    @staticmethod
+    def _band_layout(num_perm: int, threshold: float) -> Tuple[int, int]:
+        """Most rows per band that still make a pair at `threshold` a candidate 99% of the time
+
+        More rows per band means fewer chance collisions to verify; the
+        recall bound keeps true duplicates from slipping through.
+        """
+        for rows in sorted((r for r in range(1, num_perm + 1) if num_perm % r == 0), reverse=True):
+            bands = num_perm // rows
+            if 1 - (1 - threshold ** rows) ** bands >= 0.99:
+                return bands, rows
+        return num_perm, 1
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    @staticmethod
+    def _tokens(text: str) -> List[str]:
+        return _WORD.findall((text or "").lower())
+    
+    def _signature(self, tokens: List[str]) -> np.ndarray:
+        size = min(self.shingle_size, len(tokens)) or 1
+        shingles = {" ".join(tokens[i:i + size]) for i in range(max(len(tokens) - size + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) & 0x7FFFFFFF for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+    
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+    
+    def _match(self, tokens: List[str]) -> Tuple[Optional[DuplicateMatch], str, Optional[np.ndarray]]:
+        """Best duplicate of the text (or None), with its exact key and signature"""
+        exact_key = hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+        with self._lock:
+            resume_id = self._exact.get(exact_key)
+        if resume_id is not None:
+            return DuplicateMatch(resume_id, 1.0, True), exact_key, None
+        
+        signature = self._signature(tokens)
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            best = None
+            for candidate in candidates:
+                similarity = float(np.mean(self._signatures[candidate] == signature))
+                if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(candidate, round(similarity, 4), False)
+            self._stats["candidates_compared"] += len(candidates)
+        return best, exact_key, signature
+    
+    def find(self, text: str) -> Optional[DuplicateMatch]:
+        """The earlier resume this one duplicates, or None"""
+        match = self._match(self._tokens(text))[0]
+        with self._lock:
+            self._stats["checked"] += 1
+            if match is not None:
+                self._stats["exact_duplicates" if match.exact else "near_duplicates"] += 1
+        return match
+    
+    def add(self, resume_id: str, text: str) -> str:
+        """Index a resume; a duplicate of an indexed one returns (and links to) that id"""
+        tokens = self._tokens(text)
+        match, exact_key, signature = self._match(tokens)
+        if match is not None:
+            return match.resume_id
+        
+        with self._lock:
+            if resume_id in self._signatures:
+                self._drop(resume_id)
+            self._signatures[resume_id] = signature
+            self._exact[exact_key] = resume_id
+            self._exact_of[resume_id] = exact_key
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(resume_id)
+        return resume_id
+    
+    def remove(self, resume_id: str) -> bool:
+        with self._lock:
+            if resume_id not in self._signatures:
+                return False
+            self._drop(resume_id)
+            return True
+    
+    def _drop(self, resume_id: str):
+        signature = self._signatures.pop(resume_id)
+        self._exact.pop(self._exact_of.pop(resume_id), None)
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(resume_id)
+                if not bucket:
+                    del self._buckets[band][key]
+    
+    @staticmethod
+    def _result_key(resume_id: str, context: str) -> str:
+        return f"{resume_id}|{hashlib.sha256(context.encode('utf-8')).hexdigest()}"
+    
+    def lookup(self, text: str, context: str = "") -> Optional[Dict[str, Any]]:
+        """Stored result for a duplicate of `text` under the same context (e.g. the JD), or None"""
+        match = self.find(text)
+        if match is None:
+            return None
+        cached = self._results.get(self._result_key(match.resume_id, context))
+        if cached is None:
+            return None
+        
+        with self._lock:
+            self._stats["results_reused"] += 1
+        logger.info(f"Duplicate resume ({match.similarity:.0%} similar to {match.resume_id}), reusing its result")
+        result = json.loads(cached)
+        result["duplicate_of"] = match._asdict()
+        return result
+    
+    def record(self, text: str, result: Dict[str, Any], context: str = "", resume_id: Optional[str] = None) -> str:
+        """Index the resume and keep its result for later duplicates; returns the id it is stored under"""
+        tokens = self._tokens(text)
+        resume_id = self.add(resume_id or hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()[:16], text)
+        self._results.set(self._result_key(resume_id, context), json.dumps(result, default=str))
+        return resume_id
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["resumes"] = len(self._signatures)
+        stats["stored_results"] = len(self._results)
+        stats["threshold"] = self.threshold
+        stats["bands"] = f"{self.bands}x{self.rows}"
+        return stats
\ No newline at end of file
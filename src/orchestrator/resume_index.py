@@ -0,0 +1,263 @@
+"""
+Resume Index - BM25 ranking of a stored resume pool against a job description
+"""
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, List, Optional, Set, Union
+import numpy as np
+from ..llm.embeddings import STOPWORDS
+from ..utils.skill_taxonomy import SkillTaxonomy
+from ..utils.logger import logger
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+_WORD = re.compile(r"[a-z0-9]+(?:[+#]+|\.[a-z0-9]+)*")
+
+
+class ResumeIndex:
+    """Incrementally built BM25 index over resumes
+
+    Each resume is tokenised once on add (words plus canonical skill ids
+    from the taxonomy, so "k8s" and "Kubernetes" meet) and stored as a
+    row of a sparse term matrix. search() scores the whole pool against
+    a JD with a single sparse matrix-vector product (scipy.sparse when
+    installed, a NumPy bincount otherwise). Replaced and removed rows are
+    masked out, and dropped once they make up `compact_ratio` of the
+    matrix. The index lives in memory only; the pool is re-indexed after
+    a restart.
+    """
+    
+    def __init__(
+        self,
+        k1: float = 1.5,
+        b: float = 0.75,
+        taxonomy: Optional[SkillTaxonomy] = None,
+        compact_ratio: float = 0.25
+    ):
+        self.k1 = k1
+        self.b = b
+        self.taxonomy = taxonomy or SkillTaxonomy.default()
+        self.compact_ratio = compact_ratio
+        
+        self._lock = threading.Lock()
+        self._vocabulary: Dict[str, int] = {}
+        self._doc_freq: List[int] = []
+        # Append-only CSR of raw term counts; replaced rows are masked out
+        self._indptr: List[int] = [0]
+        self._indices: List[int] = []
+        self._counts: List[int] = []
+        self._lengths: List[int] = []
+        self._live: List[bool] = []
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._texts: Dict[str, str] = {}
+        # BM25 weights, rebuilt lazily after adds
+        self._weights = None
+        self._stats = {
+            "adds": 0, "replaced": 0, "rebuilds": 0, "compactions": 0, "searches": 0, "search_seconds": 0.0
+        }
+    
+    def tokenize(self, text: str) -> List[str]:
+        text = text or ""
+        tokens = [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+        tokens.extend(f"skill:{skill_id}" for skill_id in self.taxonomy.extract(text))
+        return tokens
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+    
+    def add(self, doc_id: str, text: str):
+        """Index one resume; re-adding an id replaces the earlier version"""
+        counts = Counter(self.tokenize(text))
+        with self._lock:
+            if doc_id in self._rows:
+                self._retire(self._rows[doc_id])
+                self._stats["replaced"] += 1
+            
+            columns = []
+            for term in counts:
+                column = self._vocabulary.get(term)
+                if column is None:
+                    column = len(self._vocabulary)
+                    self._vocabulary[term] = column
+                    self._doc_freq.append(0)
+                self._doc_freq[column] += 1
+                columns.append(column)
+            
+            self._indices.extend(columns)
+            self._counts.extend(counts.values())
+            self._indptr.append(len(self._indices))
+            self._lengths.append(sum(counts.values()))
+            self._live.append(True)
+            self._rows[doc_id] = len(self._ids)
+            self._ids.append(doc_id)
+            self._texts[doc_id] = text
+            self._weights = None
+            self._stats["adds"] += 1
+            self._maybe_compact()
+    
+    def add_many(self, documents: List[Union[str, Dict[str, Any]]]) -> List[str]:
+        """Index resume strings or {"id", "resume"} dicts; returns their ids"""
+        offset = len(self)
+        doc_ids = []
+        for index, document in enumerate(documents):
+            if isinstance(document, str):
+                document = {"resume": document}
+            doc_id = str(document.get("id") or document.get("candidate_id") or f"candidate_{offset + index + 1}")
+            self.add(doc_id, document.get("resume") or "")
+            doc_ids.append(doc_id)
+        return doc_ids
+    
+    def remove(self, doc_id: str) -> bool:
+        """Drop a resume from the pool; returns False if it was not indexed"""
+        with self._lock:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                return False
+            self._retire(row)
+            del self._texts[doc_id]
+            self._weights = None
+            self._maybe_compact()
+            return True
+    
+    def _retire(self, row: int):
+        """Drop a replaced row from the document frequencies and mask it out"""
+        for column in self._indices[self._indptr[row]:self._indptr[row + 1]]:
+            self._doc_freq[column] -= 1
+        self._live[row] = False
+    
+    def _maybe_compact(self):
+        dead = len(self._ids) - len(self._rows)
+        if dead and dead >= self.compact_ratio * len(self._ids):
+            self._compact()
+    
+    def _compact(self):
+        """Drop retired rows and terms no live row uses, renumbering the rest"""
+        columns = {}
+        vocabulary = {}
+        for term, column in self._vocabulary.items():
+            if self._doc_freq[column] > 0:
+                columns[column] = len(vocabulary)
+                vocabulary[term] = len(vocabulary)
+        doc_freq = [0] * len(vocabulary)
+        for column, new_column in columns.items():
+            doc_freq[new_column] = self._doc_freq[column]
+        
+        indptr, indices, counts, lengths, ids = [0], [], [], [], []
+        for row, doc_id in enumerate(self._ids):
+            if not self._live[row]:
+                continue
+            start, end = self._indptr[row], self._indptr[row + 1]
+            indices.extend(columns[column] for column in self._indices[start:end])
+            counts.extend(self._counts[start:end])
+            indptr.append(len(indices))
+            lengths.append(self._lengths[row])
+            ids.append(doc_id)
+        
+        logger.info(f"Resume index compacted: {len(self._ids) - len(ids)} retired rows dropped")
+        self._vocabulary, self._doc_freq = vocabulary, doc_freq
+        self._indptr, self._indices, self._counts, self._lengths = indptr, indices, counts, lengths
+        self._live = [True] * len(ids)
+        self._ids = ids
+        self._rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        self._weights = None
+        self._stats["compactions"] += 1
+    
+    def get(self, doc_id: str) -> Optional[str]:
+        with self._lock:
+            return self._texts.get(doc_id)
+    
+    def documents(self) -> Dict[str, str]:
+        """Indexed resume texts by id"""
+        with self._lock:
+            return dict(self._texts)
+    
+    def _build(self):
+        """Per-entry BM25 term weights; idf is applied on the query side"""
+        indptr = np.asarray(self._indptr, dtype=np.int64)
+        indices = np.asarray(self._indices, dtype=np.int64)
+        counts = np.asarray(self._counts, dtype=np.float32)
+        lengths = np.asarray(self._lengths, dtype=np.float32)
+        live = np.asarray(self._live, dtype=bool)
+        
+        average = float(lengths[live].mean()) if live.any() and lengths[live].sum() else 1.0
+        rows = np.repeat(np.arange(len(lengths)), np.diff(indptr))
+        norm = self.k1 * (1 - self.b + self.b * lengths / average)
+        data = counts * (self.k1 + 1) / (counts + norm[rows])
+        data[~live[rows]] = 0.0
+        
+        shape = (len(lengths), len(self._vocabulary))
+        if sparse is not None:
+            self._weights = sparse.csr_matrix((data, indices, indptr), shape=shape)
+        else:
+            self._weights = (rows, indices, data, shape)
+        self._stats["rebuilds"] += 1
+    
+    def _idf(self) -> np.ndarray:
+        doc_freq = np.asarray(self._doc_freq, dtype=np.float32)
+        total = len(self._rows)
+        return np.log1p((total - doc_freq + 0.5) / (doc_freq + 0.5))
+    
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every stored row against the query"""
+        terms = set(self.tokenize(query))
+        with self._lock:
+            return self._scores(terms)
+    
+    def _scores(self, terms: Set[str]) -> np.ndarray:
+        columns = [self._vocabulary[term] for term in terms if term in self._vocabulary]
+        if self._weights is None:
+            self._build()
+        query_vector = np.zeros(len(self._vocabulary), dtype=np.float32)
+        if columns:
+            selected = np.asarray(columns, dtype=np.int64)
+            query_vector[selected] = self._idf()[selected]
+        
+        if sparse is not None:
+            return self._weights @ query_vector
+        rows, indices, data, shape = self._weights
+        return np.bincount(rows, weights=data * query_vector[indices], minlength=shape[0])
+    
+    def search(self, job_description: str, top_k: int = 20) -> List[Dict[str, Any]]:
+        """Top-k resumes by BM25 score, best first; rows scoring zero are left out"""
+        started = time.perf_counter()
+        terms = set(self.tokenize(job_description))
+        
+        # Scores and row ids are read under one lock, so a compaction can't renumber rows in between
+        with self._lock:
+            scores = self._scores(terms)
+            k = min(top_k, len(scores))
+            if k <= 0:
+                best = np.array([], dtype=np.int64)
+            else:
+                best = np.argpartition(-scores, k - 1)[:k]
+                best = best[np.argsort(-scores[best], kind="stable")]
+            hits = [
+                {"candidate_id": self._ids[row], "bm25": round(float(scores[row]), 4)}
+                for row in best if scores[row] > 0 and self._live[row]
+            ]
+            self._stats["searches"] += 1
+            self._stats["search_seconds"] += time.perf_counter() - started
+        
+        for rank, hit in enumerate(hits, start=1):
+            hit["rank"] = rank
+        logger.info(f"BM25 search over {len(scores)} resumes returned {len(hits)} hits")
+        return hits
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["documents"] = len(self._rows)
+            stats["terms"] = len(self._vocabulary)
+            stats["nonzeros"] = len(self._indices)
+            stats["retired_rows"] = len(self._ids) - len(self._rows)
+        stats["backend"] = "scipy" if sparse is not None else "numpy"
+        seconds = stats.pop("search_seconds")
+        stats["search_ms_avg"] = round(seconds / stats["searches"] * 1000, 2) if stats["searches"] else 0.0
+        return stats
\ No newline at end of file
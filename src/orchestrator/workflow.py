@@ -1,22 +1,52 @@
 """
 Workflow Orchestrator - Manages multi-agent workflows
 """
-from typing import Dict, Any, List
+import asyncio
+import threading
+import yaml
+from pathlib import Path
+from typing import Dict, Any, List, Iterator, Optional, Tuple
 from .agent_registry import AgentRegistry
 from .router import TaskRouter
 from .context_manager import ContextManager
+from .batch_screening import BatchScreener
+from .resume_index import ResumeIndex
+from .requisition_matcher import RequisitionMatcher
+from .resume_dedup import ResumeDeduplicator
+from ..llm.embeddings import get_embedder
+from ..utils.text_compactor import TextCompactor
+from ..utils.skill_matrix import SkillMatrix
 from ..utils.logger import logger
 
 
 class WorkflowOrchestrator:
     """Orchestrate multi-agent workflows"""
     
-    def __init__(self):
+    def __init__(self, settings_path: str = "config/settings.yaml"):
         """Initialize orchestrator with all components"""
         try:
             self.registry = AgentRegistry()
             self.router = TaskRouter()
             self.context = ContextManager()
+            self.compactor = TextCompactor()
+            self.batch_settings = self._load_batch_settings(settings_path)
+            self.matching_settings = self._load_workflow_settings(
+                settings_path,
+                "requisition_matching",
+                {
+                    "embedding_model": "all-MiniLM-L6-v2",
+                    "store_dir": "data/cache/embeddings",
+                    "jd_dir": "data/job_descriptions",
+                    "batch_size": 4096
+                }
+            )
+            self._matcher = None
+            self._matcher_lock = threading.Lock()
+            dedup_settings = self._load_workflow_settings(settings_path, "resume_dedup", {"enabled": True})
+            # Re-applications and re-pasted resumes reuse the earlier pipeline result
+            self.resume_dedup = ResumeDeduplicator.from_config(dedup_settings) if dedup_settings["enabled"] else None
+            self.resume_index = ResumeIndex()
+            self.skill_matrix = SkillMatrix()
             logger.info("Workflow Orchestrator initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize WorkflowOrchestrator: {e}")
@@ -36,6 +66,14 @@ class WorkflowOrchestrator:
         results = {}
         
         try:
+            duplicate = self._duplicate_result(input_data)
+            if duplicate is not None:
+                self.context.add_interaction(session_id, "workflow", "resume_pipeline", duplicate)
+                return duplicate
+            
+            # Compact once; both agents (and any rerun) get the same text
+            resume, job_description = self._compact_inputs(input_data, results)
+            
             # Step 1: Resume Screening
             logger.info("Step 1: Resume Screening")
             screening_agent = self.registry.get_agent("resume_screening")
@@ -44,8 +82,8 @@ class WorkflowOrchestrator:
                 return {"success": False, "error": "Resume screening agent not available"}
             
             screening_result = screening_agent.process({
-                "resume": input_data.get("resume"),
-                "job_description": input_data.get("job_description")
+                "resume": resume,
+                "job_description": job_description
             })
             results["screening"] = screening_result
             
@@ -57,7 +95,7 @@ class WorkflowOrchestrator:
                 return {"success": False, "error": "Document verification agent not available"}
             
             verification_result = doc_agent.process({
-                "resume": input_data.get("resume")
+                "resume": resume
             })
             results["verification"] = verification_result
             
@@ -77,7 +115,7 @@ class WorkflowOrchestrator:
                 if interview_agent:
                     interview_result = interview_agent.generate_questions({
                         "job_role": input_data.get("job_role", ""),
-                        "job_description": input_data.get("job_description", ""),
+                        "job_description": job_description,
                         "num_questions": 5
                     })
                     results["interview_prep"] = interview_result
@@ -96,6 +134,7 @@ class WorkflowOrchestrator:
             )
             
             results["success"] = True
+            self._record_result(input_data, results)
             return results
             
         except Exception as e:
@@ -105,6 +144,465 @@ class WorkflowOrchestrator:
                 "error": str(e)
             }
     
+    async def aexecute_resume_pipeline(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Async counterpart of execute_resume_pipeline()
+        
+        Screening and document verification are independent, so they
+        run concurrently instead of back to back.
+        """
+        session_id = input_data.get("session_id", "default")
+        results = {}
+        
+        try:
+            duplicate = self._duplicate_result(input_data)
+            if duplicate is not None:
+                self.context.add_interaction(session_id, "workflow", "resume_pipeline", duplicate)
+                return duplicate
+            
+            screening_agent = self.registry.get_agent("resume_screening")
+            if not screening_agent:
+                return {"success": False, "error": "Resume screening agent not available"}
+            
+            doc_agent = self.registry.get_agent("doc_verification")
+            if not doc_agent:
+                return {"success": False, "error": "Document verification agent not available"}
+            
+            resume, job_description = self._compact_inputs(input_data, results)
+            
+            logger.info("Steps 1-2: Resume Screening + Document Verification (concurrent)")
+            screening_result, verification_result = await asyncio.gather(
+                screening_agent.aprocess({
+                    "resume": resume,
+                    "job_description": job_description
+                }),
+                doc_agent.aprocess({
+                    "resume": resume
+                })
+            )
+            results["screening"] = screening_result
+            results["verification"] = verification_result
+            
+            hiring_decision = self._make_hiring_decision(
+                screening_result.get("score", 0),
+                verification_result.get("risk_score", 0)
+            )
+            results["hiring_decision"] = hiring_decision
+            
+            # Step 3: Conditional Interview Question Generation
+            if hiring_decision["proceed_to_interview"]:
+                logger.info("Step 3: Generating Interview Questions")
+                interview_agent = self.registry.get_agent("interview")
+                
+                if interview_agent:
+                    results["interview_prep"] = await interview_agent.agenerate_questions({
+                        "job_role": input_data.get("job_role", ""),
+                        "job_description": job_description,
+                        "num_questions": 5
+                    })
+                    results["recommendation"] = "Proceed to Interview"
+                else:
+                    logger.warning("Interview agent not available")
+            else:
+                results["recommendation"] = hiring_decision["recommendation"]
+            
+            self.context.add_interaction(
+                session_id,
+                "workflow",
+                "resume_pipeline",
+                results
+            )
+            
+            results["success"] = True
+            self._record_result(input_data, results)
+            return results
+            
+        except Exception as e:
+            logger.error(f"Async pipeline execution error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @staticmethod
+    def _dedup_context(input_data: Dict[str, Any]) -> str:
+        """What a pipeline result depends on besides the resume"""
+        return f"{input_data.get('job_role') or ''}\n{input_data.get('job_description') or ''}"
+    
+    def _duplicate_result(self, input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Earlier pipeline result for a duplicate of this resume and role, if any"""
+        if self.resume_dedup is None or not input_data.get("resume"):
+            return None
+        return self.resume_dedup.lookup(input_data["resume"], self._dedup_context(input_data))
+    
+    def _record_result(self, input_data: Dict[str, Any], results: Dict[str, Any]):
+        if self.resume_dedup is None or not input_data.get("resume"):
+            return
+        if self._degraded(results):
+            # Like LLM errors in the response cache, a fallback result must not be replayed
+            logger.info("Pipeline result came from an agent fallback, not keeping it for duplicates")
+            return
+        self.resume_dedup.record(input_data["resume"], results, self._dedup_context(input_data))
+    
+    @staticmethod
+    def _degraded(results: Dict[str, Any]) -> bool:
+        """True unless screening and verification came from the LLM or a deterministic decision"""
+        for step in ("screening", "verification"):
+            result = results.get(step) or {}
+            if not result.get("success") or result.get("provenance") not in ("llm", "deterministic"):
+                return True
+            if any(str(result.get(field, "")).startswith("Error:") for field in ("reasoning", "raw_analysis")):
+                return True
+        return False
+    
+    @staticmethod
+    def _load_workflow_settings(settings_path: str, section: str, defaults: Dict[str, Any]) -> Dict[str, Any]:
+        """Read workflow.<section> from settings.yaml, with defaults"""
+        try:
+            with open(settings_path, 'r') as f:
+                settings = yaml.safe_load(f) or {}
+            return {**defaults, **((settings.get("workflow") or {}).get(section) or {})}
+        except FileNotFoundError:
+            return defaults
+        except Exception as e:
+            logger.warning(f"Error reading workflow.{section} settings: {e}")
+            return defaults
+    
+    @classmethod
+    def _load_batch_settings(cls, settings_path: str) -> Dict[str, Any]:
+        """Read workflow.batch_screening from settings.yaml, with defaults"""
+        return cls._load_workflow_settings(
+            settings_path,
+            "batch_screening",
+            {"max_workers": 4, "shortlist_size": 10, "pool_top_k": 20}
+        )
+    
+    def _batch_screener(self, input_data: Dict[str, Any]) -> BatchScreener:
+        """Screener for one requisition; max_workers/shortlist_size may be overridden per call"""
+        return BatchScreener(
+            self.registry.get_agent("resume_screening"),
+            max_workers=input_data.get("max_workers") or self.batch_settings["max_workers"],
+            shortlist_size=input_data.get("shortlist_size") or self.batch_settings["shortlist_size"],
+            preprocess=lambda text: self.compactor.compact(text).text
+        )
+    
+    def _validate_batch(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Error result for an unusable batch request, or {} if it is fine"""
+        if not self.registry.get_agent("resume_screening"):
+            return {"success": False, "error": "Resume screening agent not available"}
+        if not input_data.get("job_description"):
+            return {"success": False, "error": "Missing job description"}
+        if not input_data.get("resumes"):
+            return {"success": False, "error": "No resumes provided"}
+        return {}
+    
+    def execute_batch_screening(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Screen many resumes against one job description concurrently
+        
+        Args:
+            input_data: job_description, resumes (strings or {"id", "resume"}
+                dicts) and optionally max_workers / shortlist_size
+            
+        Returns:
+            Ranked shortlist, per-candidate results and throughput stats
+        """
+        error = self._validate_batch(input_data)
+        if error:
+            return error
+        
+        try:
+            summary = self._batch_screener(input_data).run(input_data["job_description"], input_data["resumes"])
+            self._record_batch(input_data.get("session_id", "default"), summary)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Batch screening error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def stream_batch_screening(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Like execute_batch_screening(), but results arrive as they complete
+        
+        Returns:
+            {'success', 'total', 'event_stream'}; the stream yields one
+            {'event': 'candidate', ...} per resume in completion order,
+            then {'event': 'summary', ...} with the ranked shortlist
+        """
+        error = self._validate_batch(input_data)
+        if error:
+            return error
+        
+        screener = self._batch_screener(input_data)
+        return {
+            "success": True,
+            "total": len(input_data["resumes"]),
+            "event_stream": self._batch_events(
+                screener,
+                input_data["job_description"],
+                input_data["resumes"],
+                input_data.get("session_id", "default")
+            )
+        }
+    
+    def index_resumes(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add resumes to the pool searched by execute_pool_screening()
+        
+        The BM25 pool and skill matrix are in memory only and must be
+        re-indexed after a restart; the ANN candidate index and the
+        matcher's embedding store are reopened from disk.
+        
+        Args:
+            input_data: resumes (strings or {"id", "resume"} dicts); an id
+                indexed before is replaced
+        """
+        resumes = input_data.get("resumes") or []
+        if not resumes:
+            return {"success": False, "error": "No resumes provided"}
+        
+        compacted = [
+            {**resume, "resume": self.compactor.compact(resume.get("resume") or "").text}
+            if isinstance(resume, dict) else self.compactor.compact(resume).text
+            for resume in resumes
+        ]
+        doc_ids = self.resume_index.add_many(compacted)
+        texts = {doc_id: self.resume_index.get(doc_id) for doc_id in doc_ids}
+        for doc_id, text in texts.items():
+            self.skill_matrix.add_text(doc_id, text)
+        candidate_index = self._candidate_index()
+        if candidate_index is not None:
+            candidate_index.add(texts)
+        return {"success": True, "indexed": len(doc_ids), "pool_size": len(self.resume_index)}
+    
+    def remove_resumes(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Drop candidates who left the pipeline from the pool and its indexes
+        
+        The persisted indexes are cleared of every requested id, including
+        candidates indexed before a restart that the in-memory pool no
+        longer holds.
+        
+        Args:
+            input_data: candidate_ids
+        
+        Returns:
+            removed (from the pool) and persisted_removed (per on-disk index)
+        """
+        candidate_ids = [str(doc_id) for doc_id in input_data.get("candidate_ids") or []]
+        if not candidate_ids:
+            return {"success": False, "error": "No candidate ids provided"}
+        
+        removed = [doc_id for doc_id in candidate_ids if self.resume_index.remove(doc_id)]
+        for doc_id in candidate_ids:
+            self.skill_matrix.remove(doc_id)
+        
+        persisted_removed = {}
+        candidate_index = self._candidate_index()
+        if candidate_index is not None:
+            persisted_removed["candidate_index"] = candidate_index.remove(candidate_ids)
+        if self._matcher is not None or Path(self.matching_settings["store_dir"]).is_dir():
+            persisted_removed["embeddings"] = self.requisition_matcher.remove_candidates(candidate_ids)
+        return {
+            "success": True,
+            "removed": len(removed),
+            "persisted_removed": persisted_removed,
+            "pool_size": len(self.resume_index)
+        }
+    
+    def _candidate_index(self):
+        agent = self.registry.get_agent("resume_screening")
+        return agent.candidate_index if agent else None
+    
+    def execute_candidate_search(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Approximate top-k pooled candidates for a JD from the ANN index
+        
+        Args:
+            input_data: job_description and optionally top_k
+        """
+        agent = self.registry.get_agent("resume_screening")
+        if not agent:
+            return {"success": False, "error": "Resume screening agent not available"}
+        return agent.search_candidates(input_data.get("job_description") or "", int(input_data.get("top_k") or 20))
+    
+    def execute_skill_search(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Find pooled candidates by skills, e.g. "4 of these 6", without any LLM call
+        
+        Args:
+            input_data: required and optionally nice_to_have (lists or
+                comma-separated), min_required (default: all), top_k
+        """
+        def skill_list(value):
+            return [s.strip() for s in value.split(",") if s.strip()] if isinstance(value, str) else list(value or [])
+        
+        required = skill_list(input_data.get("required"))
+        if not required:
+            return {"success": False, "error": "No required skills provided"}
+        if not len(self.skill_matrix):
+            return {"success": False, "error": "Resume pool is empty"}
+        
+        min_required = input_data.get("min_required")
+        return {
+            "success": True,
+            **self.skill_matrix.match(
+                required,
+                skill_list(input_data.get("nice_to_have")),
+                min_required=int(min_required) if min_required is not None else None,
+                top_k=int(input_data.get("top_k") or 50)
+            )
+        }
+    
+    def execute_pool_screening(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Shortlist from the indexed resume pool: BM25 top-k, then LLM screening
+        
+        Args:
+            input_data: job_description and optionally top_k, max_workers,
+                shortlist_size
+            
+        Returns:
+            Batch screening summary of the top-k, plus the BM25 ranking
+            under 'retrieval'
+        """
+        if not len(self.resume_index):
+            return {"success": False, "error": "Resume pool is empty"}
+        job_description = input_data.get("job_description")
+        top_k = int(input_data.get("top_k") or self.batch_settings["pool_top_k"])
+        hits = self.resume_index.search(job_description or "", top_k) if job_description else []
+        
+        candidates = [{"id": hit["candidate_id"], "resume": self.resume_index.get(hit["candidate_id"])} for hit in hits]
+        error = self._validate_batch({**input_data, "resumes": candidates})
+        if error:
+            if job_description and not candidates:
+                error["error"] = "No pooled resumes match the job description"
+            return error
+        
+        try:
+            summary = self._batch_screener(input_data).run(job_description, candidates)
+            summary["retrieval"] = {"pool_size": len(self.resume_index), "top_k": top_k, "hits": hits}
+            self._record_batch(input_data.get("session_id", "default"), summary)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"Pool screening error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    @property
+    def requisition_matcher(self) -> RequisitionMatcher:
+        """Embedding matcher over the resume pool and open JDs, built on first use"""
+        with self._matcher_lock:
+            if self._matcher is None:
+                settings = self.matching_settings
+                self._matcher = RequisitionMatcher(
+                    get_embedder(settings["embedding_model"]),
+                    store_dir=settings["store_dir"],
+                    batch_size=settings["batch_size"]
+                )
+                self._matcher.load_requisitions(settings["jd_dir"])
+            return self._matcher
+    
+    def execute_role_matching(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Other open roles that fit a pooled candidate, by embedding similarity
+        
+        Args:
+            input_data: candidate_id (indexed with index_resumes), optionally
+                exclude (requisition ids, e.g. the role they were rejected
+                for), top_k, and requisitions ({id: JD text}) to add
+            
+        Returns:
+            Requisitions ranked by cosine similarity to the resume
+        """
+        candidate_id = input_data.get("candidate_id")
+        if not candidate_id or self.resume_index.get(candidate_id) is None:
+            return {"success": False, "error": f"Candidate not in resume pool: {candidate_id}"}
+        
+        try:
+            matcher = self.requisition_matcher
+            if input_data.get("requisitions"):
+                matcher.add_requisitions(input_data["requisitions"])
+            # Only resumes added or changed since the last call are encoded
+            matcher.add_candidates(self.resume_index.documents())
+            if not len(matcher.requisitions):
+                return {"success": False, "error": "No open requisitions to match against"}
+            
+            exclude = input_data.get("exclude") or ()
+            return {
+                "success": True,
+                "candidate_id": candidate_id,
+                "roles": matcher.roles_for(
+                    candidate_id,
+                    top_k=int(input_data.get("top_k") or 5),
+                    exclude=(exclude,) if isinstance(exclude, str) else tuple(exclude)
+                )
+            }
+            
+        except Exception as e:
+            logger.error(f"Role matching error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """Duplicate resumes detected and pipeline results reused"""
+        return self.resume_dedup.get_stats() if self.resume_dedup is not None else {}
+    
+    def get_matching_stats(self) -> Dict[str, Any]:
+        """Requisition matcher stats, empty until it has been used"""
+        return self._matcher.get_stats() if self._matcher is not None else {}
+    
+    def _batch_events(
+        self,
+        screener: BatchScreener,
+        job_description: str,
+        resumes: List[Any],
+        session_id: str
+    ) -> Iterator[Dict[str, Any]]:
+        for outcome in screener.stream(job_description, resumes):
+            yield {"event": "candidate", **outcome}
+        
+        summary = screener.summary()
+        self._record_batch(session_id, summary)
+        yield {"event": "summary", **summary}
+    
+    def _record_batch(self, session_id: str, summary: Dict[str, Any]):
+        """Store the shortlist and stats (not every full result) in context"""
+        self.context.add_interaction(
+            session_id,
+            "workflow",
+            "batch_screening",
+            {"shortlist": summary["shortlist"], "stats": summary["stats"]}
+        )
+        stats = summary["stats"]
+        logger.info(
+            f"Batch screening: {stats['succeeded']}/{stats['candidates']} screened, "
+            f"{stats['resumes_per_minute']} resumes/min, "
+            f"{stats['deterministic_decisions']} decided without the LLM"
+        )
+    
+    def _compact_inputs(self, input_data: Dict[str, Any], results: Dict[str, Any]) -> Tuple[str, str]:
+        """Compact the pasted resume and JD, recording the tokens saved in results"""
+        resume = self.compactor.compact(input_data.get("resume") or "")
+        job_description = self.compactor.compact(input_data.get("job_description") or "")
+        
+        saved = resume.tokens_saved + job_description.tokens_saved
+        results["compaction"] = {
+            "tokens_before": resume.tokens_before + job_description.tokens_before,
+            "tokens_saved": saved
+        }
+        if saved:
+            logger.info(f"Compaction saved ~{saved} prompt tokens per call")
+        return resume.text, job_description.text
+    
     def _make_hiring_decision(self, resume_score: int, risk_score: int) -> Dict[str, Any]:
         """
         Make hiring decision based on scores
@@ -216,7 +714,8 @@ class WorkflowOrchestrator:
                 "action": "create_plan",
                 "employee_name": input_data.get("employee_name"),
                 "role": input_data.get("role"),
-                "start_date": input_data.get("start_date")
+                "start_date": input_data.get("start_date"),
+                "stream": input_data.get("stream", False)
             })
             
             return result
@@ -228,6 +727,28 @@ class WorkflowOrchestrator:
                 "error": str(e)
             }
     
+    async def aexecute_onboarding_workflow(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of execute_onboarding_workflow()"""
+        try:
+            onboarding_agent = self.registry.get_agent("onboarding")
+            
+            if not onboarding_agent:
+                return {"success": False, "error": "Onboarding agent not available"}
+            
+            return await onboarding_agent.aprocess({
+                "action": "create_plan",
+                "employee_name": input_data.get("employee_name"),
+                "role": input_data.get("role"),
+                "start_date": input_data.get("start_date")
+            })
+            
+        except Exception as e:
+            logger.error(f"Onboarding workflow error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def handle_query(self, query: str, session_id: str = "default") -> Dict[str, Any]:
         """
         Handle general query by routing to appropriate agent
@@ -291,4 +812,110 @@ class WorkflowOrchestrator:
             return {
                 "success": False,
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+    
+    async def ahandle_query(self, query: str, session_id: str = "default") -> Dict[str, Any]:
+        """Async counterpart of handle_query()"""
+        try:
+            if not query:
+                return {
+                    "success": False,
+                    "error": "Empty query provided"
+                }
+            
+            agent_name = self.router.route(query)
+            agent = self.registry.get_agent(agent_name)
+            
+            if not agent:
+                return {
+                    "success": False,
+                    "error": f"Agent {agent_name} not available"
+                }
+            
+            result = await agent.aprocess({"query": query})
+            
+            self.context.add_interaction(
+                session_id,
+                agent_name,
+                query,
+                result
+            )
+            
+            result["agent_used"] = agent_name
+            return result
+            
+        except Exception as e:
+            logger.error(f"Async query handling error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def handle_query_stream(self, query: str, session_id: str = "default") -> Dict[str, Any]:
+        """
+        Handle general query, streaming the answer when the agent supports it
+        
+        Args:
+            query: User's question
+            session_id: Session identifier
+            
+        Returns:
+            Agent response; LLM-backed answers are returned as an
+            'answer_stream' iterator instead of 'answer'
+        """
+        try:
+            if not query:
+                return {
+                    "success": False,
+                    "error": "Empty query provided"
+                }
+            
+            agent_name = self.router.route(query)
+            agent = self.registry.get_agent(agent_name)
+            
+            if not agent:
+                return {
+                    "success": False,
+                    "error": f"Agent {agent_name} not available"
+                }
+            
+            if not hasattr(agent, "process_stream"):
+                return self.handle_query(query, session_id)
+            
+            logger.info(f"Streaming query with agent: {agent_name}")
+            result = agent.process_stream({"query": query})
+            result["agent_used"] = agent_name
+            
+            if "answer_stream" in result:
+                result["answer_stream"] = self._record_streamed_answer(
+                    session_id, agent_name, query, result, result["answer_stream"]
+                )
+            else:
+                self.context.add_interaction(session_id, agent_name, query, result)
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"Streaming query handling error: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _record_streamed_answer(
+        self,
+        session_id: str,
+        agent_name: str,
+        query: str,
+        result: Dict[str, Any],
+        stream: Iterator[str]
+    ) -> Iterator[str]:
+        """Pass chunks through and store the full answer once streaming ends"""
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        
+        answer = {k: v for k, v in result.items() if k != "answer_stream"}
+        answer["answer"] = "".join(chunks)
+        self.context.add_interaction(session_id, agent_name, query, answer)
\ No newline at end of file
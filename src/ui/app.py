@@ -2,6 +2,7 @@ import streamlit as st
 import sys
 from pathlib import Path
 import json
+import re
 from datetime import datetime
 
 # Add src to path
@@ -101,6 +102,90 @@ with st.sidebar:
         for agent in status.get('agents', []):
             st.write(f"• {agent.replace('_', ' ').title()}")
     
+    with st.expander("⚡ LLM Connections"):
+        transport = status.get('transport', {})
+        st.write(f"Requests: {transport.get('requests', 0)}")
+        st.write(f"Connection reuse: {transport.get('reuse_rate', 0.0) * 100:.0f}%")
+        cache = status.get('cache', {})
+        if cache:
+            st.write(f"Cache hit rate: {cache.get('hit_rate', 0.0) * 100:.0f}% ({cache.get('hits', 0)} hits)")
+        coalescing = status.get('coalescing', {})
+        if coalescing.get('coalesced'):
+            st.write(f"Duplicate requests merged: {coalescing['coalesced']}")
+        retries = status.get('resilience', {}).get('retry', {}).get('retries', 0)
+        if retries:
+            st.write(f"Rate-limited requests retried: {retries}")
+        circuits = status.get('resilience', {}).get('circuits', {})
+        open_circuits = [name for name, c in circuits.items() if c.get('state') != 'closed']
+        if open_circuits:
+            st.warning(f"Failing over from: {', '.join(open_circuits)}")
+        models = status.get('warmup', {}).get('models', {})
+        cold_starts = sum(m.get('cold_starts', 0) for m in models.values())
+        if cold_starts:
+            load_seconds = sum(m.get('load_seconds', 0.0) for m in models.values())
+            st.write(f"Model cold starts: {cold_starts} ({load_seconds:.1f}s loading)")
+        context_reuse = status.get('context_reuse', {})
+        if context_reuse.get('hits'):
+            st.write(f"Shared prompt prefixes reused: {context_reuse['hits']}")
+        tokens = status.get('tokens', {})
+        if any(t.get('calls') for t in tokens.values()):
+            prompt_tokens = sum(t.get('prompt_tokens', 0) for t in tokens.values())
+            completion_tokens = sum(t.get('completion_tokens', 0) for t in tokens.values())
+            st.write(f"Tokens used: {prompt_tokens:,} prompt / {completion_tokens:,} completion")
+        compaction = status.get('compaction', {})
+        if compaction.get('tokens_saved'):
+            st.write(
+                f"Resume/JD compaction: ~{compaction['tokens_saved']:,} tokens saved "
+                f"({compaction['saved_ratio'] * 100:.0f}%)"
+            )
+        jd_analysis = status.get('jd_analysis', {})
+        if jd_analysis.get('cache_hits'):
+            st.write(
+                f"JD analyses reused: {jd_analysis['cache_hits'] + jd_analysis['disk_hits']} "
+                f"({jd_analysis['analyses']} JDs analysed)"
+            )
+        cascade = status.get('screening_cascade', {})
+        if cascade.get('llm_calls_saved'):
+            st.write(
+                f"Screenings decided without the LLM: {cascade['llm_calls_saved']} "
+                f"({cascade['savings_rate'] * 100:.0f}%)"
+            )
+        resume_index = status.get('resume_index', {})
+        if resume_index.get('documents'):
+            st.write(
+                f"Resume pool: {resume_index['documents']:,} indexed, "
+                f"BM25 search {resume_index['search_ms_avg']} ms avg ({resume_index['backend']})"
+            )
+        candidate_index = status.get('candidate_index', {})
+        if candidate_index.get('vectors'):
+            st.write(
+                f"Candidate ANN index: {candidate_index['vectors']:,} resumes, "
+                f"{candidate_index['lists']} lists, nprobe {candidate_index['nprobe']} "
+                f"({candidate_index['backend']}), {candidate_index['search_ms_avg']} ms/query"
+            )
+        matching = status.get('requisition_matching', {})
+        if matching.get('matrix_builds'):
+            st.write(
+                f"Role matching: {matching['candidates']['vectors']:,} candidates x "
+                f"{matching['requisitions']['vectors']} open roles ({matching['candidates']['embedder']}), "
+                f"matrix built in {matching['build_ms_avg']} ms avg"
+            )
+        dedup = status.get('resume_dedup', {})
+        if dedup.get('exact_duplicates') or dedup.get('near_duplicates'):
+            st.write(
+                f"Duplicate resumes: {dedup['exact_duplicates']} exact, {dedup['near_duplicates']} near "
+                f"({dedup['results_reused']} pipeline runs skipped)"
+            )
+        for agent_name, parse in status.get('structured_output', {}).items():
+            if parse.get('failed') or parse.get('repaired'):
+                st.write(
+                    f"{agent_name.replace('_', ' ').title()} JSON: {parse['failure_rate'] * 100:.0f}% failed, "
+                    f"{parse['repaired']} repaired"
+                )
+        semantic = status.get('semantic_cache', {})
+        if semantic:
+            st.write(f"Similar questions answered from cache: {semantic.get('hits', 0)}")
+    
     st.markdown("---")
     
     # Quick tips
@@ -354,6 +439,52 @@ with tab1:
                             st.success(f"✅ **{final_rec}**")
                         else:
                             st.warning(f"⚠️ **{final_rec}**")
+    
+    st.markdown("---")
+    with st.expander("📚 Batch Screening (many resumes, one job description)"):
+        batch_text = st.text_area(
+            "Paste resumes separated by a line containing only ---",
+            height=250,
+            key="batch_resumes"
+        )
+        batch_workers = st.slider("Parallel workers", 1, 16, 4, key="batch_workers")
+        
+        if st.button("🚀 Screen All", key="batch_btn"):
+            resumes = [r.strip() for r in re.split(r"^\s*---\s*$", batch_text, flags=re.MULTILINE) if r.strip()]
+            if not resumes:
+                st.error("⚠️ Please paste at least one resume")
+            elif not jd_text:
+                st.error("⚠️ Please provide a job description above")
+            else:
+                batch = crew.execute_task("batch_screening_stream", {
+                    "resumes": resumes,
+                    "job_description": jd_text,
+                    "max_workers": batch_workers
+                })
+                if not batch.get("success"):
+                    st.error(batch.get("error", "Batch screening failed"))
+                else:
+                    progress_bar = st.progress(0)
+                    live = st.empty()
+                    done = 0
+                    for event in batch["event_stream"]:
+                        if event["event"] == "candidate":
+                            done += 1
+                            progress_bar.progress(done / batch["total"])
+                            score = f"{event['score']}%" if event["success"] else f"failed: {event['error']}"
+                            live.text(f"{done}/{batch['total']} screened - {event['candidate_id']}: {score}")
+                        else:
+                            stats = event["stats"]
+                            st.success(
+                                f"Screened {stats['succeeded']}/{stats['candidates']} resumes "
+                                f"({stats['resumes_per_minute']} resumes/min, "
+                                f"avg {stats['latency_avg']:.1f}s per candidate, "
+                                f"{stats['deterministic_decisions']} decided without the LLM)"
+                            )
+                            st.markdown("**🏆 Shortlist**")
+                            st.table(event["shortlist"])
+                            if event["failed"]:
+                                st.warning(f"{len(event['failed'])} resumes could not be screened")
 # ============================================================================
 # TAB 2: INTERVIEW ASSISTANT
 # ============================================================================
@@ -622,17 +753,26 @@ with tab3:
                 result = crew.execute_task("onboarding", {
                     "employee_name": emp_name,
                     "role": emp_role,
-                    "start_date": str(start_date)
+                    "start_date": str(start_date),
+                    "stream": True
                 })
                 
                 if result.get("success"):
                     st.success("✅ Onboarding plan created!")
                     
-                    # Welcome Message
                     # Welcome Message
                     st.markdown("### 👋 Welcome Message")
                     welcome_msg = result.get("welcome_message", "")
                     
+                    if result.get("welcome_message_stream") is not None:
+                        # Render tokens as they arrive
+                        placeholder = st.empty()
+                        welcome_msg = ""
+                        for chunk in result["welcome_message_stream"]:
+                            welcome_msg += chunk
+                            placeholder.markdown(welcome_msg + "▌")
+                        placeholder.empty()
+                    
                     # Check if it's a string (should always be now)
                     if isinstance(welcome_msg, str):
                         # Clean display
@@ -739,13 +879,23 @@ with tab4:
         # Get AI response
         with st.chat_message("assistant"):
             with st.spinner("🤖 Searching policies..."):
-                result = crew.execute_task("query", {
+                result = crew.execute_task("query_stream", {
                     "query": prompt,
                     "session_id": "chatbot"
                 })
                 
                 if result.get("success"):
-                    response = result.get("answer", "I couldn't find relevant information.")
+                    if result.get("answer_stream") is not None:
+                        # Render tokens as they arrive
+                        placeholder = st.empty()
+                        response = ""
+                        for chunk in result["answer_stream"]:
+                            response += chunk
+                            placeholder.markdown(response + "▌")
+                        placeholder.empty()
+                        response = response or "I couldn't find relevant information."
+                    else:
+                        response = result.get("answer", "I couldn't find relevant information.")
                     
                     # Check for timeout errors
                     if "timeout" in response.lower() or "error:" in response.lower():
@@ -1,5 +1,10 @@
 """Utility Functions"""
 from .logger import logger, SystemLogger
 from .file_loader import FileLoader
+from .text_compactor import TextCompactor
+from .resume_parser import ResumeParser, parse_resume
+from .skill_taxonomy import SkillTaxonomy
+from .skill_matrix import SkillMatrix
+from .jd_analyzer import JDAnalyzer, JDAnalysis
 
-__all__ = ['logger', 'SystemLogger', 'FileLoader']
\ No newline at end of file
+__all__ = ['logger', 'SystemLogger', 'FileLoader', 'TextCompactor', 'ResumeParser', 'parse_resume', 'SkillTaxonomy', 'SkillMatrix', 'JDAnalyzer', 'JDAnalysis']
\ No newline at end of file
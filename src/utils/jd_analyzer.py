@@ -0,0 +1,313 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set
+from .skill_taxonomy import SkillTaxonomy
+from .logger import logger
+
+# Bump when extraction changes, so analyses persisted by an older version are redone
+ANALYZER_VERSION = 2
+
+# Section heading keywords -> requirement kind; nice-to-have is checked first
+# ("Preferred Qualifications" is not a must-have)
+_NICE_HEADINGS = ("preferred", "nice to have", "nice-to-have", "bonus", "desired", "plus", "optional")
+_REQUIRED_HEADINGS = ("required", "requirement", "qualification", "must have", "must-have",
+                      "what you need", "what you bring", "who you are", "minimum", "essential")
+_DUTY_HEADINGS = ("responsibilit", "what you'll do", "what you will do", "duties", "the role", "your role")
+# Stack inventories ("Technical Skills", "Tools") list what the team uses, not what a
+# candidate must have; they count as requirements only in a JD without any
+_STACK_HEADINGS = ("skills", "tech stack", "technologies", "tools")
+# A requirement line that marks itself optional wherever it appears
+_NICE_MARKER = re.compile(r"\b(?:a plus|nice to have|nice-to-have|preferred|bonus|desirable|ideally)\b", re.IGNORECASE)
+# Text between two skills that keeps them in one list ("AWS, Azure, or GCP"); an
+# "or" or "/" in the list makes it a set of alternatives
+_LIST_GAP = re.compile(r"^(?:[\s,/()]|\bor\b|\beither\b)*$", re.IGNORECASE)
+_ALTERNATIVE = re.compile(r"/|\bor\b", re.IGNORECASE)
+
+_HEADING = re.compile(r"^[#=*\s]*([A-Za-z][A-Za-z '&/-]{2,40}?)[#=*\s]*:?\s*$")
+_INLINE = re.compile(r"^([A-Za-z][A-Za-z '&/-]{2,40}):\s*(\S.*)$")
+_TITLE = re.compile(r"^(?:job\s+)?(?:title|position|role)\s*:\s*(.+)$", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*[-•●▪◦■►▶➢➤✓✔*·]\s*|^\s*\d+[.)]\s+")
+_YEARS = (
+    re.compile(r"(\d+)\+?\s*years?\s+(?:of\s+)?(?:[\w-]+\s+){0,3}experience"),
+    re.compile(r"experience.*?(\d+)\+?\s*years?")
+)
+# Title words -> seniority, most senior first
+_SENIORITY = (
+    ("principal", ("principal", "distinguished", "director", "head of", "vp ")),
+    ("staff", ("staff",)),
+    ("lead", ("lead", "manager")),
+    ("senior", ("senior", "sr.", "sr ")),
+    ("mid", ("mid-level", "mid level", "intermediate")),
+    ("junior", ("junior", "jr.", "jr ", "associate")),
+    ("entry", ("intern", "graduate", "entry level", "entry-level", "trainee")),
+)
+
+
+class JDAnalysis:
+    """What a job description asks for, extracted once per JD"""
+    
+    def __init__(
+        self,
+        jd_hash: str,
+        title: str = "",
+        seniority: str = "",
+        required_years: int = 0,
+        required_skills: Optional[List[str]] = None,
+        nice_to_have_skills: Optional[List[str]] = None,
+        required_groups: Optional[List[List[str]]] = None,
+        must_haves: Optional[List[str]] = None,
+        nice_to_haves: Optional[List[str]] = None,
+        responsibilities: Optional[List[str]] = None,
+        tech_stack: Optional[List[str]] = None
+    ):
+        self.jd_hash = jd_hash
+        self.title = title
+        self.seniority = seniority
+        self.required_years = required_years
+        self.required_skills = required_skills or []
+        self.nice_to_have_skills = nice_to_have_skills or []
+        # One entry per requirement; any skill in a group satisfies it
+        self.required_groups = required_groups or [[skill] for skill in self.required_skills]
+        self.must_haves = must_haves or []
+        self.nice_to_haves = nice_to_haves or []
+        self.responsibilities = responsibilities or []
+        self.tech_stack = tech_stack or []
+    
+    @property
+    def structured(self) -> bool:
+        """True if requirement lines were found; render() then stands in for the JD"""
+        return bool(self.must_haves or self.tech_stack)
+    
+    def render(self) -> str:
+        """Compact prompt text: role, seniority and requirement lines only"""
+        role = self.title or "Not stated"
+        if self.seniority:
+            role += f" ({self.seniority}"
+            role += f", {self.required_years}+ years)" if self.required_years else ")"
+        parts = [f"ROLE: {role}"]
+        for label, lines in (
+            ("MUST HAVE", self.must_haves),
+            ("NICE TO HAVE", self.nice_to_haves),
+            ("TECH STACK", self.tech_stack),
+            ("RESPONSIBILITIES", self.responsibilities)
+        ):
+            if lines:
+                parts.append(f"{label}:\n" + "\n".join(f"- {line}" for line in lines))
+        return "\n\n".join(parts)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JDAnalysis":
+        return cls(**data)
+
+
+class JDAnalyzer:
+    """Extract requirements from a JD once per content hash and share them
+
+    Every candidate screened against a requisition, and every interview
+    for it, needs the same reading of the JD. Analyses are memoised by
+    sha256 of the JD text and, when `path` is given, written there as one
+    JSON file per JD so a restart does not redo them.
+    """
+    
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None, path: Optional[str] = None, max_entries: int = 256):
+        self.taxonomy = taxonomy or SkillTaxonomy.default()
+        self.max_entries = max_entries
+        self._dir = Path(path) if path else None
+        self._cache: "OrderedDict[str, JDAnalysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"analyses": 0, "cache_hits": 0, "disk_hits": 0}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "JDAnalyzer":
+        """Build from `agents.resume_screening.jd_analysis` in settings.yaml"""
+        return cls(path=config.get("path"), max_entries=int(config.get("max_entries", 256)))
+    
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(f"v{ANALYZER_VERSION}|{text or ''}".encode("utf-8")).hexdigest()
+    
+    def analyze(self, text: str) -> JDAnalysis:
+        key = self.key(text)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return cached
+        
+        analysis = self._load(key)
+        if analysis is None:
+            analysis = self._analyze(key, text or "")
+            self._save(analysis)
+            stat = "analyses"
+        else:
+            stat = "disk_hits"
+        
+        with self._lock:
+            self._cache[key] = analysis
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self._stats[stat] += 1
+        return analysis
+    
+    def _file(self, key: str) -> Optional[Path]:
+        return self._dir / f"{key}.json" if self._dir else None
+    
+    def _load(self, key: str) -> Optional[JDAnalysis]:
+        path = self._file(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return JDAnalysis.from_dict(json.load(f))
+        except Exception as e:
+            logger.warning(f"Could not read JD analysis {path.name}: {e}")
+            return None
+    
+    def _save(self, analysis: JDAnalysis):
+        path = self._file(analysis.jd_hash)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(analysis.to_dict(), f)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning(f"Could not persist JD analysis: {e}")
+    
+    @staticmethod
+    def _kind(label: str) -> Optional[str]:
+        label = label.lower()
+        if any(word in label for word in _NICE_HEADINGS):
+            return "nice"
+        if any(word in label for word in _DUTY_HEADINGS):
+            return "duty"
+        if any(word in label for word in _REQUIRED_HEADINGS):
+            return "required"
+        if any(word in label for word in _STACK_HEADINGS):
+            return "stack"
+        return None
+    
+    def _analyze(self, key: str, text: str) -> JDAnalysis:
+        title = ""
+        sections: Dict[str, List[str]] = {"required": [], "nice": [], "duty": [], "stack": []}
+        # Everything but the nice-to-have lines, for required skills
+        general: List[str] = []
+        current = None
+        
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+            titled = _TITLE.match(line)
+            if titled and not title:
+                title = titled.group(1).strip()
+                general.append(line)
+                continue
+            
+            heading = _HEADING.match(line)
+            if heading and (line.endswith(":") or (line.isupper() and (" " in line or self._kind(line)))):
+                current = self._kind(heading.group(1))
+                continue
+            inline = _INLINE.match(line)
+            if inline and self._kind(inline.group(1)):
+                # "Nice to have: Kafka, Go" carries its content on the heading line
+                current = self._kind(inline.group(1))
+                line = inline.group(2)
+            
+            item = _BULLET.sub("", line).strip()
+            kind = "nice" if current == "required" and _NICE_MARKER.search(item) else current
+            if kind is not None and item:
+                sections[kind].append(item)
+            if kind != "nice":
+                general.append(line)
+        
+        if not title:
+            first = next((line.strip() for line in text.splitlines() if line.strip()), "")
+            title = first if len(first) <= 80 and not first.endswith(".") else ""
+        
+        # Required skills come from the must-have lines; a stack inventory, then
+        # the whole JD (less nice-to-haves), only stand in when it has none
+        groups = self._skill_groups(sections["required"] or sections["stack"] or general)
+        required = {skill for group in groups for skill in group}
+        nice = self.taxonomy.extract("\n".join(sections["nice"])) - required
+        required_years = self._years("\n".join(sections["required"])) or self._years(text)
+        return JDAnalysis(
+            jd_hash=key,
+            title=title,
+            seniority=self._seniority(title, required_years),
+            required_years=required_years,
+            required_skills=sorted(required),
+            nice_to_have_skills=sorted(nice),
+            required_groups=groups,
+            must_haves=sections["required"],
+            nice_to_haves=sections["nice"],
+            responsibilities=sections["duty"],
+            tech_stack=sections["stack"]
+        )
+    
+    def _skill_groups(self, lines: List[str]) -> List[List[str]]:
+        """Requirements as skill groups: "Python or Node.js" is one group, "SQL and NoSQL" two"""
+        groups: List[List[str]] = []
+        seen: Set[str] = set()
+        for line in lines:
+            matches = self.taxonomy.find(line)
+            runs: List[List[str]] = []
+            alternative = []
+            for previous, match in zip([None] + matches, matches):
+                gap = line[previous.end:match.start] if previous else None
+                if gap is not None and _LIST_GAP.match(gap):
+                    runs[-1].append(match.skill_id)
+                    alternative[-1] = alternative[-1] or bool(_ALTERNATIVE.search(gap))
+                else:
+                    runs.append([match.skill_id])
+                    alternative.append(False)
+            
+            for run, is_alternative in zip(runs, alternative):
+                for group in ([run] if is_alternative else [[skill] for skill in run]):
+                    group = [skill for skill in dict.fromkeys(group) if skill not in seen]
+                    if group:
+                        seen.update(group)
+                        groups.append(sorted(group))
+        return groups
+    
+    @staticmethod
+    def _years(text: str) -> int:
+        lowered = text.lower()
+        for pattern in _YEARS:
+            match = pattern.search(lowered)
+            if match:
+                return int(match.group(1))
+        return 0
+    
+    @staticmethod
+    def _seniority(title: str, required_years: int) -> str:
+        lowered = f" {title.lower()} "
+        for level, words in _SENIORITY:
+            if any(word in lowered for word in words):
+                return level
+        if required_years >= 7:
+            return "senior"
+        if required_years >= 3:
+            return "mid"
+        if required_years >= 1:
+            return "junior"
+        return ""
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._cache)
+        total = stats["analyses"] + stats["cache_hits"] + stats["disk_hits"]
+        stats["reuse_rate"] = round((total - stats["analyses"]) / total, 3) if total else 0.0
+        return stats
\ No newline at end of file
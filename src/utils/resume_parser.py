@@ -0,0 +1,238 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, NamedTuple, Sequence
+
+SECTIONS = ("contact", "summary", "skills", "experience", "education", "certifications")
+
+# Heading text (lowercased, without trailing colon) -> section type
+_HEADINGS = {
+    "summary": "summary", "professional summary": "summary", "profile": "summary",
+    "professional profile": "summary", "objective": "summary", "career objective": "summary",
+    "about me": "summary", "about": "summary",
+    "skills": "skills", "technical skills": "skills", "key skills": "skills", "core skills": "skills",
+    "core competencies": "skills", "competencies": "skills", "technologies": "skills",
+    "tech stack": "skills", "skills & tools": "skills", "skills and tools": "skills",
+    "experience": "experience", "work experience": "experience", "professional experience": "experience",
+    "employment": "experience", "employment history": "experience", "work history": "experience",
+    "career history": "experience", "relevant experience": "experience",
+    "education": "education", "academic background": "education", "education and training": "education",
+    "education & training": "education", "qualifications": "education", "academic qualifications": "education",
+    "certifications": "certifications", "certification": "certifications", "certificates": "certifications",
+    "licenses": "certifications", "licenses & certifications": "certifications",
+    "licenses and certifications": "certifications", "certifications & licenses": "certifications",
+    "contact": "contact", "contact information": "contact", "personal details": "contact",
+}
+# Other short title-case/upper-case lines (PROJECTS, AWARDS, ...) start untyped sections
+_OTHER_HEADING = re.compile(r"^[A-Z][A-Za-z &/]{2,30}$")
+_HEADING_DECOR = re.compile(r"^[#=*\-\s]+|[#=*:\-\s]+$")
+_INLINE_HEADING = re.compile(r"^([A-Za-z][A-Za-z &]{1,30}):\s*(\S.*)$")
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+|\d{{1,2}}/)?(?:19|20)\d{{2}}"
+_DATE_RANGE = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|present|current|now|today)",
+    re.IGNORECASE
+)
+_CONTACT = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+|\+?\(?\d[\d\s().-]{8,}\d|https?://|www\.|linkedin\.com|github\.com", re.IGNORECASE)
+_BULLET = re.compile(r"^\s*[-•●▪◦■►▶➢➤✓✔*·]\s*")
+_SKILL_SPLIT = re.compile(r"[,;|•\n]|\s+/\s+")
+
+
+class ExperienceEntry(NamedTuple):
+    """One role: header lines (title, employer), its date range and body lines"""
+    header: str
+    start: Optional[str]
+    end: Optional[str]
+    lines: List[str]
+    
+    @property
+    def text(self) -> str:
+        return "\n".join([self.header] + self.lines)
+
+
+class ParsedResume:
+    """Typed resume sections; render() rebuilds prompt text from the ones asked for"""
+    
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.sections: Dict[str, str] = {}
+        self.other: Dict[str, str] = {}
+        self.skills: List[str] = []
+        self.experience: List[ExperienceEntry] = []
+    
+    @property
+    def structured(self) -> bool:
+        """True if any content section was recognised; unstructured text renders as-is"""
+        return any(name in self.sections for name in SECTIONS[2:])
+    
+    def render(self, names: Sequence[str]) -> str:
+        """Prompt text made of only the named sections, in the order given"""
+        if not self.structured:
+            return self.raw
+        parts = []
+        for name in names:
+            text = self.sections.get(name) or self.other.get(name)
+            if text:
+                parts.append(f"{name.upper()}:\n{text}")
+        return "\n\n".join(parts)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.sections,
+            "skills": self.skills,
+            "experience": [entry._asdict() for entry in self.experience],
+            "other": dict(self.other)
+        }
+
+
+class ResumeParser:
+    """Split resume text into typed sections, memoised by content hash
+
+    Every agent in a pipeline parses the same resume, so the parse is
+    done once and shared.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, ParsedResume]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"parses": 0, "cache_hits": 0}
+    
+    def parse(self, text: str) -> ParsedResume:
+        key = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return cached
+        
+        parsed = self._parse(text or "")
+        
+        with self._lock:
+            self._cache[key] = parsed
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self._stats["parses"] += 1
+        return parsed
+    
+    @staticmethod
+    def _heading(line: str) -> Optional[str]:
+        """Section name if the line is a heading"""
+        label = _HEADING_DECOR.sub("", line).strip()
+        if not label or len(label) > 40:
+            return None
+        known = _HEADINGS.get(label.lower())
+        if known:
+            return known
+        if line.rstrip().endswith(":") or label.isupper():
+            if _OTHER_HEADING.match(label) and not _DATE_RANGE.search(label):
+                return label.lower()
+        return None
+    
+    def _parse(self, text: str) -> ParsedResume:
+        parsed = ParsedResume(text)
+        blocks: "OrderedDict[str, List[str]]" = OrderedDict()
+        current = None
+        
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+            
+            # "SKILLS: Python, Docker" carries its content on the heading line
+            inline = _INLINE_HEADING.match(line)
+            if inline and inline.group(1).strip().lower() in _HEADINGS:
+                current = _HEADINGS[inline.group(1).strip().lower()]
+                blocks.setdefault(current, []).append(inline.group(2).strip())
+                continue
+            
+            heading = self._heading(line)
+            if heading:
+                current = heading
+                blocks.setdefault(current, [])
+                continue
+            
+            if current is None:
+                # Name, email and phone come before the first heading
+                current_block = "contact" if _CONTACT.search(line) or not blocks.get("contact") else "summary"
+                blocks.setdefault(current_block, []).append(line)
+                continue
+            blocks[current].append(line)
+        
+        for name, lines in blocks.items():
+            if not lines:
+                continue
+            if name in SECTIONS:
+                parsed.sections[name] = "\n".join(lines)
+            else:
+                parsed.other[name] = "\n".join(lines)
+        
+        parsed.skills = self._skills(blocks.get("skills", []))
+        parsed.experience = self._experience(blocks.get("experience", []))
+        return parsed
+    
+    @staticmethod
+    def _skills(lines: List[str]) -> List[str]:
+        skills = []
+        seen = set()
+        for line in lines:
+            line = _BULLET.sub("", line)
+            # "Languages: Python, Go" -> drop the group label
+            if ":" in line:
+                line = line.split(":", 1)[1]
+            for skill in _SKILL_SPLIT.split(line):
+                skill = skill.strip(" .()")
+                if skill and len(skill) <= 40 and skill.lower() not in seen:
+                    seen.add(skill.lower())
+                    skills.append(skill)
+        return skills
+    
+    @staticmethod
+    def _experience(lines: List[str]) -> List[ExperienceEntry]:
+        """Group experience lines into entries, each starting at a date range"""
+        entries = []
+        header: List[str] = []
+        dates = None
+        body: List[str] = []
+        
+        def flush():
+            if header or body:
+                start, end = dates if dates else (None, None)
+                entries.append(ExperienceEntry(" | ".join(header), start, end, list(body)))
+        
+        for line in lines:
+            match = _DATE_RANGE.search(line)
+            if match:
+                # A short undated title/employer line just above belongs to this entry
+                carried = []
+                if body and not _BULLET.match(body[-1]) and len(body[-1]) < 60 and not body[-1].endswith("."):
+                    carried = [body.pop()]
+                elif not dates and header and not body:
+                    carried, header = header, []
+                flush()
+                header = carried + [line]
+                dates = (match.group("start"), match.group("end"))
+                body = []
+            elif not dates and not body and not _BULLET.match(line):
+                header.append(line)
+            else:
+                body.append(line)
+        flush()
+        return entries
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._cache)
+        return stats
+
+
+_default_parser = ResumeParser()
+
+
+def parse_resume(text: str) -> ParsedResume:
+    """Parse with the shared, memoised parser"""
+    return _default_parser.parse(text)
\ No newline at end of file
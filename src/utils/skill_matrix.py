@@ -0,0 +1,170 @@
+import threading
+import time
+from typing import Dict, Any, List, Iterable, Optional, Set
+import numpy as np
+from .skill_taxonomy import SkillTaxonomy
+
+# Bits set per byte value, for NumPy versions without np.bitwise_count
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount_rows(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits in each row of a uint64 matrix"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).sum(axis=1, dtype=np.int64)
+    return _POPCOUNT8[bits.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def _matched(bits: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Per-row count of the mask's bits, reading only the words the mask uses"""
+    words = np.flatnonzero(mask)
+    if not len(words):
+        return np.zeros(len(bits), dtype=np.int64)
+    return popcount_rows(bits[:, words] & mask[words])
+
+
+class SkillMatrix:
+    """Candidates' canonical skills as fixed-width bitsets, one uint64 row each
+
+    Column i is the i-th skill of the taxonomy. Matching a JD against
+    the pool is a vectorised AND plus popcount over the whole matrix,
+    at len(taxonomy)/8 bytes per candidate instead of a Python set.
+    """
+    
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None, capacity: int = 1024):
+        self.taxonomy = taxonomy or SkillTaxonomy.default()
+        self._columns = {skill_id: column for column, skill_id in enumerate(self.taxonomy.skills)}
+        self._skill_ids = list(self.taxonomy.skills)
+        self.words = max(1, -(-len(self._columns) // 64))
+        
+        self._lock = threading.Lock()
+        self._bits = np.zeros((max(1, capacity), self.words), dtype=np.uint64)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._stats = {"queries": 0, "query_seconds": 0.0}
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids)
+    
+    def canonical(self, skills: Iterable[str]) -> Set[str]:
+        """Taxonomy ids for skill names or aliases ("K8s" -> kubernetes); unknown ones are dropped"""
+        found = set()
+        for skill in skills:
+            skill_id = str(skill).strip().lower()
+            if skill_id in self._columns:
+                found.add(skill_id)
+            else:
+                found |= self.taxonomy.extract(str(skill))
+        return found
+    
+    def mask(self, skills: Iterable[str]) -> np.ndarray:
+        """Bitset row for a set of skills"""
+        mask = np.zeros(self.words, dtype=np.uint64)
+        for skill_id in self.canonical(skills):
+            column = self._columns[skill_id]
+            mask[column >> 6] |= np.uint64(1) << np.uint64(column & 63)
+        return mask
+    
+    def add(self, candidate_id: str, skills: Iterable[str]):
+        """Store (or replace) a candidate's skills"""
+        mask = self.mask(skills)
+        with self._lock:
+            row = self._rows.get(candidate_id)
+            if row is None:
+                row = len(self._ids)
+                if row == len(self._bits):
+                    # Grow by doubling so adds stay amortised O(1)
+                    self._bits = np.concatenate([self._bits, np.zeros_like(self._bits)])
+                self._rows[candidate_id] = row
+                self._ids.append(candidate_id)
+            self._bits[row] = mask
+    
+    def remove(self, candidate_id: str) -> bool:
+        """Drop a candidate, moving the last row into its slot"""
+        with self._lock:
+            row = self._rows.pop(candidate_id, None)
+            if row is None:
+                return False
+            last = len(self._ids) - 1
+            if row != last:
+                self._bits[row] = self._bits[last]
+                self._ids[row] = self._ids[last]
+                self._rows[self._ids[row]] = row
+            self._bits[last] = 0
+            self._ids.pop()
+            return True
+    
+    def add_text(self, candidate_id: str, text: str):
+        """Store the skills the taxonomy finds in a resume"""
+        self.add(candidate_id, self.taxonomy.extract(text or ""))
+    
+    def skills(self, candidate_id: str) -> Set[str]:
+        with self._lock:
+            row = self._rows.get(candidate_id)
+            if row is None:
+                return set()
+            bits = np.unpackbits(self._bits[row].view(np.uint8), bitorder="little")
+        return {self._skill_ids[column] for column in np.flatnonzero(bits) if column < len(self._skill_ids)}
+    
+    def counts(self, skills: Iterable[str]) -> np.ndarray:
+        """How many of the given skills each stored candidate has, in insertion order"""
+        mask = self.mask(skills)
+        with self._lock:
+            return _matched(self._bits[:len(self._ids)], mask)
+    
+    def match(
+        self,
+        required: Iterable[str],
+        nice_to_have: Iterable[str] = (),
+        min_required: Optional[int] = None,
+        top_k: int = 50
+    ) -> Dict[str, Any]:
+        """Candidates with at least min_required of the required skills, best first
+
+        Ranked by required skills matched, then nice-to-have ones.
+        min_required defaults to all of them.
+        """
+        started = time.perf_counter()
+        required = self.canonical(required)
+        nice_to_have = self.canonical(nice_to_have) - required
+        required_mask, nice_mask = self.mask(required), self.mask(nice_to_have)
+        if min_required is None:
+            min_required = len(required)
+        
+        with self._lock:
+            bits = self._bits[:len(self._ids)]
+            required_counts = _matched(bits, required_mask)
+            nice_counts = _matched(bits, nice_mask)
+            selected = np.flatnonzero(required_counts >= min_required)
+            order = np.lexsort((selected, -nice_counts[selected], -required_counts[selected]))
+            best = selected[order[:top_k]]
+            candidates = [
+                {
+                    "candidate_id": self._ids[row],
+                    "required_matched": int(required_counts[row]),
+                    "nice_matched": int(nice_counts[row]),
+                    "score": round(int(required_counts[row]) / len(required) * 100, 1) if required else 100.0
+                }
+                for row in best
+            ]
+            self._stats["queries"] += 1
+            self._stats["query_seconds"] += time.perf_counter() - started
+        
+        return {
+            "required": sorted(required),
+            "nice_to_have": sorted(nice_to_have),
+            "min_required": min_required,
+            "total": len(selected),
+            "candidates": candidates
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["candidates"] = len(self._ids)
+        stats["skills"] = len(self._columns)
+        stats["bytes"] = stats["candidates"] * self.words * 8
+        seconds = stats.pop("query_seconds")
+        stats["query_ms_avg"] = round(seconds / stats["queries"] * 1000, 2) if stats["queries"] else 0.0
+        return stats
\ No newline at end of file
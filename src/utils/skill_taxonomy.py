@@ -0,0 +1,203 @@
+"""
+Skill Taxonomy - canonical skills and aliases matched in resumes and JDs
+
+data/skills/taxonomy.yaml is a seed list of a few hundred common
+technical and business skills, not a complete taxonomy. Extend it by
+adding `{id, name, category, aliases}` entries to that file, or build a
+larger one (e.g. exported from ESCO or O*NET) and load it with
+SkillTaxonomy.load(path). Matching cost does not grow with the number
+of skills, so thousands of entries are fine.
+"""
+import threading
+from pathlib import Path
+from typing import Dict, Any, List, Optional, NamedTuple, Iterable, Set
+import yaml
+from .logger import logger
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).resolve().parents[2] / "data" / "skills" / "taxonomy.yaml"
+
+# Used when the taxonomy file is missing: the original ResumeScorer keyword list
+_FALLBACK_SKILLS = [
+    "python", "java", "javascript", "typescript", "c++", "c#",
+    "react", "angular", "vue", "node.js", "django", "flask",
+    "aws", "azure", "gcp", "docker", "kubernetes",
+    "sql", "postgresql", "mongodb", "redis",
+    "machine learning", "deep learning", "nlp", "computer vision",
+    "git", "ci/cd", "agile", "scrum"
+]
+
+
+class SkillMatch(NamedTuple):
+    """A skill mention: canonical id and [start, end) offsets in the original text"""
+    skill_id: str
+    start: int
+    end: int
+    text: str
+
+
+class _AhoCorasick:
+    """Multi-pattern automaton: one pass over the text finds every alias"""
+    
+    def __init__(self, patterns: Dict[str, str]):
+        # Trie as parallel lists: goto transitions, failure links, outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]]
+        
+        for pattern, skill_id in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), skill_id))
+        
+        # Breadth-first failure links; outputs inherit their suffixes' outputs
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+    
+    def __len__(self) -> int:
+        return len(self._goto)
+    
+    def iter(self, text: str) -> Iterable[tuple]:
+        """Yield (end_index, pattern_length, skill_id) for every occurrence
+
+        Runs of whitespace in the text are read as one space, so the
+        pattern length is in normalised characters.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        previous_space = False
+        for i, ch in enumerate(text):
+            if ch.isspace():
+                if previous_space:
+                    continue
+                ch = " "
+                previous_space = True
+            else:
+                previous_space = False
+            
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, skill_id in out[node]:
+                yield i + 1, length, skill_id
+
+
+class SkillTaxonomy:
+    """Canonical skills with aliases, compiled once into a single-pass matcher
+
+    Matching is case-insensitive, needs word boundaries on both sides
+    and prefers the longest alias ("machine learning" over "learning").
+    Cost is linear in the text length whatever the taxonomy size.
+    """
+    
+    _default: Optional["SkillTaxonomy"] = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self, skills: List[Dict[str, Any]]):
+        self.skills: Dict[str, Dict[str, Any]] = {}
+        patterns: Dict[str, str] = {}
+        for skill in skills:
+            skill_id = str(skill["id"]).lower()
+            self.skills[skill_id] = {
+                "id": skill_id,
+                "name": skill.get("name", skill["id"]),
+                "category": skill.get("category")
+            }
+            # Display names are not matched: "Go" or "R" would hit ordinary words
+            for alias in [skill_id] + list(skill.get("aliases") or []):
+                alias = " ".join(str(alias).lower().split())
+                if not alias:
+                    continue
+                if patterns.get(alias, skill_id) != skill_id:
+                    logger.warning(f"Skill alias '{alias}' claimed by {patterns[alias]} and {skill_id}")
+                    continue
+                patterns[alias] = skill_id
+        
+        self.alias_count = len(patterns)
+        self._automaton = _AhoCorasick(patterns)
+    
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "SkillTaxonomy":
+        """Load a taxonomy YAML file ({skills: [{id, name, category, aliases}]})"""
+        path = Path(path) if path else DEFAULT_TAXONOMY_PATH
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+            taxonomy = cls(data.get("skills") or [])
+            logger.info(f"Skill taxonomy loaded: {len(taxonomy.skills)} skills, {taxonomy.alias_count} aliases")
+            return taxonomy
+        except FileNotFoundError:
+            logger.warning(f"Skill taxonomy not found: {path}, using built-in skill list")
+        except Exception as e:
+            logger.error(f"Error loading skill taxonomy {path}: {e}")
+        return cls([{"id": skill} for skill in _FALLBACK_SKILLS])
+    
+    @classmethod
+    def default(cls) -> "SkillTaxonomy":
+        """Shared taxonomy from data/skills/taxonomy.yaml, compiled on first use"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls.load()
+            return cls._default
+    
+    @staticmethod
+    def _lower(text: str) -> str:
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        # A few characters lowercase to two ("İ"); keep offsets aligned
+        return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+    
+    def find(self, text: str) -> List[SkillMatch]:
+        """All skill mentions in text order, longest alias winning on overlaps"""
+        if not text:
+            return []
+        lowered = self._lower(text)
+        candidates = []
+        for end, length, skill_id in self._automaton.iter(lowered):
+            # Walk back `length` normalised characters to the original start
+            start, remaining = end, length
+            while remaining:
+                start -= 1
+                if not (lowered[start].isspace() and start > 0 and lowered[start - 1].isspace()):
+                    remaining -= 1
+            if start > 0 and lowered[start - 1].isalnum():
+                continue
+            if end < len(lowered) and lowered[end].isalnum():
+                continue
+            candidates.append((start, end, skill_id))
+        
+        matches = []
+        last_end = -1
+        for start, end, skill_id in sorted(candidates, key=lambda c: (c[0], c[0] - c[1])):
+            if start >= last_end:
+                matches.append(SkillMatch(skill_id, start, end, text[start:end]))
+                last_end = end
+        return matches
+    
+    def extract(self, text: str) -> Set[str]:
+        """Canonical ids of the skills mentioned in text"""
+        return {match.skill_id for match in self.find(text)}
+    
+    def name(self, skill_id: str) -> str:
+        """Display name for a canonical id"""
+        return self.skills.get(skill_id, {}).get("name", skill_id)
+    
+    def category(self, skill_id: str) -> Optional[str]:
+        """Taxonomy category of a canonical id (language, cloud, soft, ...)"""
+        return self.skills.get(skill_id, {}).get("category")
\ No newline at end of file
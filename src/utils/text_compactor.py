@@ -0,0 +1,141 @@
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, NamedTuple
+from ..llm.tokens import estimate_tokens
+
+# Bullet glyphs pasted from Word/PDF resumes, normalised to "- "
+_BULLET = re.compile(r"^\s*[•●▪◦■□►▶➢➤✓✔❖◆◇‣⁃∙·*\-–—]+\s+")
+_INVISIBLE = re.compile("[\u200b-\u200f\u2060\ufeff\u00ad]")
+_SPACES = re.compile(r"[ \t]+")
+_RULE = re.compile(r"^[\s\-_=*~.·•|#]{3,}$")
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_URL = re.compile(r"(https?://|www\.)\S+|\b(linkedin|github)\.com/\S*", re.IGNORECASE)
+# Phone-shaped only: labelled, international (+) or with a bracketed area code
+_PHONE = re.compile(
+    r"\b(?:phone|tel|mobile|cell)\b\.?\s*:?\s*\+?\(?\d[\d\s().-]{5,}\d"
+    r"|\+\d[\d\s().-]{5,}\d"
+    r"|\(\d{2,4}\)\s*\d[\d\s.-]{4,}\d",
+    re.IGNORECASE
+)
+# Employment dates are never phone numbers: "2015 - 2018", "05.2015 - 08.2018"
+_YEAR_RANGE = re.compile(r"(?:19|20)\d{2}\s*[-–—]\s*(?:\d{1,2}[./])?(?:19|20)\d{2}")
+_CONTACT_LABEL = re.compile(
+    r"\b(e-?mail|phone|mobile|tel|cell|contact|linkedin|github|portfolio|website|address)\b\s*:?",
+    re.IGNORECASE
+)
+
+# Whole lines that carry no information for screening or verification
+_BOILERPLATE = [re.compile(p, re.IGNORECASE) for p in (
+    r"^(curriculum vitae|resume|résumé|cv)$",
+    r"^page \d+( of \d+)?$",
+    r"^\d+\s*/\s*\d+$",
+    r"^references( are)? available (up)?on request\.?$",
+    r"^(strictly )?(private (and|&) )?confidential$",
+    r".*\bequal opportunity employer\b.*",
+    r".*\b(without regard to|regardless of) (race|age|gender)\b.*",
+    r"^(apply now|click here to apply|how to apply:?)$",
+    r"^(please )?(share|forward) this (job|posting).*$",
+)]
+
+# Repeated lines shorter than this (headings like "Python") are kept
+_MIN_DEDUPE_CHARS = 20
+
+
+class CompactedText(NamedTuple):
+    """Compaction result with the token estimates before and after"""
+    text: str
+    tokens_before: int
+    tokens_after: int
+    
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+class TextCompactor:
+    """Deterministic clean-up of pasted resumes and job descriptions before prompting
+
+    Normalises unicode, whitespace and bullet glyphs, drops contact
+    lines, page headers/footers and boilerplate, and removes repeated
+    lines. Results are cached by content hash, so every agent in a
+    pipeline (and every rerun) gets the same compacted text.
+    """
+    
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, CompactedText]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"compactions": 0, "cache_hits": 0, "tokens_before": 0, "tokens_after": 0}
+    
+    def compact(self, text: str) -> CompactedText:
+        """Compact text, serving repeats from the content-hash cache"""
+        if not text:
+            return CompactedText(text or "", 0, 0)
+        
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._stats["cache_hits"] += 1
+                return cached
+        
+        compacted = self._compact(text)
+        result = CompactedText(compacted, estimate_tokens(text), estimate_tokens(compacted))
+        
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+            self._stats["compactions"] += 1
+            self._stats["tokens_before"] += result.tokens_before
+            self._stats["tokens_after"] += result.tokens_after
+        return result
+    
+    def _compact(self, text: str) -> str:
+        text = _INVISIBLE.sub("", unicodedata.normalize("NFKC", text))
+        
+        lines = []
+        seen = set()
+        for raw in text.splitlines():
+            line = self._strip_contact(_SPACES.sub(" ", raw)).strip()
+            if not line or _RULE.match(line):
+                lines.append("")
+                continue
+            if any(pattern.match(line) for pattern in _BOILERPLATE):
+                continue
+            
+            line = _BULLET.sub("- ", line)
+            # Page headers/footers and copy-pasted bullets repeat verbatim
+            folded = line.casefold()
+            if len(line) >= _MIN_DEDUPE_CHARS and folded in seen:
+                continue
+            seen.add(folded)
+            lines.append(line)
+        
+        # One blank line between blocks at most
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    
+    @staticmethod
+    def _strip_contact(line: str) -> str:
+        """Remove emails, URLs and phone numbers; a line of only those and their labels becomes empty"""
+        stripped = _URL.sub(" ", _EMAIL.sub(" ", line))
+        stripped = _PHONE.sub(lambda m: m.group() if _YEAR_RANGE.search(m.group()) else " ", stripped)
+        if stripped == line:
+            return line
+        if not re.search(r"\w", _CONTACT_LABEL.sub(" ", stripped)):
+            return ""
+        # Keep the rest (e.g. the name) without dangling separators
+        return re.sub(r"(\s*[|,;•·]\s*)+$|^(\s*[|,;•·]\s*)+", "", re.sub(r"(\s*[|•·]\s*){2,}", " | ", stripped))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._cache)
+        stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+        stats["saved_ratio"] = round(stats["tokens_saved"] / stats["tokens_before"], 3) if stats["tokens_before"] else 0.0
+        return stats
\ No newline at end of file
@@ -86,6 +86,13 @@ class TestDocumentVerificationAgent:
             # Might find future dates or gaps
             assert isinstance(issues, list)
     
+    def test_prompt_keeps_claims_to_check(self, doc_agent, clean_resume):
+        """Skills and summary reach the LLM for the skill-experience checks; contact details don't"""
+        prompt = doc_agent._prepare_request({"resume": clean_resume})["llm"]["prompt"]
+        
+        assert "JavaScript" in prompt and "Software Engineer" in prompt
+        assert "TechCo" in prompt and "Jane Smith" not in prompt
+    
     def test_missing_resume(self, doc_agent):
         """Test missing resume handling"""
         result = doc_agent.process({})
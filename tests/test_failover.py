@@ -0,0 +1,203 @@
+"""
+Tests for Circuit Breaker and Provider Failover
+"""
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm.circuit_breaker import CircuitBreaker
+from src.llm.failover import FailoverClient
+from src.llm.model_router import ModelRouter
+
+
+class StubProvider:
+    """Stand-in provider returning canned results"""
+    
+    def __init__(self, name, result="ok", delay=0.0):
+        self.provider = name
+        self.model = f"{name}-model"
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+    
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.result if self.result.startswith("Error:") else f"{self.provider}: {prompt}"
+    
+    async def agenerate(self, prompt, **kwargs):
+        return self.generate(prompt, **kwargs)
+    
+    def generate_stream(self, prompt, **kwargs):
+        self.calls += 1
+        if self.result.startswith("Error:"):
+            yield self.result
+            return
+        yield f"{self.provider}:"
+        yield f" {prompt}"
+
+
+def make_chain(*providers, **breaker_options):
+    return FailoverClient([
+        (p, CircuitBreaker(p.provider, **breaker_options)) for p in providers
+    ])
+
+
+class TestCircuitBreaker:
+    """Test suite for circuit breaker state transitions"""
+    
+    def test_opens_after_consecutive_failures(self):
+        """Failures up to the threshold open the circuit"""
+        breaker = CircuitBreaker("test", failure_threshold=2, recovery_timeout=60)
+        
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        assert breaker.get_status()["rejected"] == 1
+    
+    def test_half_open_probe(self):
+        """After the recovery timeout a single probe is allowed"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()  # probe already in flight
+        
+        breaker.record_success(0.1)
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_failed_probe_reopens(self):
+        """A failing probe re-opens the circuit"""
+        breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        breaker.allow_request()
+        breaker.record_failure()
+        
+        assert breaker.state == CircuitBreaker.OPEN
+    
+    def test_latency_slo_breaches(self):
+        """Repeated slow successes open the circuit"""
+        breaker = CircuitBreaker("test", latency_slo=1.0, slo_breach_threshold=2)
+        
+        breaker.record_success(5.0)
+        breaker.record_success(0.1)  # fast call resets the count
+        breaker.record_success(5.0)
+        assert breaker.state == CircuitBreaker.CLOSED
+        
+        breaker.record_success(5.0)
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+class TestFailoverClient:
+    """Test suite for provider failover"""
+    
+    def test_uses_primary_when_healthy(self):
+        """The first provider serves requests while it works"""
+        primary, backup = StubProvider("ollama"), StubProvider("google")
+        client = make_chain(primary, backup)
+        
+        assert client.generate("hi") == "ollama: hi"
+        assert backup.calls == 0
+        assert client.last_provider == "ollama:ollama-model"
+    
+    def test_fails_over_on_error(self):
+        """Error results move on to the next provider"""
+        primary = StubProvider("ollama", result="Error: Cannot connect to Ollama")
+        backup = StubProvider("google")
+        client = make_chain(primary, backup)
+        
+        assert client.generate("hi") == "google: hi"
+        assert client.failovers == 1
+    
+    def test_open_circuit_skips_provider(self):
+        """Once open, the failing provider is not called at all"""
+        primary = StubProvider("ollama", result="Error: down")
+        backup = StubProvider("google")
+        client = make_chain(primary, backup, failure_threshold=2, recovery_timeout=60)
+        
+        for _ in range(5):
+            client.generate("hi")
+        
+        assert primary.calls == 2
+        assert backup.calls == 5
+        assert client.get_circuit_status()["ollama"]["state"] == "open"
+    
+    def test_exhausted_chain_fails_fast(self):
+        """With every provider down an error is returned for agent fallbacks"""
+        client = make_chain(StubProvider("ollama", result="Error: down"), failure_threshold=1, recovery_timeout=60)
+        
+        assert client.generate("hi").startswith("Error: All LLM providers unavailable")
+        
+        started = time.perf_counter()
+        assert client.generate("hi").startswith("Error:")
+        assert time.perf_counter() - started < 0.01
+    
+    def test_stream_fails_over_before_first_chunk(self):
+        """Streams switch provider if the first chunk is an error"""
+        client = make_chain(StubProvider("ollama", result="Error: down"), StubProvider("google"))
+        
+        assert "".join(client.generate_stream("hi")) == "google: hi"
+    
+    @pytest.mark.asyncio
+    async def test_async_failover(self):
+        """Async calls fail over too"""
+        client = make_chain(StubProvider("ollama", result="Error: down"), StubProvider("google"))
+        
+        assert await client.agenerate("hi") == "google: hi"
+    
+    def test_delegates_other_attributes(self):
+        """Unknown attributes come from the primary client"""
+        client = make_chain(StubProvider("ollama"), StubProvider("google"))
+        
+        assert client.model == "ollama-model"
+
+
+class TestModelRouterChains:
+    """Test suite for provider chains built from config"""
+    
+    def test_chain_skips_providers_without_keys(self, monkeypatch):
+        """Cloud providers need their API key"""
+        monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+        monkeypatch.delenv("MODEL_SOURCE", raising=False)
+        router = ModelRouter()
+        
+        chain = router.get_client("resume_screening").chain
+        assert [c.provider for c, _ in chain] == ["ollama"]
+    
+    def test_model_source_goes_first(self, monkeypatch):
+        """MODEL_SOURCE moves its provider to the front of the chain"""
+        monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+        monkeypatch.setenv("MODEL_SOURCE", "google")
+        router = ModelRouter()
+        
+        chain = router.get_client("hr_assistant").chain
+        assert [c.provider for c, _ in chain] == ["google", "ollama"]
+        assert chain[0][0].model == "gemini-pro"
+        
+        # Breakers are shared across routing groups
+        assert router.get_client("analytics").chain[0][1] is chain[0][1]
+    
+    def test_fallback_client_shares_router_options(self, monkeypatch):
+        """A chain that fails to build falls back to a local client with the shared cache and limits"""
+        def broken(self, role, routing_config):
+            raise ValueError("bad routing config")
+        monkeypatch.setattr(ModelRouter, "_build_chain", broken)
+        router = ModelRouter()
+        
+        client, _ = router.get_client("resume_screening").chain[0]
+        assert (client.provider, client.model) == ("ollama", "deepseek-r1:1.5b")
+        assert client.coalescer is router.coalescer and client.retry_policy is router.retry_policy
+        assert client.cache is router.cache and client.context_store is router.context_store
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
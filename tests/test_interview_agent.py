@@ -72,6 +72,16 @@ class TestInterviewAgent:
         })
         
         assert result["success"] == False
+    
+    
+    def test_question_generation_stops_after_n_questions(self, interview_agent):
+        """Generation is cut once the requested number of questions is parsed"""
+        request = interview_agent._prepare_questions_request({"job_role": "Engineer", "num_questions": 2})
+        condition = request["llm"]["stop_when"][0]
+        
+        assert condition("Q1: Why Python?\nQ2: Describe a proj") is None
+        text = "Q1: Why Python?\nQ2: Describe a project?\nQ3: Extra?\n"
+        assert text[:condition(text)] == "Q1: Why Python?\nQ2: Describe a project?"
 
 
 def test_interview_evaluator():
@@ -0,0 +1,933 @@
+"""
+Tests for LLM Client
+"""
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pytest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm.llm_client import LLMClient
+from src.llm.transport import HTTPTransport, HealthMonitor
+from src.llm.async_transport import AsyncTransport
+from src.llm.cache import ResponseCache
+from src.llm.coalescing import SingleFlight
+from src.llm.retry import RetryPolicy
+from src.llm.rate_limiter import RateLimiter
+from src.llm.warmup import KeepWarmPinger
+from src.llm.context_store import ContextStore
+from src.llm.early_stop import EarlyStopper, JSONComplete, ItemsComplete
+from src.llm.tokens import Section, ContextWindows, TokenUsage, estimate_tokens, fit_sections, TRUNCATION_MARKER
+from src.llm.model_router import ModelRouter
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the Ollama HTTP API"""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _send_json(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        self.server.calls.append(("GET", self.path, None))
+        if self.path == "/api/tags":
+            self._send_json({"models": []})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+    
+    def _send_chunks(self, lines, content_type="application/x-ndjson"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for line in lines:
+            data = line.encode()
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+    
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.server.calls.append(("POST", self.path, payload))
+        
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            body = b'{"error": "rate limited"}'
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith("/v1beta/") and ":streamGenerateContent" in self.path:
+            events = [
+                {"candidates": [{"content": {"parts": [{"text": word}]}}]}
+                for word in ["Hello", " from", " Gemini"]
+            ]
+            self._send_chunks([f"data: {json.dumps(e)}\r\n\r\n" for e in events], "text/event-stream")
+        elif self.path == "/v1/chat/completions":
+            self.server.auth.append(self.headers.get("Authorization"))
+            last = payload.get("messages", [{}])[-1].get("content", "")
+            if payload.get("stream"):
+                events = [{"choices": [{"delta": {"role": "assistant"}}]}]
+                events += [{"choices": [{"delta": {"content": word}}]} for word in ["Hello", " from", " vLLM"]]
+                lines = [f"data: {json.dumps(e)}\n\n" for e in events] + ["data: [DONE]\n\n"]
+                self._send_chunks(lines, "text/event-stream")
+            else:
+                if str(last).startswith("slow"):
+                    time.sleep(0.1)
+                self._send_json({
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": f"echo: {last}"}}],
+                    "usage": {"prompt_tokens": 11, "completion_tokens": 3, "total_tokens": 14}
+                })
+        elif payload.get("stream"):
+            if str(payload.get("prompt", "")).startswith("slow"):
+                time.sleep(0.1)
+            key = "response" if self.path == "/api/generate" else "message"
+            lines = []
+            for word in self.server.stream_words or ["Hello", " there", "!"]:
+                chunk = word if key == "response" else {"role": "assistant", "content": word}
+                lines.append(json.dumps({key: chunk, "done": False}) + "\n")
+            lines.append(json.dumps({key: "" if key == "response" else {"content": ""}, "done": True}) + "\n")
+            self._send_chunks(lines)
+        elif self.path == "/api/generate" and "prompt" not in payload:
+            # Empty request: Ollama loads the model
+            self._send_json({"response": "", "done": True, "done_reason": "load", "load_duration": 1_200_000_000})
+        elif self.path == "/api/generate":
+            if str(payload.get("prompt", "")).startswith("slow"):
+                time.sleep(0.1)
+            # Prefill cost grows with the tokens not already in the passed context
+            prompt_tokens = (len(payload.get("prompt", "")) + len(payload.get("system", ""))) // 4
+            # Like Ollama, the returned context is prompt tokens followed by generated ones (-1 here)
+            generated = min(7, payload.get("options", {}).get("num_predict", 7))
+            self._send_json({
+                "response": f"echo: {payload.get('prompt')}",
+                "done": True,
+                "context": payload.get("context", []) + list(range(prompt_tokens)) + [-1] * generated,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": prompt_tokens * 1_000_000,
+                "eval_count": generated
+            })
+        elif self.path == "/api/chat":
+            last = payload.get("messages", [{}])[-1].get("content", "")
+            self._send_json({"message": {"role": "assistant", "content": f"echo: {last}"}, "done": True})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+
+@pytest.fixture
+def fake_ollama(monkeypatch):
+    """Run a fake Ollama server on a random local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    server.calls = []
+    server.failures = 0
+    server.auth = []
+    server.stream_words = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OLLAMA_BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestLLMClientTransport:
+    """Test suite for pooled transport and cached health checks"""
+    
+    def test_generate_uses_cached_health(self, fake_ollama):
+        """Health is probed once, not before every call"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        for i in range(3):
+            assert client.generate(f"hello {i}") == f"echo: hello {i}"
+        
+        probes = [c for c in fake_ollama.calls if c[1] == "/api/tags"]
+        assert len(probes) == 1
+    
+    def test_connections_are_reused(self, fake_ollama):
+        """Keep-alive session reuses one connection for sequential calls"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        for i in range(5):
+            client.chat([{"role": "user", "content": f"hi {i}"}])
+        
+        stats = client.get_transport_stats()
+        assert stats["requests"] == 6  # 1 probe + 5 chats
+        assert stats["new_connections"] == 1
+        assert stats["reuse_rate"] > 0.8
+    
+    def test_clients_share_transport_health(self, fake_ollama):
+        """Clients for the same server share one health monitor"""
+        transport = HTTPTransport()
+        chat = LLMClient(provider="ollama", model="phi3:3.8b", transport=transport)
+        reasoning = LLMClient(provider="ollama", model="deepseek-r1:1.5b", transport=transport)
+        
+        chat.generate("a")
+        reasoning.generate("b")
+        
+        assert chat.health is reasoning.health
+        assert chat.health.probe_count == 1
+    
+    def test_unreachable_server_fails_fast(self, monkeypatch):
+        """Unreachable Ollama returns an error string"""
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://127.0.0.1:9")
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        assert client.generate("hello").startswith("Error:")
+
+
+class TestLLMClientStreaming:
+    """Test suite for token streaming"""
+    
+    def test_generate_stream_ollama(self, fake_ollama):
+        """Ollama NDJSON chunks are yielded as they arrive"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        chunks = list(client.generate_stream("hi", system="Be brief"))
+        
+        assert chunks == ["Hello", " there", "!"]
+        payload = fake_ollama.calls[-1][2]
+        assert payload["stream"] is True
+        assert payload["system"] == "Be brief"
+    
+    def test_chat_stream_ollama(self, fake_ollama):
+        """Chat streaming reads message content chunks"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        text = "".join(client.chat_stream([{"role": "user", "content": "hi"}]))
+        
+        assert text == "Hello there!"
+        assert fake_ollama.calls[-1][1] == "/api/chat"
+    
+    def test_generate_stream_gemini(self, fake_ollama):
+        """Gemini server-sent events are parsed into chunks"""
+        client = LLMClient(provider="google", model="gemini-pro", transport=HTTPTransport())
+        client.google_api_key = "test-key"
+        client.google_base_url = f"http://127.0.0.1:{fake_ollama.server_port}/v1beta"
+        
+        assert list(client.generate_stream("hi")) == ["Hello", " from", " Gemini"]
+        assert "alt=sse" in fake_ollama.calls[-1][1]
+    
+    def test_time_to_first_token_recorded(self, fake_ollama):
+        """Each call records latency and time-to-first-token"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        list(client.generate_stream("hi"))
+        metrics = client.last_call_metrics
+        
+        assert metrics["streamed"] is True
+        assert metrics["chars"] == len("Hello there!")
+        assert 0 <= metrics["time_to_first_token"] <= metrics["latency"]
+        
+        client.generate("hi")
+        assert client.last_call_metrics["streamed"] is False
+        assert len(client.call_metrics) == 2
+
+
+class TestLLMClientCache:
+    """Test suite for response caching"""
+    
+    @pytest.fixture
+    def client(self, fake_ollama, tmp_path):
+        cache = ResponseCache(disk_path=str(tmp_path / "cache.db"))
+        return LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), cache=cache)
+    
+    @staticmethod
+    def _generate_calls(server):
+        return [c for c in server.calls if c[1] == "/api/generate"]
+    
+    def test_repeat_prompt_served_from_cache(self, client, fake_ollama):
+        """Identical calls reach the server once"""
+        first = client.generate("hello", temperature=0.2, system="sys")
+        second = client.generate("hello", temperature=0.2, system="sys")
+        
+        assert first == second == "echo: hello"
+        assert len(self._generate_calls(fake_ollama)) == 1
+        assert client.last_call_metrics["cached"] is True
+        assert client.get_cache_stats()["hits"] == 1
+    
+    def test_bypass_flag(self, client, fake_ollama):
+        """use_cache=False always calls the model"""
+        client.generate("hello")
+        client.generate("hello", use_cache=False)
+        
+        assert len(self._generate_calls(fake_ollama)) == 2
+    
+    def test_errors_not_cached(self, tmp_path, monkeypatch):
+        """Error responses are retried, not cached"""
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://127.0.0.1:9")
+        cache = ResponseCache(disk_path=str(tmp_path / "cache.db"))
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), cache=cache)
+        
+        assert client.generate("hello").startswith("Error:")
+        assert cache.get_stats()["writes"] == 0
+    
+    def test_stream_cached_after_completion(self, client, fake_ollama):
+        """A completed stream is replayed from cache"""
+        assert "".join(client.generate_stream("hi")) == "Hello there!"
+        assert list(client.generate_stream("hi")) == ["Hello there!"]
+        assert client.last_call_metrics["cached"] is True
+        
+        # Non-streaming calls share the same entry
+        assert client.generate("hi") == "Hello there!"
+        assert len(self._generate_calls(fake_ollama)) == 1
+
+
+class TestLLMClientCoalescing:
+    """Test suite for single-flight request coalescing"""
+    
+    @staticmethod
+    def _generate_calls(server):
+        return [c for c in server.calls if c[1] == "/api/generate"]
+    
+    def test_concurrent_identical_calls_share_one_request(self, fake_ollama):
+        """Threads asking the same question wait on one generation"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        client.health.mark(True)
+        
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: client.generate("slow question"), range(5)))
+        
+        assert results == ["echo: slow question"] * 5
+        assert len(self._generate_calls(fake_ollama)) == 1
+        stats = client.get_coalescing_stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 4
+    
+    def test_different_prompts_not_coalesced(self, fake_ollama):
+        """Only identical requests are merged"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        client.health.mark(True)
+        
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda i: client.generate(f"slow {i}"), range(3)))
+        
+        assert len(self._generate_calls(fake_ollama)) == 3
+    
+    @pytest.mark.asyncio
+    async def test_async_identical_calls_share_one_request(self, fake_ollama):
+        """Concurrent async callers share one generation"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", async_transport=AsyncTransport())
+        
+        results = await asyncio.gather(*[client.agenerate("slow question") for _ in range(5)])
+        
+        assert results == ["echo: slow question"] * 5
+        assert len(self._generate_calls(fake_ollama)) == 1
+        assert client.get_coalescing_stats()["coalesced"] == 4
+        
+        await client.async_transport.close()
+
+
+def test_single_flight_propagates_errors():
+    """Waiting callers receive the leader's exception"""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    
+    def failing():
+        started.set()
+        release.wait(1)
+        raise RuntimeError("boom")
+    
+    errors = []
+    
+    def call():
+        try:
+            flight.do("key", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+    
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(1)
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+    
+    assert errors == ["boom", "boom"]
+    assert flight.get_stats()["in_flight"] == 0
+
+
+class TestLLMClientRetry:
+    """Test suite for retries and rate limiting"""
+    
+    @pytest.fixture
+    def gemini(self, fake_ollama):
+        client = LLMClient(provider="google", model="gemini-pro", transport=HTTPTransport())
+        client.google_api_key = "test-key"
+        client.google_base_url = f"http://127.0.0.1:{fake_ollama.server_port}/v1beta"
+        return client
+    
+    def test_retries_429_honouring_retry_after(self, fake_ollama):
+        """Rate-limited calls are retried until they succeed"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        client.health.mark(True)
+        fake_ollama.failures = 2
+        
+        assert client.generate("hi") == "echo: hi"
+        
+        stats = client.get_resilience_stats()["retry"]
+        assert stats["retries"] == 2
+        assert stats["retry_after_honoured"] == 2
+    
+    def test_gives_up_after_max_retries(self, gemini, fake_ollama):
+        """Persistent 429s surface as an error after max_retries"""
+        gemini.retry_policy = RetryPolicy(max_retries=1)
+        fake_ollama.failures = 5
+        
+        result = gemini.generate("hi")
+        
+        assert result.startswith("Error: Google API error: 429")
+        assert len(fake_ollama.calls) == 2
+        assert gemini.get_resilience_stats()["retry"]["exhausted"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_async_retry(self, fake_ollama):
+        """Async calls retry 429s too"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", async_transport=AsyncTransport())
+        fake_ollama.failures = 1
+        
+        assert await client.agenerate("hi") == "echo: hi"
+        assert client.retry_policy.get_stats()["retries"] == 1
+        
+        await client.async_transport.close()
+    
+    def test_rate_limiter_paces_requests(self, fake_ollama):
+        """Requests beyond the burst wait for the bucket to refill"""
+        limiter = RateLimiter({"ollama/phi3:3.8b": {"requests_per_minute": 600, "burst": 1}})
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), rate_limiter=limiter)
+        client.health.mark(True)
+        
+        started = time.perf_counter()
+        for i in range(3):
+            client.generate(f"paced {i}")
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed >= 0.18  # 10 requests/s after the first
+        stats = limiter.get_stats()["ollama/phi3:3.8b"]
+        assert stats["requests"] == 3
+        assert stats["throttled"] == 2
+
+
+def test_retry_policy_delays():
+    """Backoff is capped and Retry-After takes precedence"""
+    policy = RetryPolicy(max_retries=3, base_delay=1.0, max_delay=4.0)
+    
+    assert all(0 <= policy.delay(attempt) <= 4.0 for attempt in range(10))
+    assert policy.delay(0, "2") == 2.0
+    assert policy.delay(0, "120") == 4.0
+    assert RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert RetryPolicy.parse_retry_after("soon") is None
+    
+    assert policy.should_retry(503, 0)
+    assert not policy.should_retry(400, 0)
+    assert not policy.should_retry(429, 3)
+
+
+class TestLLMClientAsync:
+    """Test suite for the asyncio client"""
+    
+    @pytest.mark.asyncio
+    async def test_agenerate_and_achat(self, fake_ollama):
+        """Async calls return the same results as the sync API"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", async_transport=AsyncTransport())
+        
+        assert await client.agenerate("hello") == "echo: hello"
+        assert await client.achat([{"role": "user", "content": "hi"}]) == "echo: hi"
+        assert client.last_call_metrics["kind"] == "achat"
+        
+        await client.async_transport.close()
+    
+    @pytest.mark.asyncio
+    async def test_provider_concurrency_limit(self, fake_ollama):
+        """Concurrent calls beyond the provider limit wait for a slot"""
+        transport = AsyncTransport(provider_limits={"ollama": 2})
+        client = LLMClient(provider="ollama", model="phi3:3.8b", async_transport=transport)
+        
+        results = await asyncio.gather(*[client.agenerate(f"slow {i}") for i in range(6)])
+        
+        assert results == [f"echo: slow {i}" for i in range(6)]
+        stats = client.get_async_stats()
+        assert stats["peak_in_flight"]["ollama"] == 2
+        assert stats["in_flight"]["ollama"] == 0
+        
+        await transport.close()
+    
+    @pytest.mark.asyncio
+    async def test_unreachable_server_returns_error(self, monkeypatch):
+        """Connection failures become error strings and mark the server down"""
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://127.0.0.1:9")
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), async_transport=AsyncTransport())
+        
+        assert (await client.agenerate("hello")).startswith("Error:")
+        assert client.health.known_down()
+        
+        await client.async_transport.close()
+
+
+class TestLLMClientOpenAI:
+    """Test suite for the OpenAI-compatible backend (vLLM, llama.cpp, LM Studio)"""
+    
+    @pytest.fixture
+    def client(self, fake_ollama, monkeypatch):
+        monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{fake_ollama.server_port}/v1/")
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        return LLMClient(provider="openai", model="local-model", transport=HTTPTransport(), async_transport=AsyncTransport())
+    
+    def test_generate(self, client, fake_ollama):
+        """Prompts are sent as chat messages to /chat/completions"""
+        assert client.generate("hello", system="Be brief") == "echo: hello"
+        
+        payload = fake_ollama.calls[-1][2]
+        assert payload["model"] == "local-model"
+        assert [m["role"] for m in payload["messages"]] == ["system", "user"]
+        assert fake_ollama.auth == [None]  # no key, no Authorization header
+    
+    def test_api_key_sent_as_bearer(self, client, fake_ollama):
+        client.openai_api_key = "sk-test"
+        client.chat([{"role": "user", "content": "hi"}])
+        
+        assert fake_ollama.auth == ["Bearer sk-test"]
+    
+    def test_stream(self, client, fake_ollama):
+        """SSE deltas are yielded until [DONE]"""
+        assert list(client.generate_stream("hi")) == ["Hello", " from", " vLLM"]
+        assert "".join(client.chat_stream([{"role": "user", "content": "hi"}])) == "Hello from vLLM"
+    
+    def test_batch_keeps_order_and_runs_in_parallel(self, client, fake_ollama):
+        """Batched prompts are in flight together and results keep input order"""
+        items = [f"slow {i}" for i in range(6)] + [{"prompt": "hello", "max_tokens": 10}]
+        
+        started = time.perf_counter()
+        results = client.generate_batch(items, max_workers=6)
+        elapsed = time.perf_counter() - started
+        
+        assert results == [f"echo: slow {i}" for i in range(6)] + ["echo: hello"]
+        assert elapsed < 0.5  # sequential would take 0.6s
+        assert sorted(c[2]["max_tokens"] for c in fake_ollama.calls)[0] == 10
+    
+    @pytest.mark.asyncio
+    async def test_async_batch(self, client, fake_ollama):
+        results = await client.agenerate_batch(["a", "b", "c"])
+        
+        assert results == ["echo: a", "echo: b", "echo: c"]
+        assert await client.achat([{"role": "user", "content": "hi"}]) == "echo: hi"
+        
+        await client.async_transport.close()
+    
+    def test_unreachable_server(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_BASE_URL", "http://127.0.0.1:9/v1")
+        client = LLMClient(provider="openai", model="local-model", transport=HTTPTransport(), retry_policy=RetryPolicy(max_retries=0))
+        
+        assert client.generate("hello").startswith("Error:")
+
+
+class TestLLMClientWarmup:
+    """Test suite for model preload, keep_alive and cold start timing"""
+    
+    def test_keep_alive_sent_with_requests(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), keep_alive="30m")
+        
+        client.generate("hello")
+        client.chat([{"role": "user", "content": "hi"}])
+        
+        posts = [c[2] for c in fake_ollama.calls if c[0] == "POST"]
+        assert [p["keep_alive"] for p in posts] == ["30m", "30m"]
+    
+    def test_preload_records_cold_start(self, fake_ollama):
+        """Preloading loads the model and logs its load time separately"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), keep_alive=-1)
+        
+        result = client.preload()
+        
+        assert result == {"model": "phi3:3.8b", "loaded": True, "load_seconds": 1.2}
+        assert fake_ollama.calls[-1][2] == {"model": "phi3:3.8b", "keep_alive": -1}
+        stats = client.get_load_stats()
+        assert stats["cold_starts"] == 1
+        assert stats["load_seconds"] == 1.2
+    
+    def test_preload_unreachable_server(self, monkeypatch):
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://127.0.0.1:9")
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), retry_policy=RetryPolicy(max_retries=0))
+        
+        assert client.preload()["loaded"] is False
+        assert client.health.known_down()
+    
+    def test_router_preloads_each_model_once(self, fake_ollama, monkeypatch):
+        monkeypatch.delenv("MODEL_SOURCE", raising=False)
+        monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+        router = ModelRouter()
+        
+        assert set(router.preload_models()) == {"deepseek-r1:1.5b", "phi3:3.8b"}
+        assert router.get_warmup_stats()["models"]["phi3:3.8b"]["cold_starts"] == 1
+
+
+class TestLLMClientStructuredOutput:
+    """Test suite for JSON schema constrained generation"""
+    
+    SCHEMA = {
+        "type": "object",
+        "properties": {"score": {"type": "integer", "minimum": 0}},
+        "required": ["score"],
+        "additionalProperties": False
+    }
+    
+    def test_ollama_format(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        
+        client.generate("score this", schema=self.SCHEMA)
+        
+        assert fake_ollama.calls[-1][2]["format"] == self.SCHEMA
+    
+    def test_gemini_schema_is_cleaned(self):
+        client = LLMClient(provider="google", model="gemini-pro", transport=HTTPTransport())
+        
+        config = client._google_payload("hi", 0.2, 100, None, self.SCHEMA)["generationConfig"]
+        
+        assert config["responseMimeType"] == "application/json"
+        assert config["responseSchema"] == {
+            "type": "object",
+            "properties": {"score": {"type": "integer"}},
+            "required": ["score"]
+        }
+    
+    def test_openai_response_format(self, fake_ollama, monkeypatch):
+        monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{fake_ollama.server_port}/v1")
+        client = LLMClient(provider="openai", model="local-model", transport=HTTPTransport())
+        
+        client.generate("score this", schema=self.SCHEMA)
+        
+        response_format = fake_ollama.calls[-1][2]["response_format"]
+        assert response_format["json_schema"]["schema"] == self.SCHEMA
+    
+    def test_schema_is_part_of_cache_key(self, fake_ollama):
+        cache = ResponseCache()
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), cache=cache)
+        
+        client.generate("score this")
+        client.generate("score this", schema=self.SCHEMA)
+        
+        assert len([c for c in fake_ollama.calls if c[1] == "/api/generate"]) == 2
+
+
+class TestLLMClientContextReuse:
+    """Test suite for reusing Ollama context across a shared prompt prefix"""
+    
+    SYSTEM = "You are a resume screener. " * 50
+    JD = "JOB DESCRIPTION: Senior Python developer. " * 20
+    
+    def _client(self, context_store=None):
+        return LLMClient(provider="ollama", model="deepseek-r1:1.5b", transport=HTTPTransport(), context_store=context_store)
+    
+    def test_prefix_prefilled_once(self, fake_ollama):
+        """The shared prefix is prefilled once and its context passed to later calls"""
+        client = self._client(ContextStore())
+        
+        results = [client.generate(f"RESUME {i}", system=self.SYSTEM, prefix=self.JD) for i in range(3)]
+        
+        assert results == [f"echo: RESUME {i}<｜Assistant｜>" for i in range(3)]
+        generates = [c[2] for c in fake_ollama.calls if c[1] == "/api/generate"]
+        assert len(generates) == 4
+        assert generates[0]["prompt"] == f"{self.SYSTEM}<｜User｜>{self.JD}" and generates[0]["options"]["num_predict"] == 1
+        for payload in generates[1:]:
+            assert payload["context"] and "system" not in payload
+        assert client.get_context_stats()["hits"] == 2
+    
+    def test_reused_context_sends_the_same_prompt(self, fake_ollama):
+        """Primed context + continuation is the templated prompt the uncached path renders"""
+        client = self._client(ContextStore())
+        template = client.context_store.template(client.model)
+        
+        client.generate("RESUME 1", system=self.SYSTEM, prefix=self.JD)
+        prime, call = [c[2] for c in fake_ollama.calls if c[1] == "/api/generate"]
+        
+        assert prime["raw"] and call["raw"] and "system" not in prime
+        # The token generated while priming is not carried into the next call
+        assert -1 not in call["context"] and len(call["context"]) == len(prime["prompt"]) // 4
+        assert prime["prompt"] + call["prompt"] == f"{self.SYSTEM}<｜User｜>{self.JD}RESUME 1<｜Assistant｜>"
+        assert template.head(self.SYSTEM, self.JD) + template.tail("RESUME 1") == prime["prompt"] + call["prompt"]
+    
+    def test_unknown_template_sends_full_prompt(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="mystery:7b", transport=HTTPTransport(), context_store=ContextStore())
+        
+        assert client.generate("RESUME", system=self.SYSTEM, prefix=self.JD) == f"echo: {self.JD}RESUME"
+        assert len([c for c in fake_ollama.calls if c[1] == "/api/generate"]) == 1
+    
+    def test_prefill_time_cut(self, fake_ollama):
+        """Screening many resumes against one JD prefills far fewer tokens"""
+        reused, full = self._client(ContextStore()), self._client()
+        
+        for i in range(5):
+            reused.generate(f"RESUME {i}", system=self.SYSTEM, prefix=self.JD)
+            full.generate(f"RESUME {i}", system=self.SYSTEM, prefix=self.JD)
+        
+        assert reused.get_load_stats()["prefill_seconds"] < full.get_load_stats()["prefill_seconds"] / 3
+    
+    def test_falls_back_to_full_prompt_for_other_providers(self, fake_ollama):
+        client = LLMClient(provider="openai", model="local-model", transport=HTTPTransport(), context_store=ContextStore())
+        client.openai_base_url = f"http://127.0.0.1:{fake_ollama.server_port}/v1"
+        
+        assert client.generate("RESUME", prefix="JD ") == "echo: JD RESUME"
+    
+    @pytest.mark.asyncio
+    async def test_async_reuse(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="deepseek-r1:1.5b", async_transport=AsyncTransport(), context_store=ContextStore())
+        
+        results = await asyncio.gather(*[client.agenerate(f"RESUME {i}", prefix=self.JD) for i in range(3)])
+        
+        assert results == [f"echo: RESUME {i}<｜Assistant｜>" for i in range(3)]
+        primes = [c for c in fake_ollama.calls if c[1] == "/api/generate" and c[2]["prompt"] == f"<｜User｜>{self.JD}"]
+        assert len(primes) == 1
+        
+        await client.async_transport.close()
+
+
+class TestLLMClientEarlyStop:
+    """Test suite for cancelling generation once the answer is complete"""
+    
+    @pytest.fixture
+    def client(self, fake_ollama):
+        return LLMClient(provider="ollama", model="deepseek-r1:1.5b", transport=HTTPTransport())
+    
+    def test_stops_when_json_closes(self, client, fake_ollama):
+        fake_ollama.stream_words = ['<think>{maybe}</think>', '{"score": 80, ', '"notes": "a}b"}', "\n\nHope this helps!"]
+        
+        result = client.generate("score", stop_when=[JSONComplete()])
+        
+        assert result == '<think>{maybe}</think>{"score": 80, "notes": "a}b"}'
+        assert client.get_load_stats()["early_stops"] == 1
+    
+    def test_stop_sequence_across_chunks(self, client, fake_ollama):
+        fake_ollama.stream_words = ["Q1: Why?\nQ2: How?\nEN", "D\nQ3: extra"]
+        
+        assert client.generate("questions", stop=["END"]) == "Q1: Why?\nQ2: How?\n"
+    
+    def test_stops_after_n_items(self, client, fake_ollama):
+        fake_ollama.stream_words = ["Q1: Why?\nQ2: Ho", "w?\nQ3: What?\n", "Q4: Extra?\n"]
+        count = lambda text: text.count("Q")
+        
+        result = client.generate("questions", stop_when=[ItemsComplete(count, 2)])
+        
+        assert result == "Q1: Why?\nQ2: How?"
+    
+    def test_result_cached_per_stop_rule(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="deepseek-r1:1.5b", transport=HTTPTransport(), cache=ResponseCache())
+        fake_ollama.stream_words = ['{"a": 1}', " trailing"]
+        
+        for _ in range(2):
+            assert client.generate("score", stop_when=[JSONComplete()]) == '{"a": 1}'
+        
+        assert len([c for c in fake_ollama.calls if c[1] == "/api/generate"]) == 1
+    
+    def test_concurrent_identical_calls_coalesced(self, client, fake_ollama):
+        """Identical screening calls in flight together share one stream"""
+        client.health.mark(True)
+        fake_ollama.stream_words = ['{"score": 80}', " trailing"]
+        
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: client.generate("slow screen", stop_when=[JSONComplete()]), range(5)))
+        
+        assert results == ['{"score": 80}'] * 5
+        assert len([c for c in fake_ollama.calls if c[1] == "/api/generate"]) == 1
+        assert client.get_coalescing_stats()["coalesced"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_async_streams_within_provider_limit(self, fake_ollama):
+        """Async early stop streams over the aiohttp pool, coalesced and bounded per provider"""
+        transport = AsyncTransport(provider_limits={"ollama": 1})
+        client = LLMClient(provider="ollama", model="deepseek-r1:1.5b", async_transport=transport)
+        fake_ollama.stream_words = ['{"score": 80}', " trailing"]
+        
+        results = await asyncio.gather(*(
+            [client.agenerate("slow screen", stop_when=[JSONComplete()]) for _ in range(3)]
+            + [client.agenerate(f"slow other {i}", stop_when=[JSONComplete()]) for i in range(2)]
+        ))
+        
+        assert results == ['{"score": 80}'] * 5
+        calls = [c for c in fake_ollama.calls if c[1] == "/api/generate"]
+        assert len(calls) == 3
+        assert all(c[2]["stream"] for c in calls)
+        stats = client.get_async_stats()
+        assert stats["peak_in_flight"]["ollama"] == 1
+        assert stats["in_flight"]["ollama"] == 0
+        assert client.get_load_stats()["early_stops"] == 3
+        
+        await transport.close()
+
+
+class TestLLMClientTokens:
+    """Test suite for context windows and per-call token accounting"""
+    
+    def test_num_ctx_sent_to_ollama(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), context_window=8192)
+        client.generate("hello")
+        client.chat([{"role": "user", "content": "hi"}])
+        
+        assert [c[2]["options"]["num_ctx"] for c in fake_ollama.calls if c[0] == "POST"] == [8192, 8192]
+    
+    def test_reported_usage_recorded(self, fake_ollama):
+        """Ollama's prompt_eval_count/eval_count are recorded per call"""
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport())
+        client.generate("x" * 40)
+        
+        metrics = client.last_call_metrics
+        assert (metrics["prompt_tokens"], metrics["completion_tokens"]) == (10, 7)
+        assert metrics["tokens_estimated"] is False
+        assert client.get_token_stats()["prompt_tokens"] == 10
+    
+    def test_openai_usage_recorded(self, fake_ollama, monkeypatch):
+        monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{fake_ollama.server_port}/v1")
+        client = LLMClient(provider="openai", model="local-model", transport=HTTPTransport())
+        client.generate("hello")
+        
+        assert client.last_call_metrics["prompt_tokens"] == 11
+        assert client.last_call_metrics["completion_tokens"] == 3
+    
+    def test_streams_estimated_and_cache_hits_free(self, fake_ollama):
+        client = LLMClient(provider="ollama", model="phi3:3.8b", transport=HTTPTransport(), cache=ResponseCache())
+        "".join(client.generate_stream("hello there"))
+        assert client.last_call_metrics["tokens_estimated"] is True
+        assert client.last_call_metrics["completion_tokens"] == estimate_tokens("Hello there!")
+        
+        client.generate("hello")
+        client.generate("hello")
+        assert client.last_call_metrics["cached"] and client.last_call_metrics["prompt_tokens"] == 0
+        assert client.get_token_stats()["calls"] == 2
+    
+    def test_router_sets_context_windows(self, fake_ollama, monkeypatch):
+        monkeypatch.setenv("MODEL_SOURCE", "ollama")
+        router = ModelRouter(config_path="missing.yaml")
+        
+        assert router.clients["reasoning"].context_window == 4096
+        assert "ollama:deepseek-r1:1.5b" in router.get_token_stats()
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Senior Python developer, 5+ years.") == 9
+    # Within a reasonable factor of the 4-chars-per-token rule on prose
+    prose = "The candidate led a team of five engineers building microservices on AWS. " * 20
+    assert 0.7 < estimate_tokens(prose) / (len(prose) / 4) < 1.5
+
+
+def test_token_usage_concurrent_adds():
+    """Totals stay exact when batch threads record calls at once"""
+    usage = TokenUsage()
+    
+    def record(_):
+        for _ in range(1000):
+            usage.add(3, 2, estimated=True)
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record, range(8)))
+    
+    assert usage.get_stats() == {"calls": 8000, "prompt_tokens": 24000, "completion_tokens": 16000, "estimated_calls": 8000}
+
+
+def test_context_windows_lookup():
+    windows = ContextWindows({"default": 2048, "phi3:3.8b": 4096, "gpt-4": 8192})
+    
+    assert windows.for_model("phi3:3.8b") == 4096
+    assert windows.for_model("gpt-4-turbo") == 8192
+    assert windows.for_model("llama3") == 2048
+
+
+def test_fit_sections_trims_lowest_priority_first():
+    resume = "\n".join(f"Line {i}: built data pipelines in Python and SQL" for i in range(200))
+    jd = "Senior data engineer. Python, SQL, Airflow."
+    sections = [Section("resume", resume, priority=1, min_tokens=50), Section("jd", jd, priority=2)]
+    
+    fitted = fit_sections(sections, budget=300)
+    
+    assert fitted["jd"] == jd
+    assert fitted["resume"].endswith(TRUNCATION_MARKER)
+    assert fitted["resume"].startswith("Line 0:")
+    assert sum(estimate_tokens(t) for t in fitted.values()) <= 300
+    assert fit_sections(sections, budget=100_000) == {"resume": resume, "jd": jd}
+
+
+def test_early_stopper_closes_stream():
+    """The remaining stream is not consumed once the answer is complete"""
+    consumed = []
+    
+    def chunks():
+        for chunk in ['{"a": ', "1}", " more", " text"]:
+            consumed.append(chunk)
+            yield chunk
+    
+    stream = chunks()
+    assert EarlyStopper(stop_when=[JSONComplete()]).run(stream) == '{"a": 1}'
+    assert consumed == ['{"a": ', "1}"]
+    assert stream.gi_frame is None  # closed
+
+
+def test_context_store_evicts_lru():
+    store = ContextStore(max_entries=2)
+    store.set("a", [1])
+    store.set("b", [2])
+    store.get("a")
+    store.set("c", [3])
+    
+    assert store.get("b") is None
+    assert store.get("a") == [1]
+    assert store.get_stats()["evictions"] == 1
+
+
+def test_keep_warm_business_hours():
+    """Pings only run on business days inside business hours"""
+    pings = []
+    pinger = KeepWarmPinger(lambda: pings.append(1), start_hour=9, end_hour=18)
+    
+    pinger.clock = lambda: datetime(2024, 6, 3, 10, 0)  # Monday 10:00
+    assert pinger.tick()
+    pinger.clock = lambda: datetime(2024, 6, 3, 18, 30)  # Monday after hours
+    assert not pinger.tick()
+    pinger.clock = lambda: datetime(2024, 6, 8, 10, 0)  # Saturday
+    assert not pinger.tick()
+    
+    assert pings == [1]
+    assert pinger.get_stats()["skipped"] == 2
+
+
+def test_health_monitor_ttl():
+    """Test health monitor caching and recovery"""
+    state = {"up": False, "probes": 0}
+    
+    def probe():
+        state["probes"] += 1
+        return state["up"]
+    
+    monitor = HealthMonitor(probe, ttl=0.0)
+    assert monitor.is_healthy() is False
+    
+    # Known-down servers are re-probed inline once stale
+    state["up"] = True
+    assert monitor.is_healthy() is True
+    assert state["probes"] == 2
+    
+    cached = HealthMonitor(probe, ttl=60.0)
+    cached.is_healthy()
+    cached.is_healthy()
+    assert cached.probe_count == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
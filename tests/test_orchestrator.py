@@ -1,6 +1,7 @@
 """
 Tests for Orchestration Layer
 """
+import time
 import pytest
 import sys
 from pathlib import Path
@@ -10,6 +11,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.orchestrator.crew_manager import CrewManager
 from src.orchestrator.router import TaskRouter
 from src.orchestrator.context_manager import ContextManager
+from src.orchestrator.batch_screening import BatchScreener
+from src.orchestrator.resume_index import ResumeIndex
+from src.orchestrator.requisition_matcher import RequisitionMatcher
+from src.orchestrator.resume_dedup import ResumeDeduplicator
+from src.llm.embeddings import HashingEmbedder
+from src.utils.text_compactor import TextCompactor
 
 class TestCrewManager:
     """Test suite for CrewManager"""
@@ -40,6 +47,40 @@ class TestCrewManager:
         
         assert result["success"] == False
         assert "error" in result
+    
+    def test_execute_query_stream(self, crew):
+        """Test streaming query task returns answer or answer stream"""
+        result = crew.execute_task("query_stream", {
+            "query": "What is the sick leave policy?",
+            "session_id": "stream_test"
+        })
+        
+        assert result["success"] == True
+        assert result["agent_used"] == "hr_assistant"
+        assert "answer" in result or "answer_stream" in result
+    
+    @pytest.mark.asyncio
+    async def test_aexecute_resume_pipeline(self, crew):
+        """Test async pipeline runs screening and verification together"""
+        result = await crew.aexecute_task("resume_pipeline", {
+            "resume": "John Doe\nPython developer with 5 years experience. BS in Computer Science.",
+            "job_description": "Looking for a Python developer",
+            "job_role": "Python Developer",
+            "session_id": "async_test"
+        })
+        
+        assert result["success"] == True
+        assert "screening" in result
+        assert "verification" in result
+        assert "hiring_decision" in result
+    
+    @pytest.mark.asyncio
+    async def test_aexecute_invalid_task(self, crew):
+        """Test async handling of invalid task type"""
+        result = await crew.aexecute_task("invalid_task", {})
+        
+        assert result["success"] == False
+        assert "error" in result
 
 
 class TestTaskRouter:
@@ -136,5 +177,370 @@ class TestContextManager:
         assert session_id not in context_mgr.sessions
 
 
+
+class TestTextCompactor:
+    """Test suite for resume/JD compaction before prompting"""
+    
+    RESUME = """
+    RESUME
+    Jane Smith  |  jane.smith@example.com  |  +1 (555) 123-4567
+    LinkedIn: linkedin.com/in/janesmith
+    
+    EXPERIENCE
+    •   Built data pipelines in   Python (2016 - 2021)
+    ●  Led a team of four engineers
+    Page 1 of 2
+    ▪ Led a team of four engineers
+    
+    
+    References available upon request
+    """
+    
+    def test_strips_boilerplate_and_contact_details(self):
+        result = TextCompactor().compact(self.RESUME)
+        
+        assert result.text == (
+            "Jane Smith\n\nEXPERIENCE\n"
+            "- Built data pipelines in Python (2016 - 2021)\n"
+            "- Led a team of four engineers"
+        )
+        assert result.tokens_saved > result.tokens_after
+    
+    def test_dates_and_versions_are_not_phone_numbers(self):
+        lines = ["Acme  05.2015 - 08.2018", "Acme Corp 2015 - 2018 2019 - 2021", "Python 3.10.12 2020.01.01"]
+        
+        result = TextCompactor().compact("\n".join(lines))
+        
+        assert result.text.splitlines() == ["Acme 05.2015 - 08.2018", "Acme Corp 2015 - 2018 2019 - 2021", "Python 3.10.12 2020.01.01"]
+    
+    def test_phone_shaped_numbers_removed(self):
+        text = "Jane Smith | Tel. +44 20 7946 0958\nPhone: 555 123 4567\n(555) 123-4567\nAcme (2016 - 2021)"
+        
+        assert TextCompactor().compact(text).text == "Jane Smith\n\nAcme (2016 - 2021)"
+    
+    def test_cached_by_content_hash(self):
+        compactor = TextCompactor()
+        first = compactor.compact(self.RESUME)
+        
+        assert compactor.compact(self.RESUME) is first
+        stats = compactor.get_stats()
+        assert (stats["compactions"], stats["cache_hits"]) == (1, 1)
+        assert stats["tokens_saved"] == first.tokens_saved
+    
+    def test_pipeline_compacts_once_for_both_agents(self):
+        crew = CrewManager()
+        result = crew.execute_task("resume_pipeline", {
+            "resume": self.RESUME,
+            "job_description": "Data engineer. We are an equal opportunity employer."
+        })
+        
+        assert result["compaction"]["tokens_saved"] > 0
+        assert crew.get_agent_status()["compaction"]["compactions"] == 2
+
+
+
+class TestBatchScreening:
+    """Test suite for screening many resumes against one JD"""
+    
+    class FakeAgent:
+        """Scores a resume by its number; 'boom' raises, 'slow' takes a while"""
+        
+        def process(self, input_data):
+            resume = input_data["resume"]
+            if resume == "boom":
+                raise RuntimeError("parser crashed")
+            if resume == "offline":
+                return {
+                    "success": True, "score": 0, "recommendation": "Manual Review", "provenance": "fallback",
+                    "reasoning": "Error: All LLM providers unavailable"
+                }
+            if resume.startswith("slow"):
+                time.sleep(0.2)
+                resume = resume[len("slow"):]
+            provenance = "deterministic" if int(resume) < 30 else "llm"
+            return {"success": True, "score": int(resume), "recommendation": "Interview", "provenance": provenance}
+    
+    def test_ranked_shortlist_and_isolated_failures(self):
+        screener = BatchScreener(self.FakeAgent(), max_workers=4, shortlist_size=2)
+        
+        summary = screener.run("JD", ["40", {"id": "alice", "resume": "90"}, "boom", "75"])
+        
+        assert [(c["candidate_id"], c["rank"]) for c in summary["shortlist"]] == [("alice", 1), ("candidate_4", 2)]
+        assert summary["failed"] == [{"candidate_id": "candidate_3", "error": "parser crashed"}]
+        assert [r["index"] for r in summary["results"]] == [0, 1, 2, 3]
+        stats = summary["stats"]
+        assert (stats["candidates"], stats["succeeded"], stats["failed"]) == (4, 3, 1)
+        assert stats["resumes_per_minute"] > 0 and stats["latency_p95"] >= stats["latency_avg"] >= 0
+    
+    def test_llm_calls_saved_reported(self):
+        summary = BatchScreener(self.FakeAgent()).run("JD", ["10", "20", "50", "boom"])
+        
+        assert (summary["stats"]["deterministic_decisions"], summary["stats"]["llm_calls"]) == (2, 1)
+        assert summary["stats"]["llm_calls_saved_rate"] == 0.5
+    
+    def test_llm_error_fallback_is_a_failure(self):
+        """A 'Manual Review' fallback from an LLM error is neither ranked nor counted as an LLM call"""
+        summary = BatchScreener(self.FakeAgent()).run("JD", ["offline", "50", "10"])
+        
+        assert [c["candidate_id"] for c in summary["shortlist"]] == ["candidate_2", "candidate_3"]
+        assert summary["failed"] == [{"candidate_id": "candidate_1", "error": "Error: All LLM providers unavailable"}]
+        stats = summary["stats"]
+        assert (stats["succeeded"], stats["failed"], stats["llm_calls"]) == (2, 1, 1)
+    
+    def test_results_stream_in_completion_order(self):
+        screener = BatchScreener(self.FakeAgent(), max_workers=3)
+        
+        started = time.perf_counter()
+        order = [r["candidate_id"] for r in screener.stream("JD", ["slow10", "20", "30"])]
+        
+        assert order[-1] == "candidate_1"
+        assert time.perf_counter() - started < 0.4  # ran concurrently
+    
+    def test_crew_batch_stream(self):
+        crew = CrewManager()
+        batch = crew.execute_task("batch_screening_stream", {
+            "job_description": "Python developer",
+            "resumes": ["SKILLS: Python\nEXPERIENCE:\nDev at A (2019-2023)", "SKILLS: Java"],
+            "max_workers": 2
+        })
+        events = list(batch["event_stream"])
+        
+        assert [e["event"] for e in events] == ["candidate", "candidate", "summary"]
+        assert events[-1]["stats"]["candidates"] == 2
+        assert crew.execute_task("batch_screening", {"job_description": "JD"})["success"] is False
+
+
+
+class TestResumeIndex:
+    """Test suite for BM25 ranking of the resume pool"""
+    
+    POOL = [
+        {"id": "devops", "resume": "Platform engineer running k8s, Terraform and AWS for payments"},
+        {"id": "backend", "resume": "Python and Django developer, PostgreSQL, some Docker"},
+        {"id": "designer", "resume": "Graphic designer, Photoshop and Illustrator"},
+    ]
+    
+    def test_ranks_pool_against_jd(self):
+        index = ResumeIndex()
+        index.add_many(self.POOL)
+        
+        hits = index.search("Kubernetes engineer with AWS", top_k=2)
+        
+        assert [h["candidate_id"] for h in hits] == ["devops"]
+        assert hits[0]["rank"] == 1 and hits[0]["bm25"] > 0
+        assert [h["candidate_id"] for h in index.search("Python Django PostgreSQL Docker")][0] == "backend"
+    
+    def test_incremental_adds_and_replacement(self):
+        index = ResumeIndex()
+        index.add_many(self.POOL)
+        assert index.search("Rust") == []
+        
+        index.add("designer", "Rust systems developer")
+        index.add("rustacean", "Rust and Go developer")
+        
+        assert {h["candidate_id"] for h in index.search("Rust developer", top_k=2)} == {"designer", "rustacean"}
+        assert index.search("Photoshop") == []
+        stats = index.get_stats()
+        assert (stats["documents"], stats["replaced"]) == (4, 1)
+    
+    def test_retired_rows_compacted(self):
+        index = ResumeIndex(compact_ratio=0.5)
+        index.add_many(self.POOL + [{"id": "rustacean", "resume": "Rust and Go developer"}])
+        
+        index.remove("designer")
+        assert index.get_stats()["retired_rows"] == 1
+        index.remove("rustacean")
+        
+        stats = index.get_stats()
+        assert (stats["compactions"], stats["retired_rows"], stats["documents"]) == (1, 0, 2)
+        assert index.search("Photoshop Rust") == []
+        assert [h["candidate_id"] for h in index.search("Python Django AWS")] == ["backend", "devops"]
+        assert stats["terms"] == len(set(index.tokenize(self.POOL[0]["resume"] + " " + self.POOL[1]["resume"])))
+    
+    def test_crew_pool_screening(self):
+        crew = CrewManager()
+        assert crew.execute_task("pool_screening", {"job_description": "Python"})["error"] == "Resume pool is empty"
+        
+        assert crew.execute_task("index_resumes", {"resumes": self.POOL})["pool_size"] == 3
+        summary = crew.execute_task("pool_screening", {"job_description": "Python Django developer", "top_k": 5})
+        
+        assert [h["candidate_id"] for h in summary["retrieval"]["hits"]] == ["backend"]
+        assert summary["stats"]["candidates"] == 1
+        
+        skills = crew.execute_task("skill_search", {"required": "Python, Django, Docker, AWS", "min_required": 1})
+        assert [c["candidate_id"] for c in skills["candidates"]] == ["backend", "devops"]
+        
+        assert crew.execute_task("remove_resumes", {"candidate_ids": ["backend", "nobody"]})["removed"] == 1
+        skills = crew.execute_task("skill_search", {"required": "Python, Django, Docker, AWS", "min_required": 1})
+        assert [c["candidate_id"] for c in skills["candidates"]] == ["devops"]
+        assert crew.execute_task("pool_screening", {"job_description": "Python Django"})["success"] is False
+    
+    def test_removal_reaches_persisted_indexes_after_restart(self, tmp_path):
+        from src.agents.resume_screening.candidate_index import CandidateIndex
+        
+        def start():
+            crew = CrewManager()
+            crew.orchestrator.registry.get_agent("resume_screening").candidate_index = CandidateIndex.from_config(
+                HashingEmbedder(dim=256), {"path": str(tmp_path / "ann")}
+            )
+            crew.orchestrator.matching_settings.update(
+                {"embedding_model": "hashing", "store_dir": str(tmp_path / "embeddings"), "jd_dir": str(tmp_path / "none")}
+            )
+            return crew
+        
+        crew = start()
+        crew.execute_task("index_resumes", {"resumes": self.POOL})
+        crew.execute_task("role_matching", {"candidate_id": "devops", "requisitions": {"sre": "Site reliability engineer"}})
+        crew.orchestrator.registry.get_agent("resume_screening").candidate_index.snapshot()
+        
+        # After a restart the BM25 pool is empty, but the ANN index and embedding store reopen
+        restarted = start()
+        result = restarted.execute_task("remove_resumes", {"candidate_ids": ["devops"]})
+        
+        assert result["removed"] == 0
+        assert result["persisted_removed"] == {"candidate_index": 1, "embeddings": 1}
+        hits = restarted.execute_task("candidate_search", {"job_description": "Kubernetes AWS platform engineer"})
+        assert "devops" not in [c["candidate_id"] for c in hits["candidates"]]
+        reopened = start().orchestrator.registry.get_agent("resume_screening").candidate_index
+        assert len(reopened) == 2
+
+
+class TestRequisitionMatcher:
+    """Test suite for candidate-by-requisition embedding similarity"""
+    
+    REQUISITIONS = {
+        "data_engineer": "Data engineer building Spark and Airflow pipelines on a Snowflake warehouse",
+        "frontend": "Frontend developer for React and TypeScript single page applications",
+        "nurse": "Registered nurse for the intensive care unit, night shifts",
+    }
+    CANDIDATES = {
+        "alice": "Built Airflow pipelines and Spark jobs loading a Snowflake data warehouse",
+        "bob": "React and TypeScript developer, single page applications and design systems",
+    }
+    
+    def test_roles_ranked_with_exclusions(self, tmp_path):
+        matcher = RequisitionMatcher(HashingEmbedder(dim=256), store_dir=str(tmp_path), batch_size=1)
+        matcher.add_requisitions(self.REQUISITIONS)
+        matcher.add_candidates(self.CANDIDATES)
+        
+        assert matcher.similarity().shape == (2, 3) and matcher.similarity().dtype.name == "float16"
+        assert matcher.roles_for("alice", top_k=1)[0]["id"] == "data_engineer"
+        assert matcher.roles_for("bob", top_k=1, exclude=("frontend",))[0]["id"] != "frontend"
+        assert matcher.candidates_for("frontend")[0]["id"] == "bob"
+    
+    def test_vectors_reused_across_restarts(self, tmp_path):
+        first = RequisitionMatcher(HashingEmbedder(dim=256), store_dir=str(tmp_path))
+        first.add_requisitions(self.REQUISITIONS)
+        first.add_candidates(self.CANDIDATES)
+        
+        second = RequisitionMatcher(HashingEmbedder(dim=256), store_dir=str(tmp_path))
+        
+        assert second.add_candidates(self.CANDIDATES) == 0
+        assert second.add_candidates({**self.CANDIDATES, "bob": "Registered nurse, ICU"}) == 1
+        assert second.roles_for("bob", top_k=1)[0]["id"] == "nurse"
+        assert second.roles_for("alice") == first.roles_for("alice")
+        assert second.get_stats()["candidates"]["encoded"] == 1
+    
+    def test_removed_candidates_dropped_from_store(self, tmp_path):
+        matcher = RequisitionMatcher(HashingEmbedder(dim=256), store_dir=str(tmp_path))
+        matcher.add_requisitions(self.REQUISITIONS)
+        matcher.add_candidates({"carol": "Registered nurse, ICU night shifts", **self.CANDIDATES})
+        before = matcher.roles_for("bob")
+        
+        assert matcher.remove_candidates(["carol", "nobody"]) == 1
+        
+        assert matcher.roles_for("carol") == [] and matcher.roles_for("bob") == before
+        assert {c["id"] for c in matcher.candidates_for("nurse")} == {"alice", "bob"}
+        reopened = RequisitionMatcher(HashingEmbedder(dim=256), store_dir=str(tmp_path))
+        assert sorted(reopened.candidates.ids) == ["alice", "bob"]
+        assert reopened.roles_for("bob") == before
+    
+    def test_crew_role_matching(self, tmp_path):
+        crew = CrewManager()
+        crew.orchestrator.matching_settings.update(
+            {"embedding_model": "hashing", "store_dir": str(tmp_path), "jd_dir": str(tmp_path / "none")}
+        )
+        crew.execute_task("index_resumes", {"resumes": [{"id": k, "resume": v} for k, v in self.CANDIDATES.items()]})
+        
+        result = crew.execute_task("role_matching", {
+            "candidate_id": "alice", "requisitions": self.REQUISITIONS, "exclude": "data_engineer"
+        })
+        
+        assert result["success"] and "data_engineer" not in [r["id"] for r in result["roles"]]
+        assert crew.execute_task("role_matching", {"candidate_id": "zed"})["success"] is False
+        
+        crew.execute_task("remove_resumes", {"candidate_ids": ["alice"]})
+        assert crew.orchestrator.requisition_matcher.candidates.ids == ["bob"]
+
+
+class TestResumeDedup:
+    """Test suite for MinHash/LSH duplicate detection before the resume pipeline"""
+    
+    RESUME = (
+        "Jane Smith\njane@example.com\nSUMMARY:\nBackend engineer with eight years building payment "
+        "platforms in Python and Go. Led the migration of a monolith to event driven services on AWS.\n"
+        "EXPERIENCE:\nStaff Engineer at Acme Payments (2019-2024)\n- Designed the ledger service handling "
+        "two million transactions a day\n- Mentored six engineers and ran the on call rotation\n"
+        "Software Engineer at Globex (2015-2019)\n- Built REST APIs in Django and PostgreSQL\n"
+        "- Cut p99 latency of the checkout API from 900 ms to 120 ms\nEDUCATION:\nBSc Computer Science, 2015"
+    )
+    
+    def test_exact_and_near_duplicates(self):
+        dedup = ResumeDeduplicator(threshold=0.8)
+        dedup.add("jane", self.RESUME)
+        edited = self.RESUME.replace("jane@example.com", "jane.smith@mail.com").replace("six", "seven")
+        
+        assert dedup.find(self.RESUME.upper().replace("\n", "  \n")) == ("jane", 1.0, True)
+        near = dedup.find(edited)
+        assert near.resume_id == "jane" and not near.exact and 0.8 <= near.similarity < 1.0
+        assert dedup.find("Graphic designer, Photoshop and Illustrator, ten years of agency work") is None
+        assert dedup.add("copy", edited) == "jane" and len(dedup) == 1
+        
+        assert dedup.remove("jane") and dedup.find(edited) is None
+    
+    def test_band_layout_follows_threshold(self):
+        strict, loose = ResumeDeduplicator(threshold=0.9), ResumeDeduplicator(threshold=0.5)
+        
+        assert strict.bands * strict.rows == loose.bands * loose.rows == 128
+        assert strict.rows > loose.rows
+    
+    @staticmethod
+    def _answering(crew, monkeypatch, answer):
+        """Have the screening and verification agents get `answer` from the LLM"""
+        for name in ("resume_screening", "doc_verification"):
+            monkeypatch.setattr(crew.orchestrator.registry.get_agent(name), "generate_response", lambda **_: answer)
+        return crew
+    
+    def test_pipeline_reuses_result_for_duplicate(self, monkeypatch):
+        answer = '{"score": 82, "recommendation": "Interview", "reasoning": "Strong backend", "issues_found": []}'
+        crew = self._answering(CrewManager(), monkeypatch, answer)
+        jd = "Backend engineer: Python, Go, AWS, PostgreSQL"
+        first = crew.execute_task("resume_pipeline", {"resume": self.RESUME, "job_description": jd})
+        
+        resubmitted = crew.execute_task("resume_pipeline", {
+            "resume": self.RESUME.replace("six", "seven"), "job_description": jd
+        })
+        other_role = crew.execute_task("resume_pipeline", {"resume": self.RESUME, "job_description": "Go developer"})
+        
+        assert first["success"] and "duplicate_of" not in first
+        assert resubmitted["duplicate_of"]["exact"] is False
+        assert resubmitted["screening"] == first["screening"]
+        assert "duplicate_of" not in other_role
+        assert crew.get_agent_status()["resume_dedup"]["results_reused"] == 1
+    
+    def test_error_degraded_result_not_replayed(self, monkeypatch):
+        """A run scored 0 because the LLM was down is redone, not reused, on resubmission"""
+        crew = self._answering(CrewManager(), monkeypatch, "Error: All LLM providers unavailable")
+        jd = "Backend engineer: Python, Go, AWS, PostgreSQL"
+        
+        first = crew.execute_task("resume_pipeline", {"resume": self.RESUME, "job_description": jd})
+        again = crew.execute_task("resume_pipeline", {"resume": self.RESUME, "job_description": jd})
+        
+        assert first["success"] and first["verification"]["provenance"] == "fallback"
+        assert "duplicate_of" not in again
+        stats = crew.get_agent_status()["resume_dedup"]
+        assert (stats["results_reused"], stats["stored_results"]) == (0, 0)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
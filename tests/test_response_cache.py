@@ -0,0 +1,101 @@
+"""
+Tests for LLM Response Cache
+"""
+import time
+import pytest
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.llm.cache import LRUCache, SQLiteCache, ResponseCache, make_cache_key
+
+
+class TestResponseCache:
+    """Test suite for the two-tier response cache"""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ResponseCache(memory_entries=2, disk_path=str(tmp_path / "cache.db"))
+    
+    def test_miss_then_hit(self, cache):
+        """Stored responses are returned from memory"""
+        assert cache.get("k") is None
+        cache.set("k", "value")
+        assert cache.get("k") == "value"
+        
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache instance reads responses persisted by an earlier one"""
+        path = str(tmp_path / "cache.db")
+        ResponseCache(disk_path=path).set("k", "persisted")
+        
+        fresh = ResponseCache(disk_path=path)
+        assert fresh.get("k") == "persisted"
+        assert fresh.get_stats()["disk_hits"] == 1
+        
+        # Promoted into memory on the first disk hit
+        assert fresh.get("k") == "persisted"
+        assert fresh.get_stats()["memory_hits"] == 1
+    
+    def test_memory_lru_eviction(self, cache):
+        """Least recently used entries fall back to the disk tier"""
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert len(cache.memory) == 2
+        assert cache.memory.get("b") is None
+        assert cache.get("b") == "2"
+    
+    def test_clear(self, cache):
+        """Clear empties both tiers"""
+        cache.set("k", "value")
+        cache.clear()
+        assert cache.get("k") is None
+        assert cache.get_stats()["disk_entries"] == 0
+
+
+def test_make_cache_key():
+    """Every generation parameter changes the key"""
+    base = make_cache_key("ollama", "phi3", "prompt", "system", 0.2, 100)
+    
+    assert base == make_cache_key("ollama", "phi3", "prompt", "system", 0.2, 100)
+    assert base != make_cache_key("google", "phi3", "prompt", "system", 0.2, 100)
+    assert base != make_cache_key("ollama", "phi3", "prompt", "other", 0.2, 100)
+    assert base != make_cache_key("ollama", "phi3", "prompt", "system", 0.3, 100)
+    assert base != make_cache_key("ollama", "phi3", "prompt", "system", 0.2, 200)
+
+
+def test_ttl_expiry(tmp_path):
+    """Expired entries are dropped from both tiers"""
+    memory = LRUCache(max_entries=10, ttl=0.05)
+    disk = SQLiteCache(str(tmp_path / "cache.db"), ttl=0.05)
+    memory.set("k", "v")
+    disk.set("k", "v")
+    
+    time.sleep(0.1)
+    
+    assert memory.get("k") is None
+    assert disk.get("k") is None
+    assert disk.count() == 0
+
+
+def test_disk_size_eviction(tmp_path):
+    """Disk tier evicts least recently used entries beyond its size limit"""
+    disk = SQLiteCache(str(tmp_path / "cache.db"), max_size_mb=0.001)  # ~1KB
+    for i in range(5):
+        disk.set(f"k{i}", "x" * 300)
+    
+    assert disk.count() < 5
+    assert disk.get("k4") is not None
+    assert disk.get("k0") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
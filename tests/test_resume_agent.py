@@ -154,5 +154,370 @@ def test_resume_scorer():
     assert match_score > 0  # Should have some match
 
 
+
+def test_parse_json_repairs_truncated_output():
+    """Truncated or wrapped JSON is repaired instead of discarded"""
+    from src.llm.json_repair import parse_json
+    
+    assert parse_json('```json\n{"score": 80, "skills_matched": ["Python"]}\n```') == (
+        {"score": 80, "skills_matched": ["Python"]}, "parsed"
+    )
+    assert parse_json('<think>{draft}</think> {"score": 70,}')[0] == {"score": 70}
+    
+    # Cut off by max_tokens mid-string and mid-key
+    assert parse_json('{"score": 85, "skills_matched": ["Python", "AWS"], "reasoning": "Strong fit wi') == (
+        {"score": 85, "skills_matched": ["Python", "AWS"], "reasoning": "Strong fit wi"}, "repaired"
+    )
+    assert parse_json('{"score": 85, "skills_missing": ["K8s"], "reco')[0] == {"score": 85, "skills_missing": ["K8s"]}
+    assert parse_json("Sorry, I cannot help.") == (None, "failed")
+
+
+def test_parse_failures_tracked_per_agent():
+    """Screening falls back to manual review and counts the failure"""
+    registry = AgentRegistry()
+    agent = registry.get_agent("resume_screening")
+    
+    assert agent._parse_json_response('{"score": 90, "reasoning": "cut')["score"] == 90
+    assert agent._parse_json_response("no json here")["recommendation"] == "Manual Review"
+    
+    stats = agent.get_parse_stats()
+    assert (stats["repaired"], stats["failed"]) == (1, 1)
+    assert stats["failure_rate"] == 0.5
+    assert registry.get_agent("doc_verification").get_parse_stats()["total"] == 0
+
+
+
+def test_long_resume_trimmed_to_context_window():
+    """The resume is trimmed to fit the window; the JD prefix is kept intact"""
+    from src.llm.tokens import estimate_tokens
+    
+    agent = AgentRegistry().get_agent("resume_screening")
+    agent.llm = type("Client", (), {"context_window": 4096})()
+    resume = "\n".join(f"2015-2023 Engineer at Company {i}: built APIs in Python" for i in range(1000))
+    jd = "Senior Python engineer with AWS experience"
+    
+    request = agent._prepare_request({"resume": resume, "job_description": jd})["llm"]
+    
+    assert jd in request["prefix"]
+    used = sum(estimate_tokens(t) for t in (agent.get_system_prompt(), request["prefix"], request["prompt"]))
+    assert used + request["max_tokens"] <= 4096
+    assert "Company 0:" in request["prompt"]
+
+
+
+def test_resume_parser_sections():
+    """Typed sections and dated experience entries are extracted"""
+    from src.utils.resume_parser import ResumeParser
+    
+    resume = """Jane Roe
+jane@example.com | +1 555 123 4567
+PROFESSIONAL SUMMARY
+Data engineer with 6 years of experience.
+Technical Skills
+- Languages: Python, SQL
+- Tools: Airflow / Spark
+Work Experience
+Acme Inc
+Data Engineer, Jan 2019 - Present
+- Built batch pipelines
+Beta LLC
+Analyst, 2016 - 2018
+Certifications
+AWS Certified Data Analytics (2021)
+"""
+    parser = ResumeParser()
+    parsed = parser.parse(resume)
+    
+    assert parsed.sections["contact"].startswith("Jane Roe")
+    assert parsed.skills == ["Python", "SQL", "Airflow", "Spark"]
+    assert [(e.header, e.start, e.end) for e in parsed.experience] == [
+        ("Acme Inc | Data Engineer, Jan 2019 - Present", "Jan 2019", "Present"),
+        ("Beta LLC | Analyst, 2016 - 2018", "2016", "2018")
+    ]
+    assert "AWS Certified" in parsed.sections["certifications"]
+    
+    rendered = parsed.render(("experience", "certifications"))
+    assert "jane@example.com" not in rendered and "Airflow" not in rendered
+    assert parser.parse(resume) is parsed
+    assert parser.get_stats()["cache_hits"] == 1
+    
+    # Text without recognisable sections is passed through whole
+    assert parser.parse("Python developer, 5 years").render(("skills",)) == "Python developer, 5 years"
+
+
+def test_agents_prompt_only_needed_sections():
+    registry = AgentRegistry()
+    resume = """John Doe
+john@example.com
+SKILLS: Python, Docker
+EXPERIENCE:
+Engineer at Tech Corp (2020-2023)
+- Built APIs
+PROJECTS
+Chess engine in Rust
+"""
+    screening = registry.get_agent("resume_screening")._prepare_request(
+        {"resume": resume, "job_description": "Python engineer"}
+    )["llm"]["prompt"]
+    verification = registry.get_agent("doc_verification")._prepare_request({"resume": resume})["llm"]["prompt"]
+    
+    assert "SKILLS:\nPython, Docker" in screening and "Tech Corp" in screening
+    assert "john@example.com" not in screening and "Chess engine" not in screening
+    assert "Tech Corp" in verification and "Python, Docker" in verification
+    assert "john@example.com" not in verification and "Chess engine" not in verification
+
+
+
+class TestScreeningCascade:
+    """Test suite for the deterministic pre-filter in front of LLM screening"""
+    
+    JD = "Backend engineer: Python, Django, PostgreSQL, Docker, AWS. 5+ years experience required."
+    
+    @pytest.fixture
+    def cascade(self):
+        from src.agents.resume_screening.cascade import ScreeningCascade
+        return ScreeningCascade(reject_below=30, accept_above=90)
+    
+    def test_clear_cut_candidates_decided_deterministically(self, cascade):
+        strong = "SKILLS: Python, Django, PostgreSQL, Docker, AWS\nEXPERIENCE:\nEngineer at A (2012-2020)"
+        weak = "SKILLS: Photoshop, Illustrator\nEXPERIENCE:\nDesigner at B (2021-2022)"
+        
+        accepted = cascade.decide(strong, self.JD)
+        rejected = cascade.decide(weak, self.JD)
+        
+        assert (accepted["recommendation"], accepted["provenance"], accepted["years_experience"]) == (
+            "Interview", "deterministic", 8
+        )
+        assert rejected["recommendation"] == "Reject" and rejected["score"] < 30
+        assert rejected["skills_missing"] == ["python", "django", "postgresql", "docker", "aws"]
+    
+    def test_ambiguous_and_vague_jds_escalate(self, cascade):
+        middle = "SKILLS: Python, Docker, Java\nEXPERIENCE:\nDeveloper at C (2019-2022)"
+        
+        assert cascade.decide(middle, self.JD) is None
+        assert cascade.decide("SKILLS: Photoshop", "Friendly team player wanted") is None
+        assert cascade.get_stats() == {
+            "rejected": 0, "accepted": 0, "escalated": 2, "llm_calls_saved": 0, "savings_rate": 0.0
+        }
+    
+    def test_candidate_meeting_stated_requirements_not_rejected(self, cascade):
+        jd = (Path(__file__).parent.parent / "data" / "job_descriptions" / "sample_jd.txt").read_text()
+        qualifying = "Alex Kim\nBackend Developer, Acme Corp, 2019-2025 (6 years)\nSkills: Node.js, Python, GCP, MongoDB, Git"
+        undated = "Alex Kim\nBSc, State University, 2010-2014\nSkills: Python, AWS, Git"
+        
+        signals = cascade.score(qualifying, jd)
+        
+        # "Python or Node.js" and "AWS, Azure, or GCP" are one requirement each;
+        # the Technical Skills inventory and soft skills are not scored
+        assert (signals["skills_met"], signals["required_skills"], signals["years_experience"]) == (3, 5, 6)
+        assert signals["skills_missing"] == ["microservices", "sql"]
+        assert cascade.decide(qualifying, jd) is None
+        # Education dates are not experience; unknown years never reject
+        assert cascade.score(undated, jd)["years_known"] is False
+        assert cascade.decide(undated, jd) is None
+    
+    def test_agent_skips_llm_for_fast_decisions(self):
+        agent = AgentRegistry().get_agent("resume_screening")
+        
+        resume = "SKILLS: Photoshop\nEXPERIENCE:\nDesigner at B (2021-2022)"
+        result = agent.process({"resume": resume, "job_description": self.JD})
+        
+        assert result["provenance"] == "deterministic" and result["agent"] == agent.name
+        assert agent.get_cascade_stats()["llm_calls_saved"] == 1
+
+
+
+class TestJDAnalyzer:
+    """Requirements extracted once per JD and shared across candidates"""
+    
+    JD = """JOB TITLE: Senior Backend Engineer
+
+ABOUT US:
+We build cloud software.
+
+REQUIREMENTS:
+- 5+ years of backend experience
+- Python and PostgreSQL
+- Docker in production; Kafka is a plus
+
+PREFERRED QUALIFICATIONS:
+- Kubernetes
+"""
+    
+    def test_sections_split_into_must_and_nice_to_haves(self):
+        from src.utils.jd_analyzer import JDAnalyzer
+        analysis = JDAnalyzer().analyze(self.JD)
+        
+        assert (analysis.title, analysis.seniority, analysis.required_years) == ("Senior Backend Engineer", "senior", 5)
+        assert analysis.must_haves == ["5+ years of backend experience", "Python and PostgreSQL"]
+        assert analysis.nice_to_haves == ["Docker in production; Kafka is a plus", "Kubernetes"]
+        assert analysis.required_skills == ["postgresql", "python"]
+        assert analysis.nice_to_have_skills == ["docker", "kafka", "kubernetes"]
+        assert "cloud software" not in analysis.render() and "- Python and PostgreSQL" in analysis.render()
+    
+    def test_required_skills_grouped_from_must_have_lines(self):
+        from src.utils.jd_analyzer import JDAnalyzer
+        jd = """Python Developer
+
+RESPONSIBILITIES:
+- Build microservices with Kafka
+
+REQUIRED QUALIFICATIONS:
+- Strong proficiency in Python or Node.js
+- Experience with cloud platforms (AWS, Azure, or GCP)
+- SQL and Git
+
+TECHNICAL SKILLS:
+- Tools: Docker, Kubernetes
+"""
+        analysis = JDAnalyzer().analyze(jd)
+        
+        assert analysis.required_groups == [["node.js", "python"], ["aws", "azure", "gcp"], ["sql"], ["git"]]
+        assert "kafka" not in analysis.required_skills and "docker" not in analysis.required_skills
+        assert "- Tools: Docker, Kubernetes" in analysis.render()
+        # Without a must-have section the whole JD stands in
+        assert JDAnalyzer().analyze("Engineer wanted: Java and Redis").required_groups == [["java"], ["redis"]]
+    
+    def test_analysis_reused_from_memory_and_disk(self, tmp_path):
+        from src.utils.jd_analyzer import JDAnalyzer
+        analyzer = JDAnalyzer(path=str(tmp_path))
+        first = analyzer.analyze(self.JD)
+        
+        assert analyzer.analyze(self.JD) is first
+        reopened = JDAnalyzer(path=str(tmp_path))
+        assert reopened.analyze(self.JD).to_dict() == first.to_dict()
+        assert analyzer.get_stats()["cache_hits"] == 1 and reopened.get_stats()["disk_hits"] == 1
+    
+    def test_screening_and_interviews_share_one_analysis(self):
+        registry = AgentRegistry()
+        screening, interview = registry.get_agent("resume_screening"), registry.get_agent("interview")
+        
+        for resume in ("SKILLS: Go\nEXPERIENCE:\nDev at A (2020-2022)", "SKILLS: Rust\nEXPERIENCE:\nDev at B (2019-2023)"):
+            request = screening._prepare_request({"resume": resume, "job_description": self.JD})
+            assert "about us" not in request["llm"]["prefix"].lower()
+        questions = interview._prepare_questions_request({"job_description": self.JD, "num_questions": 3})
+        
+        assert interview.jd_analyzer is screening.jd_analyzer
+        assert "Senior Backend Engineer" in questions["llm"]["prompt"]
+        stats = screening.get_jd_analysis_stats()
+        assert stats["analyses"] + stats["disk_hits"] == 1 and stats["cache_hits"] == 2
+
+
+class TestSkillTaxonomy:
+    """Single-pass alias matching against the skill taxonomy"""
+    
+    @pytest.fixture
+    def taxonomy(self):
+        from src.utils.skill_taxonomy import SkillTaxonomy
+        return SkillTaxonomy([
+            {"id": "java"}, {"id": "javascript", "aliases": ["js"]},
+            {"id": "kubernetes", "aliases": ["k8s"]}, {"id": "postgresql", "aliases": ["postgres"]},
+            {"id": "sql"}, {"id": "machine learning", "aliases": ["ml"]}, {"id": "c++"}
+        ])
+    
+    def test_aliases_map_to_canonical_ids_with_offsets(self, taxonomy):
+        text = "Ran K8s and Postgres for ML teams"
+        
+        matches = taxonomy.find(text)
+        
+        assert [m.skill_id for m in matches] == ["kubernetes", "postgresql", "machine learning"]
+        assert [text[m.start:m.end] for m in matches] == ["K8s", "Postgres", "ML"]
+    
+    def test_word_boundaries_and_longest_match(self, taxonomy):
+        assert taxonomy.extract("JavaScript, not Java") == {"javascript", "java"}
+        assert taxonomy.extract("javascripting and PostgreSQL") == {"postgresql"}
+        assert taxonomy.extract("Machine\n  learning in C++.") == {"machine learning", "c++"}
+    
+    def test_default_taxonomy_keeps_legacy_ids(self):
+        from src.agents.resume_screening.scorer import ResumeScorer
+        
+        skills = ResumeScorer().extract_skills("ReactJS, Node.js, k8s, CI/CD, Postgres and C# on AWS")
+        
+        assert skills == {"react", "node.js", "kubernetes", "ci/cd", "postgresql", "c#", "aws"}
+
+
+
+class TestSkillMatrix:
+    """Bitset skill matching over the candidate pool"""
+    
+    @pytest.fixture
+    def matrix(self):
+        from src.utils.skill_matrix import SkillMatrix
+        matrix = SkillMatrix(capacity=2)  # forces the matrix to grow
+        matrix.add("alice", ["Python", "Django", "Postgres", "Docker", "AWS"])
+        matrix.add("bob", ["python", "k8s", "aws", "terraform"])
+        matrix.add_text("carol", "Java developer with Spring Boot and Kubernetes")
+        return matrix
+    
+    def test_k_of_n_match_ranked(self, matrix):
+        required = ["python", "django", "postgresql", "docker", "aws", "kubernetes"]
+        
+        result = matrix.match(required, nice_to_have=["terraform"], min_required=2)
+        
+        assert [(c["candidate_id"], c["required_matched"], c["nice_matched"]) for c in result["candidates"]] == [
+            ("alice", 5, 0), ("bob", 3, 1)
+        ]
+        assert result["total"] == 2 and result["candidates"][0]["score"] == 83.3
+        assert matrix.counts(required).tolist() == [5, 3, 1]
+    
+    def test_skills_round_trip_and_replace(self, matrix):
+        assert matrix.skills("bob") == {"python", "kubernetes", "aws", "terraform"}
+        
+        matrix.add("bob", ["rust"])
+        
+        assert matrix.skills("bob") == {"rust"} and len(matrix) == 3
+        assert matrix.get_stats()["bytes"] == 3 * matrix.words * 8
+
+
+
+class TestCandidateIndex:
+    """Persistent ANN index behind ResumeScreeningAgent.search_candidates"""
+    
+    @staticmethod
+    def clustered(n, dim=32, seed=0):
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        centers = rng.normal(size=(8, dim))
+        vectors = centers[rng.integers(0, 8, n)] + 0.2 * rng.normal(size=(n, dim))
+        return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype("float32")
+    
+    def test_ivf_add_remove_and_snapshot(self, tmp_path):
+        from src.llm.ann_index import ANNIndex
+        vectors = self.clustered(400)
+        ids = [f"c{i}" for i in range(400)]
+        index = ANNIndex(32, nlist=8, nprobe=8, path=str(tmp_path), train_min=200, use_faiss=False)
+        index.add(ids[:100], vectors[:100])
+        assert not index.trained and index.search(vectors[5], 1)[0][0] == "c5"
+        
+        index.add(ids[100:], vectors[100:])
+        index.remove(["c5"])
+        index.add(["c6"], vectors[7:8])
+        
+        assert index.trained and index.get_stats()["lists"] == 8
+        assert "c5" not in [doc_id for doc_id, _ in index.search(vectors[5], 5)]
+        assert {doc_id for doc_id, _ in index.search(vectors[7], 2)} == {"c6", "c7"}
+        index.snapshot()
+        reopened = ANNIndex(32, nlist=8, nprobe=8, path=str(tmp_path), use_faiss=False)
+        assert len(reopened) == 399 and reopened.search(vectors[42], 3) == index.search(vectors[42], 3)
+    
+    def test_agent_jd_top_k(self, tmp_path):
+        from src.agents.resume_screening.agent import ResumeScreeningAgent
+        from src.agents.resume_screening.candidate_index import CandidateIndex
+        from src.llm.embeddings import HashingEmbedder
+        embedder = HashingEmbedder(dim=256)
+        candidate_index = CandidateIndex.from_config(embedder, {"path": str(tmp_path), "snapshot_every": 2})
+        agent = ResumeScreeningAgent(None, candidate_index=candidate_index)
+        
+        candidate_index.add({
+            "nurse": "Registered nurse, intensive care unit, patient triage",
+            "dev": "Backend developer building Python microservices on Kubernetes",
+        })
+        result = agent.search_candidates("Python backend developer for microservices", top_k=1)
+        
+        assert result["success"] and result["candidates"][0]["candidate_id"] == "dev"
+        assert (tmp_path / "meta.json").exists()
+        assert ResumeScreeningAgent(None).search_candidates("JD")["success"] is False
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file